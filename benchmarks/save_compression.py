@@ -0,0 +1,90 @@
+"""保存时并行压缩的基准测试 - 不同线程数下保存大文档的耗时
+
+生成一个正文很大的文档（默认约 50 MB 的 document.xml），按 1、2、4…CPU核数个压缩线程
+分别保存到内存，输出耗时、压缩后大小和相对单线程的加速比，并校验解压后的内容一致。
+
+用法:
+    python benchmarks/save_compression.py [--paragraphs 300000] [--level default] [--repeat 3]
+"""
+import argparse
+import copy
+import io
+import os
+import sys
+import time
+import zipfile
+
+# 将项目根目录添加到 Python 路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document  # noqa: E402
+from src.utils.package_io import COMPRESSION_LEVELS, CompressionPolicy, save_package  # noqa: E402
+
+
+def build_document(paragraphs: int) -> Document:
+    """生成包含大量段落的文档（复制段落元素，避免逐段调用 add_paragraph）"""
+    doc = Document()
+    template = doc.add_paragraph("placeholder")._p
+    anchor = template.getnext()
+    template.getparent().remove(template)
+    for i in range(paragraphs):
+        p = copy.deepcopy(template)
+        anchor.addprevious(p)
+        p.r_lst[0].t_lst[0].text = (
+            f"第{i}段：接口 api_{i % 997}.call(request_id={i}) 返回 Response 对象，"
+            f"字段 status、payload 与 headers 的说明见第 {i % 53} 节。"
+        )
+    return doc
+
+
+def worker_counts() -> list:
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= max(cpus, 4):
+        counts.append(counts[-1] * 2)
+    if cpus not in counts:
+        counts.append(cpus)
+    return sorted(counts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=300000, help="段落数")
+    parser.add_argument("--level", default="default", choices=list(COMPRESSION_LEVELS), help="XML 压缩级别")
+    parser.add_argument("--repeat", type=int, default=3, help="每种线程数重复次数（取最短耗时）")
+    args = parser.parse_args()
+
+    print(f"生成 {args.paragraphs} 段的文档...")
+    doc = build_document(args.paragraphs)
+    policy = CompressionPolicy(xml=args.level)
+
+    reference = None
+    baseline = None
+    print(f"CPU核数: {os.cpu_count()}，压缩级别: {args.level}")
+    print(f"{'线程数':>6} {'耗时(秒)':>10} {'大小(MB)':>10} {'加速比':>8}")
+    for workers in worker_counts():
+        best = None
+        for _ in range(args.repeat):
+            buffer = io.BytesIO()
+            start = time.perf_counter()
+            save_package(doc, buffer, policy, workers)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        with zipfile.ZipFile(buffer) as archive:
+            if archive.testzip() is not None:
+                raise SystemExit(f"{workers} 个线程保存的文件校验失败")
+            contents = {name: archive.read(name) for name in archive.namelist()}
+        if reference is None:
+            reference = contents
+            xml_size = len(contents["word/document.xml"])
+            print(f"(document.xml {xml_size / 1e6:.1f} MB)")
+        elif contents != reference:
+            raise SystemExit(f"{workers} 个线程保存的内容与单线程不一致")
+
+        baseline = baseline or best
+        print(f"{workers:>6} {best:>10.3f} {len(buffer.getvalue()) / 1e6:>10.2f} {baseline / best:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,34 @@
 """高级功能工具 - 脚注、尾注等"""
 import os
 import re
-import docx2txt
 from typing import Optional, Dict, Any, List
 from lxml import etree
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
 from ..utils import DocumentManager, validate_file_path, handle_docx_errors
+from ..utils.body_index import StyleNames, get_paragraph
+from ..utils.heading_cache import HeadingIndex, get_heading_cache
+from .registry import registry
 
 # 全局文档管理器实例
 doc_manager = DocumentManager()
 
+W_P = qn('w:p')
 
+
+@registry.tool(
+    description="在指定段落添加脚注",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "paragraph_index": {"type": "integer", "description": "段落索引"},
+            "footnote_text": {"type": "string", "description": "脚注文本"}
+        },
+        "required": ["filename", "paragraph_index", "footnote_text"]
+    }
+)
 @handle_docx_errors
 async def add_footnote(
     filename: str,
@@ -27,12 +46,10 @@ async def add_footnote(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path, reload=True)
 
-    if paragraph_index < 0 or paragraph_index >= len(doc.paragraphs):
-        raise ValueError(f"段落索引超出范围: {paragraph_index}")
+    para = get_paragraph(doc, paragraph_index)
 
     # 注意：python-docx对脚注的支持有限，这里提供基础实现
     # 实际使用中可能需要直接操作XML
-    para = doc.paragraphs[paragraph_index]
 
     # 添加脚注标记（简化实现）
     para.add_run(f" [{footnote_text}]")
@@ -46,6 +63,18 @@ async def add_footnote(
     }
 
 
+@registry.tool(
+    description="获取文档大纲结构（标题层级）",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"}
+        },
+        "required": ["filename"]
+    },
+    read_only=True,
+    cpu_bound=True
+)
 @handle_docx_errors
 async def get_document_outline(filename: str) -> Dict[str, Any]:
     """
@@ -78,6 +107,17 @@ async def get_document_outline(filename: str) -> Dict[str, Any]:
     }
 
 
+@registry.tool(
+    description="添加页眉",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "text": {"type": "string", "description": "页眉文本"}
+        },
+        "required": ["filename", "text"]
+    }
+)
 @handle_docx_errors
 async def add_header(
     filename: str,
@@ -107,6 +147,17 @@ async def add_header(
     }
 
 
+@registry.tool(
+    description="添加页脚",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "text": {"type": "string", "description": "页脚文本"}
+        },
+        "required": ["filename", "text"]
+    }
+)
 @handle_docx_errors
 async def add_footer(
     filename: str,
@@ -136,6 +187,18 @@ async def add_footer(
     }
 
 
+@registry.tool(
+    description="获取文档中所有标题的简单列表",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"}
+        },
+        "required": ["filename"]
+    },
+    read_only=True,
+    cpu_bound=True
+)
 @handle_docx_errors
 async def get_headings_list(filename: str) -> Dict[str, Any]:
     """
@@ -150,74 +213,7 @@ async def get_headings_list(filename: str) -> Dict[str, Any]:
     注意：通过解析 Word 文档的 XML 结构来获取实际的编号信息
     """
     abs_path = validate_file_path(filename)
-    doc = doc_manager.get_or_open(abs_path, reload=True)
-
-    # 解析编号定义
-    numbering_part = doc.part.numbering_part
-    numbering_definitions = {}
-    abstract_nums = {}
-
-    if numbering_part:
-        # 解析 numbering.xml
-        numbering_definitions, abstract_nums = _parse_numbering_definitions(numbering_part)
-
-    headings = []
-    # 跟踪每个抽象编号的计数器（按 abstractNumId 管理，而不是 numId）
-    abstract_counters = {}
-
-    for para_idx, para in enumerate(doc.paragraphs):
-        if para.style.name.startswith('Heading'):
-            try:
-                level = int(para.style.name.split()[-1])
-                heading_text = para.text.strip()
-
-                # 获取段落的编号信息
-                numbering_info = _get_paragraph_numbering(para)
-
-                if numbering_info:
-                    num_id = numbering_info['numId']
-                    ilvl = numbering_info['ilvl']
-
-                    # 获取对应的 abstractNumId
-                    abstract_num_id = numbering_definitions.get(num_id)
-                    if abstract_num_id is None:
-                        final_text = heading_text
-                    else:
-                        # 初始化或更新计数器（按 abstractNumId）
-                        if abstract_num_id not in abstract_counters:
-                            abstract_counters[abstract_num_id] = {}
-
-                        # 更新当前级别的计数器
-                        abstract_counters[abstract_num_id][ilvl] = abstract_counters[abstract_num_id].get(ilvl, 0) + 1
-
-                        # 重置更深层级的计数器
-                        for l in list(abstract_counters[abstract_num_id].keys()):
-                            if l > ilvl:
-                                abstract_counters[abstract_num_id][l] = 0
-
-                        # 生成编号文本
-                        numbering_text = _generate_numbering_text(
-                            num_id, ilvl, abstract_counters[abstract_num_id],
-                            numbering_definitions, abstract_nums
-                        )
-
-                    final_text = f"{numbering_text}{heading_text}" if numbering_text else heading_text
-                else:
-                    final_text = heading_text
-
-                headings.append({
-                    "level": level,
-                    "text": final_text,
-                    "paragraph_index": para_idx,
-                    "style": para.style.name
-                })
-            except (ValueError, IndexError):
-                headings.append({
-                    "level": 0,
-                    "text": para.text.strip(),
-                    "paragraph_index": para_idx,
-                    "style": para.style.name
-                })
+    headings = _document_headings(abs_path).headings
 
     return {
         "success": True,
@@ -226,6 +222,21 @@ async def get_headings_list(filename: str) -> Dict[str, Any]:
     }
 
 
+@registry.tool(
+    description="获取文档中特定范围内的标题列表（包含自动编号）",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "start_index": {"type": "integer", "description": "起始段落索引（包含），不指定则从文档开头"},
+            "end_index": {"type": "integer", "description": "结束段落索引（包含），不指定则到文档末尾"},
+            "max_level": {"type": "integer", "description": "最大标题级别（1-9），不指定则返回所有级别"}
+        },
+        "required": ["filename"]
+    },
+    read_only=True,
+    cpu_bound=True
+)
 @handle_docx_errors
 async def get_headings_list_range(
     filename: str,
@@ -245,27 +256,9 @@ async def get_headings_list_range(
     返回:
         包含筛选后标题的详细信息列表
     """
-    # 先获取所有标题
-    all_headings_result = await get_headings_list(filename)
-
-    if not all_headings_result['success']:
-        return all_headings_result
-
-    all_headings = all_headings_result['headings']
-    filtered_headings = []
-
-    for heading in all_headings:
-        # 筛选条件1：段落索引范围
-        if start_index is not None and heading['paragraph_index'] < start_index:
-            continue
-        if end_index is not None and heading['paragraph_index'] > end_index:
-            continue
-
-        # 筛选条件2：标题级别
-        if max_level is not None and heading['level'] > max_level:
-            continue
-
-        filtered_headings.append(heading)
+    abs_path = validate_file_path(filename)
+    index = _document_headings(abs_path)
+    filtered_headings = index.query(start_index, end_index, max_level)
 
     return {
         "success": True,
@@ -275,21 +268,114 @@ async def get_headings_list_range(
             "start_index": start_index,
             "end_index": end_index,
             "max_level": max_level,
-            "total_headings": len(all_headings)
+            "total_headings": len(index)
         }
     }
 
 
-def _get_paragraph_numbering(para) -> Optional[Dict[str, int]]:
+def _document_headings(abs_path: str) -> HeadingIndex:
+    """文档的标题索引（磁盘上的文档按内容哈希缓存；有未落盘修改时按内存内容计算）"""
+    if doc_manager.has_pending_changes(abs_path):
+        return HeadingIndex(_build_headings(doc_manager.get_or_open(abs_path)))
+    if not os.path.exists(abs_path):
+        raise FileNotFoundError(f"文件不存在: {abs_path}")
+    return get_heading_cache().get(abs_path, lambda: _build_headings(doc_manager.get_or_open(abs_path)))
+
+
+def _build_headings(doc) -> List[Dict[str, Any]]:
+    """遍历正文段落，生成标题列表（含自动编号）"""
+    # 解析编号定义
+    numbering_part = doc.part.numbering_part
+    numbering_definitions = {}
+    abstract_nums = {}
+
+    if numbering_part:
+        # 解析 numbering.xml
+        numbering_definitions, abstract_nums = _parse_numbering_definitions(numbering_part)
+
+    style_names = StyleNames(doc)
+    # 样式ID -> 样式元素（按样式读取编号属性）
+    style_elements = {}
+
+    headings = []
+    # 跟踪每个抽象编号的计数器（按 abstractNumId 管理，而不是 numId）
+    abstract_counters = {}
+
+    for para_idx, p in enumerate(doc.element.body.iterchildren(W_P)):
+        para = Paragraph(p, doc._body)
+        style_name = style_names.paragraph_style(para)
+        if not style_name.startswith('Heading'):
+            continue
+        try:
+            level = int(style_name.split()[-1])
+            heading_text = para.text.strip()
+
+            # 获取段落的编号信息
+            style_id = p.style
+            if style_id not in style_elements:
+                style = doc.part.get_style(style_id, WD_STYLE_TYPE.PARAGRAPH)
+                style_elements[style_id] = style._element if style is not None else None
+            numbering_info = _get_paragraph_numbering(p, style_elements[style_id])
+
+            numbering_text = ""
+            if numbering_info:
+                num_id = numbering_info['numId']
+                ilvl = numbering_info['ilvl']
+
+                # 获取对应的 abstractNumId
+                abstract_num_id = numbering_definitions.get(num_id)
+                if abstract_num_id is not None:
+                    # 初始化或更新计数器（按 abstractNumId）
+                    if abstract_num_id not in abstract_counters:
+                        abstract_counters[abstract_num_id] = {}
+
+                    # 更新当前级别的计数器
+                    abstract_counters[abstract_num_id][ilvl] = abstract_counters[abstract_num_id].get(ilvl, 0) + 1
+
+                    # 重置更深层级的计数器
+                    for l in list(abstract_counters[abstract_num_id].keys()):
+                        if l > ilvl:
+                            abstract_counters[abstract_num_id][l] = 0
+
+                    # 生成编号文本
+                    numbering_text = _generate_numbering_text(
+                        num_id, ilvl, abstract_counters[abstract_num_id],
+                        numbering_definitions, abstract_nums
+                    )
+
+            final_text = f"{numbering_text}{heading_text}" if numbering_text else heading_text
+
+            headings.append({
+                "level": level,
+                "text": final_text,
+                "paragraph_index": para_idx,
+                "style": style_name
+            })
+        except (ValueError, IndexError):
+            headings.append({
+                "level": 0,
+                "text": para.text.strip(),
+                "paragraph_index": para_idx,
+                "style": style_name
+            })
+
+    return headings
+
+
+def _get_paragraph_numbering(p, style_elem) -> Optional[Dict[str, int]]:
     """
     获取段落的编号信息（优先从段落属性获取，其次从样式获取）
 
+    参数:
+        p: 段落元素（w:p）
+        style_elem: 段落样式元素（w:style），没有样式时为 None
+
     返回:
         包含 numId 和 ilvl 的字典，如果没有编号则返回 None
     """
     try:
         # 方法1：从段落级别的编号属性获取
-        pPr = para._element.pPr
+        pPr = p.pPr
         if pPr is not None:
             numPr = pPr.numPr
             if numPr is not None:
@@ -302,8 +388,7 @@ def _get_paragraph_numbering(para) -> Optional[Dict[str, int]]:
                     return {'numId': num_id, 'ilvl': ilvl}
 
         # 方法2：从样式级别的编号属性获取
-        if hasattr(para, 'style') and para.style is not None:
-            style_elem = para.style._element
+        if style_elem is not None:
             style_pPr = style_elem.pPr
             if style_pPr is not None:
                 style_numPr = style_pPr.numPr
@@ -0,0 +1,135 @@
+"""批量操作工具 - 在一次加载/保存中依次执行多个编辑操作"""
+import os
+from typing import List, Dict, Any
+from ..utils import DocumentManager, validate_file_path, handle_docx_errors
+from .registry import registry
+
+# 全局文档管理器实例
+doc_manager = DocumentManager()
+
+# 不能在批量操作中使用的工具（不针对单个已有文档，或需要自行管理文档的加载和落盘）
+EXCLUDED_TOOLS = frozenset({
+    "apply_operations",
+    "create_document",
+    "copy_document",
+    "list_available_documents",
+    "search_documents",
+    "get_server_stats",
+    "flush_document",
+    "close_document"
+})
+
+
+def _resolve_operation(index: int, operation: Dict[str, Any], abs_path: str):
+    """校验单个操作，返回 (工具名, 工具定义, 参数)"""
+    if not isinstance(operation, dict):
+        raise ValueError(f"第{index}个操作格式错误，应为 {{\"tool\": ..., \"arguments\": {{...}}}}")
+
+    name = operation.get("tool")
+    spec = registry.get(name) if isinstance(name, str) else None
+    if spec is None:
+        raise ValueError(f"第{index}个操作的工具不存在: {name}")
+    if name in EXCLUDED_TOOLS or "filename" not in spec.input_schema.get("properties", {}):
+        raise ValueError(f"第{index}个操作的工具不支持批量执行: {name}")
+
+    arguments = operation.get("arguments") or {}
+    if not isinstance(arguments, dict):
+        raise ValueError(f"第{index}个操作的 arguments 必须是对象")
+    arguments = dict(arguments)
+    target = arguments.pop("filename", None)
+    if target and os.path.abspath(target) != abs_path:
+        raise ValueError(f"第{index}个操作的文档与批量操作的文档不一致: {target}")
+    return name, spec, arguments
+
+
+@registry.tool(
+    description="在同一个文档上依次执行多个操作，只加载和保存一次（操作名称与现有工具相同，如 add_heading、insert_paragraph、set_cell_background）",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "operations": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "tool": {"type": "string", "description": "工具名称，如 add_paragraph"},
+                        "arguments": {"type": "object", "description": "工具参数（无需再填写 filename）"}
+                    },
+                    "required": ["tool"]
+                },
+                "description": "按顺序执行的操作列表"
+            },
+            "atomic": {
+                "type": "boolean",
+                "description": "是否全部成功才保存（默认false：跳过失败的操作，保存其余修改。每个操作执行前复制正文XML作为回滚点，失败的操作对正文的部分修改会被撤销；样式、编号等其他部件的修改不回滚）"
+            }
+        },
+        "required": ["filename", "operations"]
+    }
+)
+@handle_docx_errors
+async def apply_operations(
+    filename: str,
+    operations: List[Dict[str, Any]],
+    atomic: bool = False
+) -> Dict[str, Any]:
+    """
+    在同一个内存文档上依次执行多个操作，最后只保存一次
+
+    参数:
+        filename: 文档路径
+        operations: 操作列表，每项为 {"tool": 工具名称, "arguments": 参数}
+        atomic: 是否全部成功才保存（默认False）
+                True 时在文档副本上执行，遇到失败立即停止且不保存任何修改；
+                False 时失败的操作的正文恢复到执行前的状态（回滚点只复制主文档部件的 XML，
+                不重新序列化整个文档），其余操作的修改照常保存
+    """
+    abs_path = validate_file_path(filename)
+
+    if not operations:
+        raise ValueError("操作列表不能为空")
+
+    # 执行前先校验全部操作，避免执行到一半才发现参数格式错误
+    plan = [_resolve_operation(i, operation, abs_path) for i, operation in enumerate(operations)]
+
+    results = []
+    failed_index = None
+    # 非原子模式下每个操作都有自己的回滚点，失败的操作不会留下部分修改
+    with doc_manager.batch(abs_path, isolated=atomic, rollback=not atomic) as session:
+        for index, (name, spec, arguments) in enumerate(plan):
+            result = await spec.handler(filename=filename, **arguments)
+            succeeded = not isinstance(result, dict) or result.get("success", True)
+            results.append({
+                "index": index,
+                "tool": name,
+                "success": succeeded,
+                "result": result
+            })
+            if not succeeded and failed_index is None:
+                failed_index = index
+                if atomic:
+                    break
+
+    saved = False
+    if session.modified and not (atomic and failed_index is not None):
+        doc_manager.save(abs_path, session.doc)
+        saved = True
+
+    succeeded_count = sum(1 for item in results if item["success"])
+    if atomic and failed_index is not None:
+        message = f"第{failed_index}个操作（{plan[failed_index][0]}）失败，所有修改均未保存"
+    else:
+        message = f"已执行{len(results)}个操作，成功{succeeded_count}个"
+
+    return {
+        "success": failed_index is None,
+        "message": message,
+        "atomic": atomic,
+        "saved": saved,
+        "total": len(plan),
+        "executed": len(results),
+        "succeeded": succeeded_count,
+        "failed_index": failed_index,
+        "results": results
+    }
@@ -1,14 +1,59 @@
 """内容编辑工具"""
 import os
+import re
 from typing import Optional, Dict, Any, List
-from docx.shared import Pt, RGBColor, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
 from ..utils import DocumentManager, validate_file_path, handle_docx_errors
+from ..utils.body_index import BodyIndex, get_paragraph
+from ..utils.formatting import FormatSpec, ParagraphWriter, font_toggles
+from ..utils.search_index import get_search_index
+from ..utils.text_replace import ReplaceRule, replace_in_document
+from .registry import registry
 
 # 全局文档管理器实例
 doc_manager = DocumentManager()
 
 
+def _paragraph_format(font_name, font_size, bold, italic, color, highlight,
+                      first_line_indent, left_indent, right_indent, alignment,
+                      explicit_toggles: bool = False) -> FormatSpec:
+    """段落类工具的格式参数（bold/italic 为 False 时沿用样式的设置，不写入文档）
+
+    参数:
+        explicit_toggles: 按 font_toggles 的规则写入 False（add_paragraph、add_heading 原有的输出）
+    """
+    if explicit_toggles:
+        bold, italic = font_toggles(font_name, font_size, bold, italic, color, highlight)
+    else:
+        bold, italic = bold or None, italic or None
+    return FormatSpec.of(
+        font_name=font_name, font_size=font_size, bold=bold, italic=italic,
+        color=color, highlight=highlight, first_line_indent=first_line_indent,
+        left_indent=left_indent, right_indent=right_indent, alignment=alignment
+    )
+
+
+@registry.tool(
+    description="添加段落到Word文档",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "text": {"type": "string", "description": "段落文本内容"},
+            "style": {"type": "string", "description": "段落样式名称（可选）"},
+            "font_name": {"type": "string", "description": "字体名称（可选）"},
+            "font_size": {"type": "integer", "description": "字号（可选）"},
+            "bold": {"type": "boolean", "description": "是否粗体"},
+            "italic": {"type": "boolean", "description": "是否斜体"},
+            "color": {"type": "string", "description": "文字颜色，十六进制RGB（可选）"},
+            "highlight": {"type": "string", "description": "背景色（高亮），十六进制RGB（可选）"},
+            "first_line_indent": {"type": "number", "description": "首行缩进，单位厘米（可选）"},
+            "left_indent": {"type": "number", "description": "左缩进，单位厘米（可选）"},
+            "right_indent": {"type": "number", "description": "右缩进，单位厘米（可选）"},
+            "alignment": {"type": "string", "description": "对齐方式：left/center/right/justify（可选）"}
+        },
+        "required": ["filename", "text"]
+    }
+)
 @handle_docx_errors
 async def add_paragraph(
     filename: str,
@@ -46,52 +91,11 @@ async def add_paragraph(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    # 添加段落
-    para = doc.add_paragraph(text, style=style)
-
-    # 设置字体格式
-    if any([font_name, font_size, bold, italic, color, highlight]):
-        for run in para.runs:
-            if font_name:
-                run.font.name = font_name
-            if font_size:
-                run.font.size = Pt(font_size)
-            if bold is not None:
-                run.font.bold = bold
-            if italic is not None:
-                run.font.italic = italic
-            if color:
-                run.font.color.rgb = RGBColor(
-                    int(color[0:2], 16),
-                    int(color[2:4], 16),
-                    int(color[4:6], 16)
-                )
-            if highlight:
-                # 设置背景色（高亮）
-                from docx.oxml.shared import OxmlElement
-                from docx.oxml.ns import qn
-                shd = OxmlElement('w:shd')
-                shd.set(qn('w:fill'), highlight)
-                run._element.get_or_add_rPr().append(shd)
-
-    # 设置段落格式：缩进
-    if first_line_indent is not None:
-        para.paragraph_format.first_line_indent = Inches(first_line_indent / 2.54)
-    if left_indent is not None:
-        para.paragraph_format.left_indent = Inches(left_indent / 2.54)
-    if right_indent is not None:
-        para.paragraph_format.right_indent = Inches(right_indent / 2.54)
-
-    # 设置段落格式：对齐方式
-    if alignment:
-        alignment_map = {
-            'left': WD_ALIGN_PARAGRAPH.LEFT,
-            'center': WD_ALIGN_PARAGRAPH.CENTER,
-            'right': WD_ALIGN_PARAGRAPH.RIGHT,
-            'justify': WD_ALIGN_PARAGRAPH.JUSTIFY
-        }
-        if alignment.lower() in alignment_map:
-            para.paragraph_format.alignment = alignment_map[alignment.lower()]
+    spec = _paragraph_format(
+        font_name, font_size, bold, italic, color, highlight,
+        first_line_indent, left_indent, right_indent, alignment, explicit_toggles=True
+    )
+    ParagraphWriter(doc).add(text, style=style, spec=spec)
 
     doc_manager.save(abs_path, doc)
 
@@ -102,6 +106,38 @@ async def add_paragraph(
     }
 
 
+@registry.tool(
+    description="批量添加多个段落到Word文档",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "paragraphs": {
+                "type": "array",
+                "description": "段落列表",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "text": {"type": "string", "description": "段落文本"},
+                        "style": {"type": "string", "description": "段落样式（可选）"},
+                        "font_name": {"type": "string", "description": "字体名称（可选）"},
+                        "font_size": {"type": "integer", "description": "字号（可选）"},
+                        "bold": {"type": "boolean", "description": "是否粗体"},
+                        "italic": {"type": "boolean", "description": "是否斜体"},
+                        "color": {"type": "string", "description": "文字颜色，十六进制RGB（可选）"},
+                        "highlight": {"type": "string", "description": "背景色（高亮），十六进制RGB（可选）"},
+                        "first_line_indent": {"type": "number", "description": "首行缩进，单位厘米（可选）"},
+                        "left_indent": {"type": "number", "description": "左缩进，单位厘米（可选）"},
+                        "right_indent": {"type": "number", "description": "右缩进，单位厘米（可选）"},
+                        "alignment": {"type": "string", "description": "对齐方式：left/center/right/justify（可选）"}
+                    },
+                    "required": ["text"]
+                }
+            }
+        },
+        "required": ["filename", "paragraphs"]
+    }
+)
 @handle_docx_errors
 async def batch_add_paragraphs(
     filename: str,
@@ -132,70 +168,16 @@ async def batch_add_paragraphs(
     if not paragraphs:
         raise ValueError("段落列表不能为空")
 
+    # 样式ID、插入位置和格式模板在整批段落间共享
+    writer = ParagraphWriter(doc)
     added_count = 0
     for para_data in paragraphs:
         text = para_data.get('text')
         if not text:
             continue
 
-        style = para_data.get('style')
-        font_name = para_data.get('font_name')
-        font_size = para_data.get('font_size')
-        bold = para_data.get('bold', False)
-        italic = para_data.get('italic', False)
-        color = para_data.get('color')
-        highlight = para_data.get('highlight')
-        first_line_indent = para_data.get('first_line_indent')
-        left_indent = para_data.get('left_indent')
-        right_indent = para_data.get('right_indent')
-        alignment = para_data.get('alignment')
-
-        # 添加段落
-        para = doc.add_paragraph(text, style=style)
-
-        # 设置字体格式
-        if any([font_name, font_size, bold, italic, color, highlight]):
-            for run in para.runs:
-                if font_name:
-                    run.font.name = font_name
-                if font_size:
-                    run.font.size = Pt(font_size)
-                if bold:
-                    run.font.bold = bold
-                if italic:
-                    run.font.italic = italic
-                if color:
-                    run.font.color.rgb = RGBColor(
-                        int(color[0:2], 16),
-                        int(color[2:4], 16),
-                        int(color[4:6], 16)
-                    )
-                if highlight:
-                    # 设置背景色（高亮）
-                    from docx.oxml.shared import OxmlElement
-                    from docx.oxml.ns import qn
-                    shd = OxmlElement('w:shd')
-                    shd.set(qn('w:fill'), highlight)
-                    run._element.get_or_add_rPr().append(shd)
-
-        # 设置段落格式：缩进
-        if first_line_indent is not None:
-            para.paragraph_format.first_line_indent = Inches(first_line_indent / 2.54)
-        if left_indent is not None:
-            para.paragraph_format.left_indent = Inches(left_indent / 2.54)
-        if right_indent is not None:
-            para.paragraph_format.right_indent = Inches(right_indent / 2.54)
-
-        # 设置段落格式：对齐方式
-        if alignment:
-            alignment_map = {
-                'left': WD_ALIGN_PARAGRAPH.LEFT,
-                'center': WD_ALIGN_PARAGRAPH.CENTER,
-                'right': WD_ALIGN_PARAGRAPH.RIGHT,
-                'justify': WD_ALIGN_PARAGRAPH.JUSTIFY
-            }
-            if alignment.lower() in alignment_map:
-                para.paragraph_format.alignment = alignment_map[alignment.lower()]
+        spec = _paragraph_format(*(para_data.get(name) for name in FormatSpec.FIELDS))
+        writer.add(text, style=para_data.get('style'), spec=spec)
 
         added_count += 1
 
@@ -208,6 +190,28 @@ async def batch_add_paragraphs(
     }
 
 
+@registry.tool(
+    description="添加标题到Word文档",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "text": {"type": "string", "description": "标题文本"},
+            "level": {"type": "integer", "description": "标题级别（1-9）"},
+            "font_name": {"type": "string", "description": "字体名称（可选）"},
+            "font_size": {"type": "integer", "description": "字号（可选）"},
+            "bold": {"type": "boolean", "description": "是否粗体"},
+            "italic": {"type": "boolean", "description": "是否斜体"},
+            "color": {"type": "string", "description": "文字颜色，十六进制RGB（可选）"},
+            "highlight": {"type": "string", "description": "背景色（高亮），十六进制RGB（可选）"},
+            "first_line_indent": {"type": "number", "description": "首行缩进，单位厘米（可选）"},
+            "left_indent": {"type": "number", "description": "左缩进，单位厘米（可选）"},
+            "right_indent": {"type": "number", "description": "右缩进，单位厘米（可选）"},
+            "alignment": {"type": "string", "description": "对齐方式：left/center/right/justify（可选）"}
+        },
+        "required": ["filename", "text"]
+    }
+)
 @handle_docx_errors
 async def add_heading(
     filename: str,
@@ -248,51 +252,11 @@ async def add_heading(
     if not 1 <= level <= 9:
         raise ValueError(f"标题级别必须在1-9之间，当前值: {level}")
 
-    # 添加标题
-    heading = doc.add_heading(text, level=level)
-
-    # 设置字体格式
-    if any([font_name, font_size, bold, italic, color, highlight]):
-        for run in heading.runs:
-            if font_name:
-                run.font.name = font_name
-            if font_size:
-                run.font.size = Pt(font_size)
-            if bold is not None:
-                run.font.bold = bold
-            if italic is not None:
-                run.font.italic = italic
-            if color:
-                run.font.color.rgb = RGBColor(
-                    int(color[0:2], 16),
-                    int(color[2:4], 16),
-                    int(color[4:6], 16)
-                )
-            if highlight:
-                from docx.oxml.shared import OxmlElement
-                from docx.oxml.ns import qn
-                shd = OxmlElement('w:shd')
-                shd.set(qn('w:fill'), highlight)
-                run._element.get_or_add_rPr().append(shd)
-
-    # 设置段落格式：缩进
-    if first_line_indent is not None:
-        heading.paragraph_format.first_line_indent = Inches(first_line_indent / 2.54)
-    if left_indent is not None:
-        heading.paragraph_format.left_indent = Inches(left_indent / 2.54)
-    if right_indent is not None:
-        heading.paragraph_format.right_indent = Inches(right_indent / 2.54)
-
-    # 设置段落格式：对齐方式
-    if alignment:
-        alignment_map = {
-            'left': WD_ALIGN_PARAGRAPH.LEFT,
-            'center': WD_ALIGN_PARAGRAPH.CENTER,
-            'right': WD_ALIGN_PARAGRAPH.RIGHT,
-            'justify': WD_ALIGN_PARAGRAPH.JUSTIFY
-        }
-        if alignment.lower() in alignment_map:
-            heading.paragraph_format.alignment = alignment_map[alignment.lower()]
+    spec = _paragraph_format(
+        font_name, font_size, bold, italic, color, highlight,
+        first_line_indent, left_indent, right_indent, alignment, explicit_toggles=True
+    )
+    ParagraphWriter(doc).add(text, style=f"Heading {level}", spec=spec)
 
     doc_manager.save(abs_path, doc)
 
@@ -303,6 +267,17 @@ async def add_heading(
     }
 
 
+@registry.tool(
+    description="删除指定段落",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "paragraph_index": {"type": "integer", "description": "段落索引（从0开始）"}
+        },
+        "required": ["filename", "paragraph_index"]
+    }
+)
 @handle_docx_errors
 async def delete_paragraph(filename: str, paragraph_index: int) -> Dict[str, Any]:
     """
@@ -315,11 +290,8 @@ async def delete_paragraph(filename: str, paragraph_index: int) -> Dict[str, Any
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if paragraph_index < 0 or paragraph_index >= len(doc.paragraphs):
-        raise ValueError(f"段落索引超出范围: {paragraph_index}，文档共有{len(doc.paragraphs)}个段落")
-
     # 删除段落
-    para = doc.paragraphs[paragraph_index]
+    para = get_paragraph(doc, paragraph_index)
     p_element = para._element
     p_element.getparent().remove(p_element)
 
@@ -331,6 +303,29 @@ async def delete_paragraph(filename: str, paragraph_index: int) -> Dict[str, Any
     }
 
 
+@registry.tool(
+    description="在指定位置插入段落（在指定索引之后插入）",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "text": {"type": "string", "description": "段落文本内容"},
+            "position": {"type": "integer", "description": "插入位置索引（从0开始）。新段落将插入到指定索引之后。例如：position=0表示插入到索引0之后，新段落成为索引1"},
+            "style": {"type": "string", "description": "段落样式名称（可选）"},
+            "font_name": {"type": "string", "description": "字体名称（可选）"},
+            "font_size": {"type": "integer", "description": "字号（可选）"},
+            "bold": {"type": "boolean", "description": "是否粗体"},
+            "italic": {"type": "boolean", "description": "是否斜体"},
+            "color": {"type": "string", "description": "文字颜色，十六进制RGB（可选）"},
+            "highlight": {"type": "string", "description": "背景色（高亮），十六进制RGB（可选）"},
+            "first_line_indent": {"type": "number", "description": "首行缩进，单位厘米（可选）"},
+            "left_indent": {"type": "number", "description": "左缩进，单位厘米（可选）"},
+            "right_indent": {"type": "number", "description": "右缩进，单位厘米（可选）"},
+            "alignment": {"type": "string", "description": "对齐方式：left/center/right/justify（可选）"}
+        },
+        "required": ["filename", "text", "position"]
+    }
+)
 @handle_docx_errors
 async def insert_paragraph(
     filename: str,
@@ -373,61 +368,25 @@ async def insert_paragraph(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if position < 0 or position >= len(doc.paragraphs):
-        raise ValueError(f"插入位置超出范围: {position}，有效范围: 0-{len(doc.paragraphs)-1}")
+    body_index = BodyIndex(doc)
+    paragraph_count = body_index.paragraph_count
+    if position < 0 or position >= paragraph_count:
+        raise ValueError(f"插入位置超出范围: {position}，有效范围: 0-{paragraph_count-1}")
 
     # 在指定索引之后插入段落
     # 获取 position+1 位置的段落，在其之前插入（即在 position 之后）
-    if position + 1 >= len(doc.paragraphs):
+    if position + 1 >= paragraph_count:
         # 如果 position 是最后一个段落，则追加到末尾
-        para = doc.add_paragraph(text, style=style)
+        target_para = None
     else:
         # 在 position+1 的位置之前插入（即在 position 之后）
-        target_para = doc.paragraphs[position + 1]
-        para = target_para.insert_paragraph_before(text, style=style)
-
-    # 设置字体格式
-    if any([font_name, font_size, bold, italic, color, highlight]):
-        for run in para.runs:
-            if font_name:
-                run.font.name = font_name
-            if font_size:
-                run.font.size = Pt(font_size)
-            if bold:
-                run.font.bold = bold
-            if italic:
-                run.font.italic = italic
-            if color:
-                run.font.color.rgb = RGBColor(
-                    int(color[0:2], 16),
-                    int(color[2:4], 16),
-                    int(color[4:6], 16)
-                )
-            if highlight:
-                from docx.oxml.shared import OxmlElement
-                from docx.oxml.ns import qn
-                shd = OxmlElement('w:shd')
-                shd.set(qn('w:fill'), highlight)
-                run._element.get_or_add_rPr().append(shd)
-
-    # 设置段落格式：缩进
-    if first_line_indent is not None:
-        para.paragraph_format.first_line_indent = Inches(first_line_indent / 2.54)
-    if left_indent is not None:
-        para.paragraph_format.left_indent = Inches(left_indent / 2.54)
-    if right_indent is not None:
-        para.paragraph_format.right_indent = Inches(right_indent / 2.54)
-
-    # 设置段落格式：对齐方式
-    if alignment:
-        alignment_map = {
-            'left': WD_ALIGN_PARAGRAPH.LEFT,
-            'center': WD_ALIGN_PARAGRAPH.CENTER,
-            'right': WD_ALIGN_PARAGRAPH.RIGHT,
-            'justify': WD_ALIGN_PARAGRAPH.JUSTIFY
-        }
-        if alignment.lower() in alignment_map:
-            para.paragraph_format.alignment = alignment_map[alignment.lower()]
+        target_para = body_index.paragraph(position + 1)
+
+    spec = _paragraph_format(
+        font_name, font_size, bold, italic, color, highlight,
+        first_line_indent, left_indent, right_indent, alignment
+    )
+    ParagraphWriter(doc).add(text, style=style, spec=spec, before=target_para)
 
     doc_manager.save(abs_path, doc)
 
@@ -438,6 +397,18 @@ async def insert_paragraph(
     }
 
 
+@registry.tool(
+    description="删除指定范围的段落",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "start_index": {"type": "integer", "description": "起始段落索引（从0开始，包含）"},
+            "end_index": {"type": "integer", "description": "结束段落索引（从0开始，包含）"}
+        },
+        "required": ["filename", "start_index", "end_index"]
+    }
+)
 @handle_docx_errors
 async def delete_paragraph_range(
     filename: str,
@@ -455,7 +426,8 @@ async def delete_paragraph_range(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    total_paragraphs = len(doc.paragraphs)
+    body_index = BodyIndex(doc)
+    total_paragraphs = body_index.paragraph_count
 
     if start_index < 0 or end_index >= total_paragraphs:
         raise ValueError(f"段落索引超出范围，文档共有{total_paragraphs}个段落")
@@ -463,10 +435,10 @@ async def delete_paragraph_range(
     if start_index > end_index:
         raise ValueError(f"起始索引({start_index})不能大于结束索引({end_index})")
 
-    # 从后往前删除，避免索引变化问题
+    # 从后往前删除（段落元素已在索引中，删除不影响其余段落的定位）
     deleted_count = 0
     for i in range(end_index, start_index - 1, -1):
-        para = doc.paragraphs[i]
+        para = body_index.paragraph(i)
         p_element = para._element
         p_element.getparent().remove(p_element)
         deleted_count += 1
@@ -480,6 +452,30 @@ async def delete_paragraph_range(
     }
 
 
+@registry.tool(
+    description="替换指定范围的段落为新内容",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "start_index": {"type": "integer", "description": "起始段落索引（从0开始，包含）"},
+            "end_index": {"type": "integer", "description": "结束段落索引（从0开始，包含）"},
+            "new_text": {"type": "string", "description": "新的段落文本内容"},
+            "style": {"type": "string", "description": "段落样式名称（可选）"},
+            "font_name": {"type": "string", "description": "字体名称（可选）"},
+            "font_size": {"type": "integer", "description": "字号（可选）"},
+            "bold": {"type": "boolean", "description": "是否粗体"},
+            "italic": {"type": "boolean", "description": "是否斜体"},
+            "color": {"type": "string", "description": "文字颜色，十六进制RGB（可选）"},
+            "highlight": {"type": "string", "description": "背景色（高亮），十六进制RGB（可选）"},
+            "first_line_indent": {"type": "number", "description": "首行缩进，单位厘米（可选）"},
+            "left_indent": {"type": "number", "description": "左缩进，单位厘米（可选）"},
+            "right_indent": {"type": "number", "description": "右缩进，单位厘米（可选）"},
+            "alignment": {"type": "string", "description": "对齐方式：left/center/right/justify（可选）"}
+        },
+        "required": ["filename", "start_index", "end_index", "new_text"]
+    }
+)
 @handle_docx_errors
 async def replace_paragraph_range(
     filename: str,
@@ -521,7 +517,8 @@ async def replace_paragraph_range(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    total_paragraphs = len(doc.paragraphs)
+    body_index = BodyIndex(doc)
+    total_paragraphs = body_index.paragraph_count
 
     if start_index < 0 or end_index >= total_paragraphs:
         raise ValueError(f"段落索引超出范围，文档共有{total_paragraphs}个段落")
@@ -531,63 +528,20 @@ async def replace_paragraph_range(
 
     # 先删除范围内的段落（从后往前删除）
     for i in range(end_index, start_index, -1):
-        para = doc.paragraphs[i]
+        para = body_index.paragraph(i)
         p_element = para._element
         p_element.getparent().remove(p_element)
 
-    # 在起始位置插入新段落
-    if start_index < len(doc.paragraphs):
-        target_para = doc.paragraphs[start_index]
-        new_para = target_para.insert_paragraph_before(new_text, style=style)
-        # 删除原来的起始段落
-        p_element = target_para._element
-        p_element.getparent().remove(p_element)
-    else:
-        # 如果是最后一个位置，直接添加
-        new_para = doc.add_paragraph(new_text, style=style)
-
-    # 设置字体格式
-    if any([font_name, font_size, bold, italic, color, highlight]):
-        for run in new_para.runs:
-            if font_name:
-                run.font.name = font_name
-            if font_size:
-                run.font.size = Pt(font_size)
-            if bold:
-                run.font.bold = bold
-            if italic:
-                run.font.italic = italic
-            if color:
-                run.font.color.rgb = RGBColor(
-                    int(color[0:2], 16),
-                    int(color[2:4], 16),
-                    int(color[4:6], 16)
-                )
-            if highlight:
-                from docx.oxml.shared import OxmlElement
-                from docx.oxml.ns import qn
-                shd = OxmlElement('w:shd')
-                shd.set(qn('w:fill'), highlight)
-                run._element.get_or_add_rPr().append(shd)
-
-    # 设置段落格式：缩进
-    if first_line_indent is not None:
-        new_para.paragraph_format.first_line_indent = Inches(first_line_indent / 2.54)
-    if left_indent is not None:
-        new_para.paragraph_format.left_indent = Inches(left_indent / 2.54)
-    if right_indent is not None:
-        new_para.paragraph_format.right_indent = Inches(right_indent / 2.54)
-
-    # 设置段落格式：对齐方式
-    if alignment:
-        alignment_map = {
-            'left': WD_ALIGN_PARAGRAPH.LEFT,
-            'center': WD_ALIGN_PARAGRAPH.CENTER,
-            'right': WD_ALIGN_PARAGRAPH.RIGHT,
-            'justify': WD_ALIGN_PARAGRAPH.JUSTIFY
-        }
-        if alignment.lower() in alignment_map:
-            new_para.paragraph_format.alignment = alignment_map[alignment.lower()]
+    spec = _paragraph_format(
+        font_name, font_size, bold, italic, color, highlight,
+        first_line_indent, left_indent, right_indent, alignment
+    )
+
+    # 在起始段落之前插入新段落，再删除原来的起始段落
+    target_para = body_index.paragraph(start_index)
+    ParagraphWriter(doc).add(new_text, style=style, spec=spec, before=target_para)
+    p_element = target_para._element
+    p_element.getparent().remove(p_element)
 
     doc_manager.save(abs_path, doc)
 
@@ -599,6 +553,21 @@ async def replace_paragraph_range(
     }
 
 
+@registry.tool(
+    description="在文档中查找文本",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "text_to_find": {"type": "string", "description": "要查找的文本"},
+            "match_case": {"type": "boolean", "description": "是否区分大小写"},
+            "whole_word": {"type": "boolean", "description": "是否全字匹配"}
+        },
+        "required": ["filename", "text_to_find"]
+    },
+    read_only=True,
+    cpu_bound=True
+)
 @handle_docx_errors
 async def find_text(
     filename: str,
@@ -616,32 +585,27 @@ async def find_text(
         whole_word: 是否全字匹配（默认False）
     """
     abs_path = validate_file_path(filename)
-    doc = doc_manager.get_or_open(abs_path)
 
     occurrences = []
     search_text = text_to_find if match_case else text_to_find.lower()
+    # 全字匹配的正则只编译一次
+    pattern = re.compile(r'\b' + re.escape(search_text) + r'\b') if whole_word else None
+
+    # 流式读取段落文本，不构建文档对象模型
+    for para_idx, text in enumerate(doc_manager.iter_paragraph_texts(abs_path)):
+        para_text = text if match_case else text.lower()
 
-    for para_idx, para in enumerate(doc.paragraphs):
-        para_text = para.text if match_case else para.text.lower()
-
-        if whole_word:
-            import re
-            pattern = r'\b' + re.escape(search_text) + r'\b'
-            matches = list(re.finditer(pattern, para_text))
-            if matches:
-                occurrences.append({
-                    "paragraph_index": para_idx,
-                    "text": para.text,
-                    "count": len(matches)
-                })
+        if pattern is not None:
+            count = sum(1 for _ in pattern.finditer(para_text))
         else:
-            if search_text in para_text:
-                count = para_text.count(search_text)
-                occurrences.append({
-                    "paragraph_index": para_idx,
-                    "text": para.text,
-                    "count": count
-                })
+            count = para_text.count(search_text) if search_text in para_text else 0
+
+        if count:
+            occurrences.append({
+                "paragraph_index": para_idx,
+                "text": text,
+                "count": count
+            })
 
     return {
         "success": True,
@@ -652,41 +616,198 @@ async def find_text(
     }
 
 
+def _search_lock_paths(arguments: dict) -> List[str]:
+    """检索范围内有未落盘修改的文档：检索时按内存中的内容读取，需要先加读锁"""
+    dirty_paths = doc_manager.dirty_paths()
+    if not dirty_paths:
+        return []
+    if arguments.get("filenames"):
+        wanted = {os.path.abspath(name) for name in arguments["filenames"]}
+        return [path for path in dirty_paths if path in wanted]
+    abs_dir = os.path.abspath(arguments.get("directory") or ".")
+    if arguments.get("recursive"):
+        prefix = os.path.join(abs_dir, "")
+        return [path for path in dirty_paths if path.startswith(prefix)]
+    return [path for path in dirty_paths if os.path.dirname(path) == abs_dir]
+
+
+@registry.tool(
+    description="在多个文档中全文检索（基于持久化的倒排索引，只有变化的文件会重新建立索引）",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "query": {"type": "string", "description": "要查找的文本"},
+            "directory": {"type": "string", "description": "在该目录下的所有Word文档中查找（默认为当前目录）"},
+            "filenames": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "要查找的文档路径列表（可选，指定后忽略 directory）"
+            },
+            "recursive": {"type": "boolean", "description": "是否包含子目录（默认false）"},
+            "match_case": {"type": "boolean", "description": "是否区分大小写（默认false）"},
+            "whole_word": {"type": "boolean", "description": "是否全字匹配（默认false）"},
+            "max_results": {"type": "integer", "description": "最多返回的匹配条目数（默认100）"}
+        },
+        "required": ["query"]
+    },
+    read_only=True,
+    lock_paths=_search_lock_paths
+)
+@handle_docx_errors
+async def search_documents(
+    query: str,
+    directory: str = ".",
+    filenames: Optional[List[str]] = None,
+    recursive: bool = False,
+    match_case: bool = False,
+    whole_word: bool = False,
+    max_results: int = 100
+) -> Dict[str, Any]:
+    """
+    在多个文档的正文段落和表格单元格中查找文本
+
+    参数:
+        query: 要查找的文本
+        directory: 在该目录下的所有Word文档中查找（默认为当前目录）
+        filenames: 要查找的文档路径列表（可选，指定后忽略 directory）
+        recursive: 是否包含子目录（默认False）
+        match_case: 是否区分大小写（默认False）
+        whole_word: 是否全字匹配（默认False）
+        max_results: 最多返回的匹配条目数（默认100）
+    """
+    if not query:
+        raise ValueError("查找文本不能为空")
+
+    if filenames:
+        paths = [validate_file_path(name) for name in filenames]
+    else:
+        abs_dir = os.path.abspath(directory)
+        if not os.path.isdir(abs_dir):
+            raise FileNotFoundError(f"目录不存在: {abs_dir}")
+        paths = []
+        for root, dirs, files in os.walk(abs_dir):
+            if not recursive:
+                dirs.clear()
+            else:
+                dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            paths.extend(
+                os.path.join(root, name) for name in sorted(files)
+                if name.endswith('.docx') and not name.startswith('~$')
+            )
+
+    # 有未落盘修改的文档按内存中的内容检索；只读取已加读锁的文档（加锁后才变脏的文档
+    # 可能正在被修改，按磁盘内容检索）
+    pending = {
+        path: doc_manager.get_or_open(path) for path in paths
+        if doc_manager.is_dirty(path) and doc_manager.holds_lock(path)
+    }
+
+    result = get_search_index().search(
+        paths, query,
+        match_case=match_case,
+        whole_word=whole_word,
+        max_results=max_results,
+        documents=pending
+    )
+
+    return {
+        "success": True,
+        "query": query,
+        "documents_searched": len(paths),
+        "matches_returned": len(result["results"]),
+        **result
+    }
+
+
+@registry.tool(
+    description="替换文档中的文本（支持跨格式片段的匹配、正则表达式和一次执行多组替换，覆盖正文、表格和页眉页脚）",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "find_text": {"type": "string", "description": "要查找的文本"},
+            "replace_text": {"type": "string", "description": "替换后的文本"},
+            "use_regex": {"type": "boolean", "description": "是否按正则表达式匹配（默认false，替换文本支持 \\1 等分组引用）"},
+            "match_case": {"type": "boolean", "description": "是否区分大小写（默认true）"},
+            "replacements": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "find": {"type": "string", "description": "要查找的文本"},
+                        "replace": {"type": "string", "description": "替换后的文本"},
+                        "regex": {"type": "boolean", "description": "是否按正则表达式匹配"},
+                        "match_case": {"type": "boolean", "description": "是否区分大小写"}
+                    },
+                    "required": ["find", "replace"]
+                },
+                "description": "多组替换（可选），在一次遍历中全部应用，与 find_text/replace_text 可同时使用"
+            },
+            "include_headers_footers": {"type": "boolean", "description": "是否同时替换页眉页脚（默认true）"}
+        },
+        "required": ["filename"]
+    }
+)
 @handle_docx_errors
 async def replace_text(
     filename: str,
-    find_text: str,
-    replace_text: str
+    find_text: Optional[str] = None,
+    replace_text: Optional[str] = None,
+    use_regex: bool = False,
+    match_case: bool = True,
+    replacements: Optional[List[Dict[str, Any]]] = None,
+    include_headers_footers: bool = True
 ) -> Dict[str, Any]:
     """
     替换文档中的文本
 
+    段落文本被拆分到多个 run 时同样能匹配；替换文本继承匹配起点所在 run 的格式。
+    所有替换规则在一次遍历中应用，文档只保存一次。
+
     参数:
         filename: 文档路径
         find_text: 要查找的文本
         replace_text: 替换后的文本
+        use_regex: 是否按正则表达式匹配（默认False）
+        match_case: 是否区分大小写（默认True）
+        replacements: 多组替换 [{"find", "replace", "regex", "match_case"}]（可选）
+        include_headers_footers: 是否同时替换页眉页脚（默认True）
     """
     abs_path = validate_file_path(filename)
-    doc = doc_manager.get_or_open(abs_path)
 
-    replacement_count = 0
+    rules = []
+    if find_text is not None:
+        if replace_text is None:
+            raise ValueError("缺少 replace_text 参数")
+        rules.append(ReplaceRule(find_text, replace_text, regex=use_regex, match_case=match_case))
+    for item in replacements or []:
+        rules.append(ReplaceRule(
+            item.get("find", ""),
+            item.get("replace", ""),
+            regex=item.get("regex", use_regex),
+            match_case=item.get("match_case", match_case)
+        ))
+    if not rules:
+        raise ValueError("请提供 find_text/replace_text 或 replacements")
 
-    # 遍历所有段落
-    for para in doc.paragraphs:
-        if find_text in para.text:
-            # 替换段落中的文本
-            inline = para.runs
-            for run in inline:
-                if find_text in run.text:
-                    run.text = run.text.replace(find_text, replace_text)
-                    replacement_count += 1
+    doc = doc_manager.get_or_open(abs_path)
+    counts = replace_in_document(doc, rules, include_headers_footers)
+    replacement_count = sum(counts.values())
 
-    doc_manager.save(abs_path, doc)
+    if replacement_count:
+        doc_manager.save(abs_path, doc)
 
-    return {
+    result = {
         "success": True,
         "message": f"替换完成，共替换{replacement_count}处",
-        "find_text": find_text,
-        "replace_text": replace_text,
-        "replacement_count": replacement_count
+        "replacement_count": replacement_count,
+        "locations": counts,
+        "rules": [
+            {"find": rule.find, "replace": rule.replace, "count": rule.count}
+            for rule in rules
+        ]
     }
+    if find_text is not None:
+        result["find_text"] = find_text
+        result["replace_text"] = replace_text
+    return result
@@ -1,14 +1,35 @@
 """文档基础操作工具"""
 import os
+from itertools import islice
 from typing import Optional, Dict, Any
 from docx import Document
 from ..utils import DocumentManager, validate_file_path, handle_docx_errors
+from ..utils.body_index import StyleNames, get_paragraph, iter_block_range, count_blocks
+from ..utils.heading_cache import get_heading_cache
+from ..utils.image_prep import get_image_cache
+from ..utils.package_io import save_stats
+from ..utils.search_index import get_search_index
+from ..utils.executor import get_tool_executor, get_process_backend
+from .registry import registry, timing
 
 
 # 全局文档管理器实例
 doc_manager = DocumentManager()
 
 
+@registry.tool(
+    description="创建新的Word文档",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档保存路径"},
+            "title": {"type": "string", "description": "文档标题（可选）"},
+            "author": {"type": "string", "description": "作者（可选）"},
+            "subject": {"type": "string", "description": "主题（可选）"}
+        },
+        "required": ["filename"]
+    }
+)
 @handle_docx_errors
 async def create_document(
     filename: str,
@@ -39,6 +60,8 @@ async def create_document(
         core_properties.subject = subject
 
     doc_manager.save(abs_path, doc)
+    # 新建的文档立即落盘，保证后续按路径访问的工具能找到文件
+    doc_manager.flush(abs_path)
 
     return {
         "success": True,
@@ -47,6 +70,17 @@ async def create_document(
     }
 
 
+@registry.tool(
+    description="获取文档信息和元数据",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"}
+        },
+        "required": ["filename"]
+    },
+    read_only=True
+)
 @handle_docx_errors
 async def get_document_info(filename: str) -> Dict[str, Any]:
     """
@@ -81,38 +115,83 @@ async def get_document_info(filename: str) -> Dict[str, Any]:
     }
 
 
+@registry.tool(
+    description="提取文档的全部文本内容（可通过 offset/limit 按段落分页读取大文档）",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "offset": {"type": "integer", "description": "跳过前多少个非空段落（可选，默认0）"},
+            "limit": {"type": "integer", "description": "最多返回多少个非空段落（可选，默认全部）"}
+        },
+        "required": ["filename"]
+    },
+    read_only=True,
+    cpu_bound=True
+)
 @handle_docx_errors
-async def get_document_text(filename: str) -> Dict[str, Any]:
+async def get_document_text(
+    filename: str,
+    offset: int = 0,
+    limit: Optional[int] = None
+) -> Dict[str, Any]:
     """
     提取文档的全部文本内容
 
     参数:
         filename: 文档路径
+        offset: 跳过前多少个非空段落（可选，默认0）
+        limit: 最多返回多少个非空段落（可选，默认全部）
     """
     abs_path = validate_file_path(filename)
 
     if not os.path.exists(abs_path):
         raise FileNotFoundError(f"文件不存在: {abs_path}")
 
-    doc = doc_manager.get_or_open(abs_path, reload=True)
+    if offset < 0:
+        raise ValueError(f"offset 不能为负数: {offset}")
+    if limit is not None and limit < 0:
+        raise ValueError(f"limit 不能为负数: {limit}")
 
-    # 提取所有段落文本
-    text_content = []
-    for para in doc.paragraphs:
-        if para.text.strip():
-            text_content.append(para.text)
+    # 流式解析 document.xml，不构建对象模型（有未落盘修改时读取内存中的文档）
+    paragraph_texts = doc_manager.iter_paragraph_texts(abs_path)
+
+    # 提取非空段落文本（多读取一个用于判断是否还有后续内容）
+    non_empty = (text for text in paragraph_texts if text.strip())
+    stop = None if limit is None else offset + limit + 1
+    text_content = list(islice(non_empty, offset, stop))
+    has_more = limit is not None and len(text_content) > limit
+    if has_more:
+        text_content.pop()
+    if hasattr(paragraph_texts, "close"):
+        paragraph_texts.close()
 
     full_text = "\n".join(text_content)
 
-    return {
+    result = {
         "success": True,
         "filename": filename,
         "text": full_text,
         "paragraph_count": len(text_content),
         "character_count": len(full_text)
     }
-
-
+    if offset or limit is not None:
+        result["offset"] = offset
+        result["has_more"] = has_more
+        if has_more:
+            result["next_offset"] = offset + len(text_content)
+    return result
+
+
+@registry.tool(
+    description="列出指定目录下的所有Word文档",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "directory": {"type": "string", "description": "目录路径（默认为当前目录）"}
+        }
+    }
+)
 @handle_docx_errors
 async def list_available_documents(directory: str = ".") -> Dict[str, Any]:
     """
@@ -150,6 +229,17 @@ async def list_available_documents(directory: str = ".") -> Dict[str, Any]:
     }
 
 
+@registry.tool(
+    description="复制Word文档",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "source_filename": {"type": "string", "description": "源文档路径"},
+            "destination_filename": {"type": "string", "description": "目标文档路径（可选）"}
+        },
+        "required": ["source_filename"]
+    }
+)
 @handle_docx_errors
 async def copy_document(source_filename: str, destination_filename: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -172,6 +262,9 @@ async def copy_document(source_filename: str, destination_filename: Optional[str
     else:
         dest_path = validate_file_path(destination_filename)
 
+    # 复制前写入尚未落盘的修改
+    doc_manager.flush(source_path)
+
     shutil.copy2(source_path, dest_path)
 
     return {
@@ -182,6 +275,18 @@ async def copy_document(source_filename: str, destination_filename: Optional[str
     }
 
 
+@registry.tool(
+    description="获取指定段落的文本内容",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "paragraph_index": {"type": "integer", "description": "段落索引（从0开始）"}
+        },
+        "required": ["filename", "paragraph_index"]
+    },
+    read_only=True
+)
 @handle_docx_errors
 async def get_paragraph_text(filename: str, paragraph_index: int) -> Dict[str, Any]:
     """
@@ -198,10 +303,7 @@ async def get_paragraph_text(filename: str, paragraph_index: int) -> Dict[str, A
 
     doc = doc_manager.get_or_open(abs_path, reload=True)
 
-    if paragraph_index < 0 or paragraph_index >= len(doc.paragraphs):
-        raise ValueError(f"段落索引超出范围: {paragraph_index}，文档共有{len(doc.paragraphs)}个段落")
-
-    para = doc.paragraphs[paragraph_index]
+    para = get_paragraph(doc, paragraph_index)
 
     return {
         "success": True,
@@ -213,6 +315,20 @@ async def get_paragraph_text(filename: str, paragraph_index: int) -> Dict[str, A
     }
 
 
+@registry.tool(
+    description="获取指定范围段落的文本内容",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "start_index": {"type": "integer", "description": "起始段落索引（从0开始，包含）"},
+            "end_index": {"type": "integer", "description": "结束段落索引（从0开始，包含）"}
+        },
+        "required": ["filename", "start_index", "end_index"]
+    },
+    read_only=True,
+    cpu_bound=True
+)
 @handle_docx_errors
 async def get_paragraph_range_text(
     filename: str,
@@ -236,52 +352,31 @@ async def get_paragraph_range_text(
 
     doc = doc_manager.get_or_open(abs_path, reload=True)
 
-    # 获取文档中所有元素的顺序（段落和表格）
-    elements = []
-    for element in doc.element.body:
-        if element.tag.endswith('p'):  # 段落
-            para_index = len([e for e in elements if e['type'] == 'paragraph'])
-            para = doc.paragraphs[para_index]
-            elements.append({
-                'type': 'paragraph',
-                'content': para
-            })
-        elif element.tag.endswith('tbl'):  # 表格
-            table_index = len([e for e in elements if e['type'] == 'table'])
-            table = doc.tables[table_index]
-            elements.append({
-                'type': 'table',
-                'content': table
-            })
-
-    total_elements = len(elements)
-
-    if start_index < 0 or end_index >= total_elements:
-        raise ValueError(f"元素索引超出范围，文档共有{total_elements}个元素（段落+表格）")
+    if start_index < 0:
+        raise ValueError(f"元素索引超出范围，文档共有{count_blocks(doc)}个元素（段落+表格）")
 
     if start_index > end_index:
         raise ValueError(f"起始索引({start_index})不能大于结束索引({end_index})")
 
-    # 提取范围内的元素
+    # 只为范围内的元素创建段落/表格对象，遍历到 end_index 即停止
+    style_names = StyleNames(doc)
     elements_data = []
     text_parts = []
 
-    for i in range(start_index, end_index + 1):
-        element = elements[i]
-
-        if element['type'] == 'paragraph':
-            para = element['content']
+    for i, element_type, content in iter_block_range(doc, start_index, end_index):
+        if element_type == 'paragraph':
+            para = content
             elements_data.append({
                 "index": i,
                 "type": "paragraph",
                 "text": para.text,
-                "style": para.style.name if para.style else "",
+                "style": style_names.paragraph_style(para),
                 "character_count": len(para.text)
             })
             text_parts.append(para.text)
 
-        elif element['type'] == 'table':
-            table = element['content']
+        else:
+            table = content
             # 提取表格数据
             table_data = []
             for row in table.rows:
@@ -301,6 +396,9 @@ async def get_paragraph_range_text(
             })
             text_parts.append(f"[表格 {len(table.rows)}行x{len(table.columns)}列]\n{table_text}")
 
+    if len(elements_data) < end_index - start_index + 1:
+        raise ValueError(f"元素索引超出范围，文档共有{count_blocks(doc)}个元素（段落+表格）")
+
     # 合并所有元素的文本
     combined_text = "\n\n".join(text_parts)
 
@@ -314,3 +412,91 @@ async def get_paragraph_range_text(
         "combined_text": combined_text,
         "total_characters": len(combined_text)
     }
+
+
+@registry.tool(
+    description="获取服务器运行统计（文档缓存命中/未命中次数、待写入文档、线程池排队深度和等待时间等）",
+    input_schema={
+        "type": "object",
+        "properties": {}
+    }
+)
+@handle_docx_errors
+async def get_server_stats() -> Dict[str, Any]:
+    """
+    获取服务器运行统计（文档缓存命中率、待写入文档、线程池排队情况、各工具耗时等）
+    """
+    process_backend = get_process_backend()
+
+    return {
+        "success": True,
+        "cache": doc_manager.cache_stats(),
+        "write_buffer": doc_manager.write_buffer_stats(),
+        "locks": doc_manager.lock_stats(),
+        "executor": get_tool_executor().stats(),
+        "process_pool": process_backend.stats() if process_backend is not None else {"enabled": False},
+        "search_index": get_search_index().stats(),
+        "heading_cache": get_heading_cache().stats(),
+        "image_cache": get_image_cache().stats(),
+        "save": {**save_stats.stats(), "compression": doc_manager.compression.to_dict(),
+                 "workers": doc_manager.save_workers},
+        "tools": timing.stats()
+    }
+
+
+@registry.tool(
+    description="将文档尚未落盘的修改写入磁盘（延迟写入模式下使用）",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"}
+        },
+        "required": ["filename"]
+    }
+)
+@handle_docx_errors
+async def flush_document(filename: str) -> Dict[str, Any]:
+    """
+    将文档尚未落盘的修改写入磁盘（延迟写入模式）
+
+    参数:
+        filename: 文档路径
+    """
+    abs_path = validate_file_path(filename)
+    flushed = doc_manager.flush(abs_path)
+
+    return {
+        "success": True,
+        "message": "文档已写入磁盘" if flushed else "文档没有待写入的修改",
+        "path": abs_path,
+        "flushed": flushed
+    }
+
+
+@registry.tool(
+    description="关闭文档：写入尚未落盘的修改并释放内存中的文档",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"}
+        },
+        "required": ["filename"]
+    }
+)
+@handle_docx_errors
+async def close_document(filename: str) -> Dict[str, Any]:
+    """
+    关闭文档：写入尚未落盘的修改并释放内存中的文档
+
+    参数:
+        filename: 文档路径
+    """
+    abs_path = validate_file_path(filename)
+    flushed = doc_manager.close(abs_path)
+
+    return {
+        "success": True,
+        "message": "文档已关闭",
+        "path": abs_path,
+        "flushed": flushed
+    }
@@ -1,24 +1,53 @@
 """图片操作工具"""
+import io
 import os
 from typing import Optional, Dict, Any
 from docx.shared import Inches
 from ..utils import DocumentManager, validate_file_path, handle_docx_errors
+from ..utils.body_index import BodyIndex, get_paragraph
+from ..utils.image_prep import ImageOptions, needs_preprocessing, prepare_image
+from .registry import registry
 
 # 全局文档管理器实例
 doc_manager = DocumentManager()
 
 
+@registry.tool(
+    description="插入图片到Word文档（在指定索引之后插入），可按显示尺寸降采样并重新压缩",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "image_path": {"type": "string", "description": "图片文件路径"},
+            "position": {"type": "integer", "description": "插入位置（段落索引，从0开始）。新图片将插入到指定索引之后。例如：position=0表示插入到索引0之后。不指定则追加到文档末尾"},
+            "width": {"type": "number", "description": "图片宽度（英寸，可选）"},
+            "height": {"type": "number", "description": "图片高度（英寸，可选）"},
+            "max_dpi": {"type": "number", "description": "按显示宽度计算的最大分辨率（可选，如150），像素超出时缩小后再嵌入"},
+            "image_format": {"type": "string", "enum": ["auto", "jpeg", "png"], "description": "重新编码的格式（可选）：auto 表示 JPEG 保持 JPEG、其他格式转为 PNG"},
+            "jpeg_quality": {"type": "integer", "description": "JPEG 压缩质量（1-95，默认85）"},
+            "optimize": {"type": "boolean", "description": "是否使用 PNG/JPEG 的 optimize 编码（体积更小，编码更慢）"}
+        },
+        "required": ["filename", "image_path"]
+    }
+)
 @handle_docx_errors
 async def insert_image(
     filename: str,
     image_path: str,
     position: Optional[int] = None,
     width: Optional[float] = None,
-    height: Optional[float] = None
+    height: Optional[float] = None,
+    max_dpi: Optional[float] = None,
+    image_format: Optional[str] = None,
+    jpeg_quality: Optional[int] = None,
+    optimize: bool = False
 ) -> Dict[str, Any]:
     """
     插入图片到Word文档
 
+    指定了预处理参数（max_dpi、image_format、jpeg_quality、optimize）时，先按显示尺寸缩小并重新编码，
+    处理结果按图片内容缓存；WebP 等 python-docx 不支持的格式总是转换为 PNG 后再插入。
+
     参数:
         filename: 文档路径
         image_path: 图片文件路径
@@ -29,59 +58,78 @@ async def insert_image(
                  None表示追加到文档末尾
         width: 图片宽度（英寸，可选）
         height: 图片高度（英寸，可选）
+        max_dpi: 按显示宽度计算的最大分辨率（可选）
+        image_format: 重新编码的格式：auto、jpeg、png（可选）
+        jpeg_quality: JPEG 压缩质量（1-95，可选）
+        optimize: 是否使用 optimize 编码
     """
     abs_path = validate_file_path(filename)
-    doc = doc_manager.get_or_open(abs_path)
 
     if not os.path.exists(image_path):
         raise FileNotFoundError(f"图片文件不存在: {image_path}")
 
+    options = None
+    if max_dpi is not None or image_format is not None or jpeg_quality is not None or optimize:
+        options = ImageOptions(max_dpi, image_format or "auto",
+                               jpeg_quality if jpeg_quality is not None else 85, optimize)
+
+    picture = image_path
+    picture_width = Inches(width) if width else None
+    picture_height = Inches(height) if height else None
+    prepared = None
+    if needs_preprocessing(options, image_path):
+        # 解码和压缩在打开文档之前完成
+        prepared = prepare_image(image_path, width, height, options)
+        picture = io.BytesIO(prepared.blob)
+        picture_width, picture_height = Inches(prepared.width), Inches(prepared.height)
+
+    doc = doc_manager.get_or_open(abs_path)
+
     # 如果指定了位置，在指定索引之后插入
     if position is not None:
-        if position < 0 or position >= len(doc.paragraphs):
-            raise ValueError(f"位置索引超出范围: {position}，有效范围: 0-{len(doc.paragraphs)-1}")
+        body_index = BodyIndex(doc)
+        paragraph_count = body_index.paragraph_count
+        if position < 0 or position >= paragraph_count:
+            raise ValueError(f"位置索引超出范围: {position}，有效范围: 0-{paragraph_count-1}")
 
         # 在指定索引之后插入一个新段落
-        if position + 1 >= len(doc.paragraphs):
+        if position + 1 >= paragraph_count:
             # 如果 position 是最后一个段落，则追加到末尾
             para = doc.add_paragraph()
         else:
             # 在 position+1 的位置之前插入（即在 position 之后）
-            para = doc.paragraphs[position + 1].insert_paragraph_before()
-
-        # 在新段落中插入图片
-        run = para.add_run()
-        if width and height:
-            run.add_picture(image_path, width=Inches(width), height=Inches(height))
-        elif width:
-            run.add_picture(image_path, width=Inches(width))
-        elif height:
-            run.add_picture(image_path, height=Inches(height))
-        else:
-            run.add_picture(image_path)
+            para = body_index.paragraph(position + 1).insert_paragraph_before()
     else:
         # 追加到文档末尾
         para = doc.add_paragraph()
-        run = para.add_run()
-        if width and height:
-            run.add_picture(image_path, width=Inches(width), height=Inches(height))
-        elif width:
-            run.add_picture(image_path, width=Inches(width))
-        elif height:
-            run.add_picture(image_path, height=Inches(height))
-        else:
-            run.add_picture(image_path)
+
+    # 在新段落中插入图片
+    para.add_run().add_picture(picture, width=picture_width, height=picture_height)
 
     doc_manager.save(abs_path, doc)
 
-    return {
+    result = {
         "success": True,
         "message": f"图片插入成功（位置: {position if position is not None else '文档末尾'}）",
         "image_path": image_path,
         "position": position
     }
-
-
+    if prepared is not None:
+        result["preprocess"] = prepared.info
+    return result
+
+
+@registry.tool(
+    description="删除指定段落中的图片",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "paragraph_index": {"type": "integer", "description": "包含图片的段落索引（从0开始）"}
+        },
+        "required": ["filename", "paragraph_index"]
+    }
+)
 @handle_docx_errors
 async def delete_image(
     filename: str,
@@ -97,10 +145,7 @@ async def delete_image(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if paragraph_index < 0 or paragraph_index >= len(doc.paragraphs):
-        raise ValueError(f"段落索引超出范围: {paragraph_index}")
-
-    para = doc.paragraphs[paragraph_index]
+    para = get_paragraph(doc, paragraph_index)
 
     # 检查段落中是否有图片
     has_image = False
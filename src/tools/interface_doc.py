@@ -11,6 +11,8 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.ns import qn
 
 from ..utils import DocumentManager, validate_file_path, handle_docx_errors
+from ..utils.body_index import BodyIndex
+from .registry import registry
 
 # 全局文档管理器实例
 doc_manager = DocumentManager()
@@ -57,6 +59,41 @@ def set_cell_text(cell, text: str, bold: bool = False, font_size: float = 10.5):
     run.font.bold = bold
 
 
+@registry.tool(
+    description="在指定位置插入标准格式的接口文档表格",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "position": {"type": "integer", "description": "插入位置（段落索引，0表示开头）"},
+            "name": {"type": "string", "description": "接口名称"},
+            "path": {"type": "string", "description": "访问路径"},
+            "description": {"type": "string", "description": "服务说明"},
+            "method": {"type": "string", "description": "请求方式（默认POST）"},
+            "request_params": {
+                "type": "array",
+                "description": "请求参数列表",
+                "items": {
+                    "type": "array",
+                    "description": "参数信息 [字段名, 类型, 是否必填, 说明]",
+                    "items": {"type": "string"}
+                }
+            },
+            "response_params": {
+                "type": "array",
+                "description": "响应参数列表",
+                "items": {
+                    "type": "array",
+                    "description": "参数信息 [字段名, 类型, 是否必填, 说明]",
+                    "items": {"type": "string"}
+                }
+            },
+            "request_example": {"type": "string", "description": "请求示例（可选）"},
+            "response_example": {"type": "string", "description": "响应示例（可选）"}
+        },
+        "required": ["filename", "position", "name", "path", "description"]
+    }
+)
 @handle_docx_errors
 async def insert_interface_doc(
     filename: str,
@@ -109,12 +146,13 @@ async def insert_interface_doc(
         rows += 2  # 响应示例标题行 + 内容行
 
     # 在指定位置插入表格
-    if position >= len(doc.paragraphs):
+    body_index = BodyIndex(doc)
+    if position >= body_index.paragraph_count:
         # 如果位置超出范围，在末尾添加
         table = doc.add_table(rows=rows, cols=4)
     else:
         # 在指定段落前插入表格
-        target_para = doc.paragraphs[position]
+        target_para = body_index.paragraph(position)
         table = doc.add_table(rows=rows, cols=4)
         # 将表格移动到目标位置
         table_element = table._element
@@ -1,14 +1,31 @@
 """列表操作工具"""
 import os
 from typing import List, Dict, Any, Optional
-from docx.shared import Pt, RGBColor, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
 from ..utils import DocumentManager, validate_file_path, handle_docx_errors
+from ..utils.formatting import FormatSpec, ParagraphWriter
+from .registry import registry
 
 # 全局文档管理器实例
 doc_manager = DocumentManager()
 
 
+@registry.tool(
+    description="添加无序列表（项目符号列表）",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "items": {"type": "array", "items": {"type": "string"}, "description": "列表项内容"},
+            "font_name": {"type": "string", "description": "字体名称（可选）"},
+            "font_size": {"type": "integer", "description": "字号（可选）"},
+            "bold": {"type": "boolean", "description": "是否粗体"},
+            "italic": {"type": "boolean", "description": "是否斜体"},
+            "color": {"type": "string", "description": "文字颜色，十六进制RGB（可选）"},
+            "highlight": {"type": "string", "description": "背景色（高亮），十六进制RGB（可选）"}
+        },
+        "required": ["filename", "items"]
+    }
+)
 @handle_docx_errors
 async def add_bullet_list(
     filename: str,
@@ -39,33 +56,14 @@ async def add_bullet_list(
     if not items:
         raise ValueError("列表项不能为空")
 
-    # 添加无序列表
+    # 添加无序列表（样式ID和格式模板在各列表项间共享）
+    spec = FormatSpec.of(
+        font_name=font_name, font_size=font_size, bold=bold or None, italic=italic or None,
+        color=color, highlight=highlight
+    )
+    writer = ParagraphWriter(doc)
     for item in items:
-        para = doc.add_paragraph(item, style='List Bullet')
-
-        # 设置字体格式
-        if any([font_name, font_size, bold, italic, color, highlight]):
-            for run in para.runs:
-                if font_name:
-                    run.font.name = font_name
-                if font_size:
-                    run.font.size = Pt(font_size)
-                if bold:
-                    run.font.bold = bold
-                if italic:
-                    run.font.italic = italic
-                if color:
-                    run.font.color.rgb = RGBColor(
-                        int(color[0:2], 16),
-                        int(color[2:4], 16),
-                        int(color[4:6], 16)
-                    )
-                if highlight:
-                    from docx.oxml.shared import OxmlElement
-                    from docx.oxml.ns import qn
-                    shd = OxmlElement('w:shd')
-                    shd.set(qn('w:fill'), highlight)
-                    run._element.get_or_add_rPr().append(shd)
+        writer.add(item, style='List Bullet', spec=spec)
 
     doc_manager.save(abs_path, doc)
 
@@ -76,6 +74,23 @@ async def add_bullet_list(
     }
 
 
+@registry.tool(
+    description="添加有序列表（编号列表）",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "items": {"type": "array", "items": {"type": "string"}, "description": "列表项内容"},
+            "font_name": {"type": "string", "description": "字体名称（可选）"},
+            "font_size": {"type": "integer", "description": "字号（可选）"},
+            "bold": {"type": "boolean", "description": "是否粗体"},
+            "italic": {"type": "boolean", "description": "是否斜体"},
+            "color": {"type": "string", "description": "文字颜色，十六进制RGB（可选）"},
+            "highlight": {"type": "string", "description": "背景色（高亮），十六进制RGB（可选）"}
+        },
+        "required": ["filename", "items"]
+    }
+)
 @handle_docx_errors
 async def add_numbered_list(
     filename: str,
@@ -106,33 +121,14 @@ async def add_numbered_list(
     if not items:
         raise ValueError("列表项不能为空")
 
-    # 添加有序列表
+    # 添加有序列表（样式ID和格式模板在各列表项间共享）
+    spec = FormatSpec.of(
+        font_name=font_name, font_size=font_size, bold=bold or None, italic=italic or None,
+        color=color, highlight=highlight
+    )
+    writer = ParagraphWriter(doc)
     for item in items:
-        para = doc.add_paragraph(item, style='List Number')
-
-        # 设置字体格式
-        if any([font_name, font_size, bold, italic, color, highlight]):
-            for run in para.runs:
-                if font_name:
-                    run.font.name = font_name
-                if font_size:
-                    run.font.size = Pt(font_size)
-                if bold:
-                    run.font.bold = bold
-                if italic:
-                    run.font.italic = italic
-                if color:
-                    run.font.color.rgb = RGBColor(
-                        int(color[0:2], 16),
-                        int(color[2:4], 16),
-                        int(color[4:6], 16)
-                    )
-                if highlight:
-                    from docx.oxml.shared import OxmlElement
-                    from docx.oxml.ns import qn
-                    shd = OxmlElement('w:shd')
-                    shd.set(qn('w:fill'), highlight)
-                    run._element.get_or_add_rPr().append(shd)
+        writer.add(item, style='List Number', spec=spec)
 
     doc_manager.save(abs_path, doc)
 
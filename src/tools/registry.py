@@ -0,0 +1,166 @@
+"""工具注册表 - 通过装饰器集中登记 MCP 工具
+
+每个工具在定义处用 ``@registry.tool(...)`` 声明描述和参数 schema，
+服务器据此一次性构建名称到处理函数的映射和不可变的 Tool 列表，
+并在统一的调用链上挂载中间件（计时、加锁、执行器等）。
+"""
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from mcp.types import Tool
+
+# 中间件签名: async def middleware(spec, arguments, call_next) -> dict
+Middleware = Callable[["ToolSpec", dict, Callable[[dict], Awaitable[dict]]], Awaitable[dict]]
+
+# 是否只读：固定值，或根据调用参数判断的函数（如带 output_path 时需要写文件）
+ReadOnly = Union[bool, Callable[[dict], bool]]
+
+
+class ToolSpec:
+    """已注册工具的元数据"""
+    __slots__ = ("name", "handler", "description", "input_schema", "read_only", "cpu_bound", "lock_paths")
+
+    def __init__(self, name: str, handler: Callable, description: str, input_schema: dict,
+                 read_only: ReadOnly, cpu_bound: bool,
+                 lock_paths: Optional[Callable[[dict], Iterable[str]]] = None):
+        self.name = name
+        self.handler = handler
+        self.description = description
+        self.input_schema = input_schema
+        self.read_only = read_only
+        self.cpu_bound = cpu_bound
+        self.lock_paths = lock_paths
+
+    def is_read_only(self, arguments: dict) -> bool:
+        """按本次调用的参数判断是否只读"""
+        if callable(self.read_only):
+            return bool(self.read_only(arguments))
+        return self.read_only
+
+
+class ToolRegistry:
+    """工具注册表"""
+
+    def __init__(self):
+        self._specs: Dict[str, ToolSpec] = {}
+        self._tools: Optional[Tuple[Tool, ...]] = None
+        self._middleware: List[Middleware] = []
+        self._chain: Optional[Callable[[ToolSpec, dict], Awaitable[dict]]] = None
+        self._invoker: Callable[[ToolSpec, dict], Awaitable[dict]] = _default_invoker
+
+    def tool(self, description: str, input_schema: dict, name: Optional[str] = None,
+             read_only: ReadOnly = False, cpu_bound: bool = False,
+             lock_paths: Optional[Callable[[dict], Iterable[str]]] = None) -> Callable:
+        """注册工具的装饰器
+
+        参数:
+            description: 工具描述
+            input_schema: 参数的 JSON Schema
+            name: 工具名称（默认使用函数名）
+            read_only: 是否只读（只读工具在同一文档上可以并行执行；也可以是接收调用参数、返回是否只读的函数）
+            cpu_bound: 是否为CPU密集型只读工具（本次调用只读时才会交给进程池执行）
+            lock_paths: 按调用参数返回额外需要加锁的文档路径（用于不通过 filename 等参数指定文档的工具）
+        """
+        def decorator(func: Callable) -> Callable:
+            tool_name = name or func.__name__
+            if tool_name in self._specs:
+                raise ValueError(f"工具重复注册: {tool_name}")
+            self._specs[tool_name] = ToolSpec(
+                tool_name, func, description, input_schema, read_only, cpu_bound, lock_paths
+            )
+            self._tools = None
+            # 供 handle_docx_errors 判断执行前是否需要记录文档快照
+            func.read_only = read_only
+            return func
+        return decorator
+
+    def get(self, name: str) -> Optional[ToolSpec]:
+        """按名称查找工具"""
+        return self._specs.get(name)
+
+    def names(self) -> List[str]:
+        """所有已注册工具的名称（按注册顺序）"""
+        return list(self._specs)
+
+    def tools(self) -> Tuple[Tool, ...]:
+        """不可变的 Tool 列表（首次调用时构建，之后直接复用）"""
+        if self._tools is None:
+            self._tools = tuple(
+                Tool(name=spec.name, description=spec.description, inputSchema=spec.input_schema)
+                for spec in self._specs.values()
+            )
+        return self._tools
+
+    def add_middleware(self, middleware: Middleware) -> None:
+        """添加中间件（先添加的在外层）"""
+        self._middleware.append(middleware)
+        self._chain = None
+
+    def set_invoker(self, invoker: Callable[[ToolSpec, dict], Awaitable[dict]]) -> None:
+        """设置调用链末端实际执行工具函数的方式（如交给线程池）"""
+        self._invoker = invoker
+        self._chain = None
+
+    async def call(self, name: str, arguments: dict) -> Dict[str, Any]:
+        """经过中间件链调用工具"""
+        spec = self._specs.get(name)
+        if spec is None:
+            return {"success": False, "error": "UnknownTool", "message": f"未知工具: {name}"}
+        if self._chain is None:
+            self._chain = self._build_chain()
+        return await self._chain(spec, arguments)
+
+    def _build_chain(self) -> Callable[[ToolSpec, dict], Awaitable[dict]]:
+        chain = self._invoker
+        for middleware in reversed(self._middleware):
+            chain = _bind(middleware, chain)
+        return chain
+
+
+def _bind(middleware: Middleware, call_next: Callable[[ToolSpec, dict], Awaitable[dict]]):
+    async def handler(spec: ToolSpec, arguments: dict) -> dict:
+        return await middleware(spec, arguments, lambda args: call_next(spec, args))
+    return handler
+
+
+async def _default_invoker(spec: ToolSpec, arguments: dict) -> dict:
+    return await spec.handler(**arguments)
+
+
+class TimingMiddleware:
+    """记录每个工具的调用次数和耗时"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, List[float]] = {}
+
+    async def __call__(self, spec: ToolSpec, arguments: dict, call_next) -> dict:
+        started_at = time.perf_counter()
+        try:
+            return await call_next(arguments)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                entry = self._stats.setdefault(spec.name, [0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] = max(entry[2], elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        """各工具的调用统计（时间单位为毫秒）"""
+        with self._lock:
+            return {
+                name: {
+                    "calls": int(calls),
+                    "avg_ms": round(total / calls * 1000, 3),
+                    "max_ms": round(slowest * 1000, 3)
+                }
+                for name, (calls, total, slowest) in self._stats.items()
+            }
+
+
+# 全局工具注册表
+registry = ToolRegistry()
+
+# 全局计时中间件（由服务器安装到调用链上）
+timing = TimingMiddleware()
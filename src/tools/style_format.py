@@ -4,11 +4,22 @@ from typing import Optional, Dict, Any
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_BREAK
 from ..utils import DocumentManager, validate_file_path, handle_docx_errors
+from .registry import registry
 
 # 全局文档管理器实例
 doc_manager = DocumentManager()
 
 
+@registry.tool(
+    description="插入分页符",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"}
+        },
+        "required": ["filename"]
+    }
+)
 @handle_docx_errors
 async def add_page_break(filename: str) -> Dict[str, Any]:
     """
@@ -31,6 +42,20 @@ async def add_page_break(filename: str) -> Dict[str, Any]:
     }
 
 
+@registry.tool(
+    description="设置页面边距",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "top": {"type": "number", "description": "上边距（英寸）"},
+            "bottom": {"type": "number", "description": "下边距（英寸）"},
+            "left": {"type": "number", "description": "左边距（英寸）"},
+            "right": {"type": "number", "description": "右边距（英寸）"}
+        },
+        "required": ["filename"]
+    }
+)
 @handle_docx_errors
 async def set_page_margins(
     filename: str,
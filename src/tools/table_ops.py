@@ -1,23 +1,62 @@
 """表格操作工具"""
 import os
+from itertools import chain, islice
 from typing import Optional, Dict, Any, List
-from docx.shared import Pt, RGBColor, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Inches
 from docx.enum.table import WD_CELL_VERTICAL_ALIGNMENT
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
-from ..utils import DocumentManager, validate_file_path, handle_docx_errors
+from ..utils import DocumentManager, validate_file_path, handle_docx_errors, config
+from ..utils.body_index import BodyIndex, StyleNames, get_table
+from ..utils.formatting import ALIGNMENTS, FormatSpec, font_toggles
+from ..utils.table_builder import detect_source_format, new_table, read_source_rows
+from ..utils.table_export import (
+    EXPORT_FORMATS, TableReader, export_to_file, export_to_text, header_fields, to_columns
+)
+from ..utils.table_grid import CellGrid
+from ..utils.table_scan import PARALLEL_MODES, describe_tables, iter_all_tables
+from .registry import registry
 
 # 全局文档管理器实例
 doc_manager = DocumentManager()
 
 
+def _insert_table_after(doc, body_index: BodyIndex, position: int, table_element) -> None:
+    """把表格元素插入到 position 段落之后（position 为最后一个段落时追加到正文末尾）"""
+    if position + 1 < body_index.paragraph_count:
+        # 将表格元素插入到 position 段落之后（而不是 position+1 段落之前）
+        body_index.paragraph(position)._element.addnext(table_element)
+    else:
+        doc.element.body._insert_tbl(table_element)
+
+
+@registry.tool(
+    description="创建表格",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "rows": {"type": "integer", "description": "行数"},
+            "cols": {"type": "integer", "description": "列数"},
+            "data": {"type": "array", "description": "表格数据（可选），二维列表"},
+            "style": {"type": "string", "description": "表格样式名称（可选，默认Table Grid）"},
+            "col_widths": {"type": "array", "items": {"type": "number"}, "description": "各列宽度，单位英寸（可选，默认平均分配）"},
+            "header_bold": {"type": "boolean", "description": "首行文字是否加粗（默认false）"},
+            "column_major": {"type": "boolean", "description": "data 是否按列组织（每项为一列，默认false按行组织）"}
+        },
+        "required": ["filename", "rows", "cols"]
+    }
+)
 @handle_docx_errors
 async def add_table(
     filename: str,
     rows: int,
     cols: int,
-    data: Optional[List[List[str]]] = None
+    data: Optional[List[List[str]]] = None,
+    style: Optional[str] = 'Table Grid',
+    col_widths: Optional[List[float]] = None,
+    header_bold: bool = False,
+    column_major: bool = False
 ) -> Dict[str, Any]:
     """
     创建表格
@@ -26,33 +65,19 @@ async def add_table(
         filename: 文档路径
         rows: 行数
         cols: 列数
-        data: 表格数据（可选），二维列表
+        data: 表格数据（可选），二维列表；超出行数/列数的部分忽略
+        style: 表格样式名称（默认'Table Grid'，文档中不存在该样式时使用默认样式）
+        col_widths: 各列宽度，单位英寸（可选，默认按版心宽度平均分配）
+        header_bold: 首行文字是否加粗（默认False）
+        column_major: data 是否按列组织，即每项为一列（默认False）
     """
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if rows <= 0 or cols <= 0:
-        raise ValueError(f"行数和列数必须大于0，当前值: rows={rows}, cols={cols}")
-
-    # 创建表格
-    table = doc.add_table(rows=rows, cols=cols)
-
-    # 尝试设置表格样式，如果样式不存在则跳过
-    try:
-        table.style = 'Table Grid'
-    except KeyError:
-        # 样式不存在，使用默认样式
-        pass
-
-    # 填充数据
-    if data:
-        for i, row_data in enumerate(data):
-            if i >= rows:
-                break
-            for j, cell_data in enumerate(row_data):
-                if j >= cols:
-                    break
-                table.rows[i].cells[j].text = str(cell_data)
+    # 一次生成完整的表格元素（含数据），追加到正文末尾
+    table_element = new_table(doc, rows, cols, data, style=style, col_widths=col_widths,
+                              header_bold=header_bold, column_major=column_major)
+    doc.element.body._insert_tbl(table_element)
 
     doc_manager.save(abs_path, doc)
 
@@ -65,13 +90,38 @@ async def add_table(
     }
 
 
+@registry.tool(
+    description="在指定位置插入表格（在指定索引之后插入）",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "position": {
+                "type": "integer",
+                "description": "插入位置索引（从0开始）。表格将插入到指定索引之后。例如：position=0表示插入到索引0之后"
+            },
+            "rows": {"type": "integer", "description": "行数"},
+            "cols": {"type": "integer", "description": "列数"},
+            "data": {"type": "array", "description": "表格数据（可选），二维列表"},
+            "style": {"type": "string", "description": "表格样式名称（可选，默认Table Grid）"},
+            "col_widths": {"type": "array", "items": {"type": "number"}, "description": "各列宽度，单位英寸（可选，默认平均分配）"},
+            "header_bold": {"type": "boolean", "description": "首行文字是否加粗（默认false）"},
+            "column_major": {"type": "boolean", "description": "data 是否按列组织（每项为一列，默认false按行组织）"}
+        },
+        "required": ["filename", "position", "rows", "cols"]
+    }
+)
 @handle_docx_errors
 async def insert_table(
     filename: str,
     position: int,
     rows: int,
     cols: int,
-    data: Optional[List[List[str]]] = None
+    data: Optional[List[List[str]]] = None,
+    style: Optional[str] = 'Table Grid',
+    col_widths: Optional[List[float]] = None,
+    header_bold: bool = False,
+    column_major: bool = False
 ) -> Dict[str, Any]:
     """
     在指定位置插入表格（在指定索引之后插入）
@@ -84,75 +134,31 @@ async def insert_table(
                       position=5 表示插入到索引5之后
         rows: 行数
         cols: 列数
-        data: 表格数据（可选），二维列表
+        data: 表格数据（可选），二维列表；超出行数/列数的部分忽略
+        style: 表格样式名称（默认'Table Grid'，文档中不存在该样式时使用默认样式）
+        col_widths: 各列宽度，单位英寸（可选，默认按版心宽度平均分配）
+        header_bold: 首行文字是否加粗（默认False）
+        column_major: data 是否按列组织，即每项为一列（默认False）
     """
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if position < 0 or position >= len(doc.paragraphs):
-        raise ValueError(f"插入位置超出范围: {position}，有效范围: 0-{len(doc.paragraphs)-1}")
+    body_index = BodyIndex(doc)
+    paragraph_count = body_index.paragraph_count
+    if position < 0 or position >= paragraph_count:
+        raise ValueError(f"插入位置超出范围: {position}，有效范围: 0-{paragraph_count-1}")
 
-    if rows <= 0 or cols <= 0:
-        raise ValueError(f"行数和列数必须大于0，当前值: rows={rows}, cols={cols}")
+    # 一次生成完整的表格元素（含数据）
+    table_element = new_table(doc, rows, cols, data, style=style, col_widths=col_widths,
+                              header_bold=header_bold, column_major=column_major)
 
     # 在指定索引之后插入表格
-    # 策略：先创建表格，移动到正确位置，然后找到实际索引
-    table = doc.add_table(rows=rows, cols=cols)
+    _insert_table_after(doc, body_index, position, table_element)
 
-    # 设置表格样式
-    try:
-        table.style = 'Table Grid'
-    except KeyError:
-        pass
-
-    # 填充数据
-    if data:
-        for i, row_data in enumerate(data):
-            if i >= rows:
-                break
-            for j, cell_data in enumerate(row_data):
-                if j >= cols:
-                    break
-                table.rows[i].cells[j].text = str(cell_data)
-
-    # 如果不是追加到末尾，需要移动表格位置
-    if position + 1 < len(doc.paragraphs):
-        # 获取表格元素和目标段落元素
-        table_element = table._element
-        # 插入到 position 段落之后（而不是 position+1 段落之前）
-        position_para = doc.paragraphs[position]
-        position_element = position_para._element
-
-        # 将表格元素插入到 position 段落之后
-        position_element.addnext(table_element)
-
-    # 保存并重新加载文档
     doc_manager.save(abs_path, doc)
-    doc = doc_manager.get_or_open(abs_path)
-
-    # 计算插入的表格索引
-    # 找到 position 段落，它后面紧邻的表格就是刚插入的
-    if position + 1 >= len(doc.paragraphs):
-        # 追加到末尾
-        table_index = len(doc.tables) - 1
-    else:
-        # 插入到中间
-        position_para = doc.paragraphs[position]
-        position_element = position_para._element
-
-        # 找到 position 段落后面紧邻的元素（应该是刚插入的表格）
-        next_element = position_element.getnext()
 
-        # 在 doc.tables 中找到这个表格的索引
-        table_index = None
-        for idx, tbl in enumerate(doc.tables):
-            if tbl._element == next_element:
-                table_index = idx
-                break
-
-        # 如果没找到，说明出错了，返回一个安全值
-        if table_index is None:
-            table_index = len(doc.tables) - 1
+    # 计算插入的表格索引（按表格元素在正文中的实际位置）
+    table_index = BodyIndex(doc).ordinal_of(table_element)
 
     return {
         "success": True,
@@ -164,6 +170,145 @@ async def insert_table(
     }
 
 
+@registry.tool(
+    description="从本地 CSV/TSV/JSON Lines/JSON 文件导入数据并创建表格（流式读取，数据无需写在参数中）",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "source_path": {"type": "string", "description": "数据文件路径（.csv/.tsv/.jsonl/.json）"},
+            "source_format": {
+                "type": "string",
+                "enum": ["csv", "tsv", "jsonl", "json"],
+                "description": "数据格式（可选，默认按扩展名判断）"
+            },
+            "position": {
+                "type": "integer",
+                "description": "插入位置索引（可选，与 insert_table 相同：表格插入到该段落之后；不指定时追加到文档末尾）"
+            },
+            "has_header_row": {
+                "type": "boolean",
+                "description": "数据第一行是否为表头（默认true，表头行文字加粗；JSON 对象记录以键名作为表头）"
+            },
+            "style": {"type": "string", "description": "表格样式名称（可选，默认Table Grid）"},
+            "col_widths": {"type": "array", "items": {"type": "number"}, "description": "各列宽度，单位英寸（可选）"},
+            "max_rows": {"type": "integer", "description": "最多导入的数据行数（不含表头，可选）"},
+            "encoding": {"type": "string", "description": "文件编码（默认utf-8，兼容BOM）"}
+        },
+        "required": ["filename", "source_path"]
+    }
+)
+@handle_docx_errors
+async def import_table(
+    filename: str,
+    source_path: str,
+    source_format: Optional[str] = None,
+    position: Optional[int] = None,
+    has_header_row: bool = True,
+    style: Optional[str] = 'Table Grid',
+    col_widths: Optional[List[float]] = None,
+    max_rows: Optional[int] = None,
+    encoding: str = "utf-8-sig"
+) -> Dict[str, Any]:
+    """
+    从数据文件导入表格
+
+    逐行读取数据文件并直接生成表格元素，列数由第一行（表头）决定：
+    较短的行补空单元格，较长的行截断多余的列（在返回结果中统计）。
+
+    参数:
+        filename: 文档路径
+        source_path: 数据文件路径
+        source_format: 数据格式：csv、tsv、jsonl、json（可选，默认按扩展名判断）
+        position: 插入位置索引（可选），表格插入到该段落之后；不指定时追加到文档末尾
+        has_header_row: 第一行是否为表头（默认True），表头行文字加粗
+        style: 表格样式名称（默认'Table Grid'）
+        col_widths: 各列宽度，单位英寸（可选）
+        max_rows: 最多导入的数据行数，不含表头（可选）
+        encoding: 文件编码（默认'utf-8-sig'）
+    """
+    abs_path = validate_file_path(filename)
+    source_abs_path = os.path.abspath(source_path)
+    if not os.path.isfile(source_abs_path):
+        raise FileNotFoundError(f"数据文件不存在: {source_path}")
+    source_format = detect_source_format(source_abs_path, source_format)
+    if max_rows is not None and max_rows <= 0:
+        raise ValueError(f"max_rows 必须大于0，当前值: {max_rows}")
+
+    doc = doc_manager.get_or_open(abs_path)
+
+    body_index = BodyIndex(doc)
+    if position is not None:
+        paragraph_count = body_index.paragraph_count
+        if position < 0 or position >= paragraph_count:
+            raise ValueError(f"插入位置超出范围: {position}，有效范围: 0-{paragraph_count-1}")
+
+    # 跳过空行，列数由第一行决定
+    rows = (row for row in read_source_rows(source_abs_path, source_format, has_header_row,
+                                            encoding) if row)
+    first_row = next(rows, None)
+    if first_row is None:
+        raise ValueError(f"数据文件中没有数据: {source_path}")
+    cols = len(first_row)
+
+    if max_rows is not None:
+        # 没有表头时第一行也计入数据行数
+        rows = islice(rows, max_rows if has_header_row else max_rows - 1)
+    stats = {"rows": 0, "truncated_rows": 0}
+
+    def counted(source):
+        for row in source:
+            stats["rows"] += 1
+            if len(row) > cols:
+                stats["truncated_rows"] += 1
+            yield row
+
+    table_element = new_table(doc, None, cols, counted(chain([first_row], rows)),
+                              style=style, col_widths=col_widths, header_bold=has_header_row)
+
+    if position is None:
+        doc.element.body._insert_tbl(table_element)
+    else:
+        _insert_table_after(doc, body_index, position, table_element)
+
+    doc_manager.save(abs_path, doc)
+
+    table_index = BodyIndex(doc).ordinal_of(table_element)
+    data_row_count = stats["rows"] - (1 if has_header_row else 0)
+
+    return {
+        "success": True,
+        "message": f"表格导入成功（{stats['rows']}行 x {cols}列）",
+        "table_index": table_index,
+        "source_format": source_format,
+        "rows": stats["rows"],
+        "cols": cols,
+        "data_rows": data_row_count,
+        "truncated_rows": stats["truncated_rows"]
+    }
+
+
+@registry.tool(
+    description="设置表格单元格内容",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "row_index": {"type": "integer", "description": "行索引"},
+            "col_index": {"type": "integer", "description": "列索引"},
+            "text": {"type": "string", "description": "单元格文本"},
+            "font_name": {"type": "string", "description": "字体名称（可选）"},
+            "font_size": {"type": "integer", "description": "字号（可选）"},
+            "bold": {"type": "boolean", "description": "是否粗体"},
+            "italic": {"type": "boolean", "description": "是否斜体"},
+            "color": {"type": "string", "description": "文字颜色，十六进制RGB（可选）"},
+            "highlight": {"type": "string", "description": "背景色（高亮），十六进制RGB（可选）"},
+            "alignment": {"type": "string", "description": "对齐方式：left/center/right/justify（可选）"}
+        },
+        "required": ["filename", "table_index", "row_index", "col_index", "text"]
+    }
+)
 @handle_docx_errors
 async def set_table_cell_content(
     filename: str,
@@ -199,54 +344,18 @@ async def set_table_cell_content(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}，文档共有{len(doc.tables)}个表格")
-
-    table = doc.tables[table_index]
-
-    if row_index < 0 or row_index >= len(table.rows):
-        raise ValueError(f"行索引超出范围: {row_index}，表格共有{len(table.rows)}行")
-
-    if col_index < 0 or col_index >= len(table.columns):
-        raise ValueError(f"列索引超出范围: {col_index}，表格共有{len(table.columns)}列")
-
-    cell = table.rows[row_index].cells[col_index]
+    table = get_table(doc, table_index)
+    cell = CellGrid(table).cell(row_index, col_index)
     cell.text = text
 
-    # 设置字体格式
-    if any([font_name, font_size, bold, italic, color, highlight]):
-        for paragraph in cell.paragraphs:
-            for run in paragraph.runs:
-                if font_name:
-                    run.font.name = font_name
-                if font_size:
-                    run.font.size = Pt(font_size)
-                if bold is not None:
-                    run.font.bold = bold
-                if italic is not None:
-                    run.font.italic = italic
-                if color:
-                    run.font.color.rgb = RGBColor(
-                        int(color[0:2], 16),
-                        int(color[2:4], 16),
-                        int(color[4:6], 16)
-                    )
-                if highlight:
-                    shd = OxmlElement('w:shd')
-                    shd.set(qn('w:fill'), highlight)
-                    run._element.get_or_add_rPr().append(shd)
-
-    # 设置段落对齐方式
-    if alignment:
-        alignment_map = {
-            'left': WD_ALIGN_PARAGRAPH.LEFT,
-            'center': WD_ALIGN_PARAGRAPH.CENTER,
-            'right': WD_ALIGN_PARAGRAPH.RIGHT,
-            'justify': WD_ALIGN_PARAGRAPH.JUSTIFY
-        }
-        if alignment.lower() in alignment_map:
-            for paragraph in cell.paragraphs:
-                paragraph.alignment = alignment_map[alignment.lower()]
+    # 设置字体格式和段落对齐方式
+    bold, italic = font_toggles(font_name, font_size, bold, italic, color, highlight)
+    spec = FormatSpec.of(
+        font_name=font_name, font_size=font_size, bold=bold, italic=italic,
+        color=color, highlight=highlight, alignment=alignment
+    )
+    for paragraph in cell.paragraphs:
+        spec.apply_to_paragraph(paragraph)
 
     doc_manager.save(abs_path, doc)
 
@@ -256,6 +365,37 @@ async def set_table_cell_content(
     }
 
 
+@registry.tool(
+    description="批量设置表格单元格内容",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "cells": {
+                "type": "array",
+                "description": "单元格列表",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "row_index": {"type": "integer", "description": "行索引"},
+                        "col_index": {"type": "integer", "description": "列索引"},
+                        "text": {"type": "string", "description": "单元格文本"},
+                        "font_name": {"type": "string", "description": "字体名称（可选）"},
+                        "font_size": {"type": "integer", "description": "字号（可选）"},
+                        "bold": {"type": "boolean", "description": "是否粗体（可选）"},
+                        "italic": {"type": "boolean", "description": "是否斜体（可选）"},
+                        "color": {"type": "string", "description": "文字颜色（可选）"},
+                        "highlight": {"type": "string", "description": "背景色（可选）"},
+                        "alignment": {"type": "string", "description": "对齐方式（可选）"}
+                    },
+                    "required": ["row_index", "col_index", "text"]
+                }
+            }
+        },
+        "required": ["filename", "table_index", "cells"]
+    }
+)
 @handle_docx_errors
 async def batch_set_table_cells(
     filename: str,
@@ -283,10 +423,9 @@ async def batch_set_table_cells(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}，文档共有{len(doc.tables)}个表格")
-
-    table = doc.tables[table_index]
+    table = get_table(doc, table_index)
+    # 网格只构建一次，之后每个单元格按下标直接定位
+    grid = CellGrid(table)
     processed_count = 0
 
     for cell_data in cells:
@@ -297,57 +436,17 @@ async def batch_set_table_cells(
         if row_index is None or col_index is None:
             continue
 
-        if row_index < 0 or row_index >= len(table.rows):
-            continue
-
-        if col_index < 0 or col_index >= len(table.columns):
+        cell = grid.get(row_index, col_index)
+        if cell is None:
             continue
 
-        cell = table.rows[row_index].cells[col_index]
         cell.text = text
 
-        # 设置字体格式
-        font_name = cell_data.get('font_name')
-        font_size = cell_data.get('font_size')
-        bold = cell_data.get('bold')
-        italic = cell_data.get('italic')
-        color = cell_data.get('color')
-        highlight = cell_data.get('highlight')
-
-        if any([font_name, font_size, bold, italic, color, highlight]):
-            for paragraph in cell.paragraphs:
-                for run in paragraph.runs:
-                    if font_name:
-                        run.font.name = font_name
-                    if font_size:
-                        run.font.size = Pt(font_size)
-                    if bold is not None:
-                        run.font.bold = bold
-                    if italic is not None:
-                        run.font.italic = italic
-                    if color:
-                        run.font.color.rgb = RGBColor(
-                            int(color[0:2], 16),
-                            int(color[2:4], 16),
-                            int(color[4:6], 16)
-                        )
-                    if highlight:
-                        shd = OxmlElement('w:shd')
-                        shd.set(qn('w:fill'), highlight)
-                        run._element.get_or_add_rPr().append(shd)
-
-        # 设置段落对齐方式
-        alignment = cell_data.get('alignment')
-        if alignment:
-            alignment_map = {
-                'left': WD_ALIGN_PARAGRAPH.LEFT,
-                'center': WD_ALIGN_PARAGRAPH.CENTER,
-                'right': WD_ALIGN_PARAGRAPH.RIGHT,
-                'justify': WD_ALIGN_PARAGRAPH.JUSTIFY
-            }
-            if alignment.lower() in alignment_map:
-                for paragraph in cell.paragraphs:
-                    paragraph.alignment = alignment_map[alignment.lower()]
+        # 设置字体格式和段落对齐方式（相同格式的单元格共享同一个格式模板）
+        bold, italic = font_toggles(*(cell_data.get(name) for name in FormatSpec.FIELDS[:6]))
+        spec = FormatSpec.from_dict({**cell_data, "bold": bold, "italic": italic})
+        for paragraph in cell.paragraphs:
+            spec.apply_to_paragraph(paragraph)
 
         processed_count += 1
 
@@ -360,6 +459,19 @@ async def batch_set_table_cells(
     }
 
 
+@registry.tool(
+    description="格式化表格",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "border_style": {"type": "string", "description": "边框样式（可选）"},
+            "has_header_row": {"type": "boolean", "description": "是否有表头行"}
+        },
+        "required": ["filename", "table_index"]
+    }
+)
 @handle_docx_errors
 async def format_table(
     filename: str,
@@ -379,10 +491,7 @@ async def format_table(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}")
-
-    table = doc.tables[table_index]
+    table = get_table(doc, table_index)
 
     # 设置表格样式
     if border_style:
@@ -403,6 +512,18 @@ async def format_table(
     }
 
 
+@registry.tool(
+    description="在表格中插入新行",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "row_index": {"type": "integer", "description": "插入位置的行索引"}
+        },
+        "required": ["filename", "table_index", "row_index"]
+    }
+)
 @handle_docx_errors
 async def insert_table_row(
     filename: str,
@@ -420,10 +541,7 @@ async def insert_table_row(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}")
-
-    table = doc.tables[table_index]
+    table = get_table(doc, table_index)
 
     if row_index < 0 or row_index > len(table.rows):
         raise ValueError(f"行索引超出范围: {row_index}")
@@ -440,6 +558,19 @@ async def insert_table_row(
     }
 
 
+@registry.tool(
+    description="设置表格列宽",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "col_index": {"type": "integer", "description": "列索引"},
+            "width": {"type": "number", "description": "列宽（英寸）"}
+        },
+        "required": ["filename", "table_index", "col_index", "width"]
+    }
+)
 @handle_docx_errors
 async def set_column_width(
     filename: str,
@@ -459,10 +590,7 @@ async def set_column_width(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}")
-
-    table = doc.tables[table_index]
+    table = get_table(doc, table_index)
 
     if col_index < 0 or col_index >= len(table.columns):
         raise ValueError(f"列索引超出范围: {col_index}")
@@ -479,6 +607,18 @@ async def set_column_width(
     }
 
 
+@registry.tool(
+    description="删除表格行",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "row_index": {"type": "integer", "description": "行索引"}
+        },
+        "required": ["filename", "table_index", "row_index"]
+    }
+)
 @handle_docx_errors
 async def delete_table_row(
     filename: str,
@@ -496,10 +636,7 @@ async def delete_table_row(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}")
-
-    table = doc.tables[table_index]
+    table = get_table(doc, table_index)
 
     if row_index < 0 or row_index >= len(table.rows):
         raise ValueError(f"行索引超出范围: {row_index}")
@@ -517,6 +654,18 @@ async def delete_table_row(
     }
 
 
+@registry.tool(
+    description="删除表格列",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "col_index": {"type": "integer", "description": "列索引"}
+        },
+        "required": ["filename", "table_index", "col_index"]
+    }
+)
 @handle_docx_errors
 async def delete_table_column(
     filename: str,
@@ -534,10 +683,7 @@ async def delete_table_column(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}")
-
-    table = doc.tables[table_index]
+    table = get_table(doc, table_index)
 
     if col_index < 0 or col_index >= len(table.columns):
         raise ValueError(f"列索引超出范围: {col_index}")
@@ -555,6 +701,17 @@ async def delete_table_column(
     }
 
 
+@registry.tool(
+    description="删除整个表格",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"}
+        },
+        "required": ["filename", "table_index"]
+    }
+)
 @handle_docx_errors
 async def delete_table(
     filename: str,
@@ -570,10 +727,7 @@ async def delete_table(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}")
-
-    table = doc.tables[table_index]
+    table = get_table(doc, table_index)
     table._element.getparent().remove(table._element)
 
     doc_manager.save(abs_path, doc)
@@ -585,6 +739,21 @@ async def delete_table(
     }
 
 
+@registry.tool(
+    description="合并表格单元格",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "start_row": {"type": "integer", "description": "起始行索引"},
+            "start_col": {"type": "integer", "description": "起始列索引"},
+            "end_row": {"type": "integer", "description": "结束行索引"},
+            "end_col": {"type": "integer", "description": "结束列索引"}
+        },
+        "required": ["filename", "table_index", "start_row", "start_col", "end_row", "end_col"]
+    }
+)
 @handle_docx_errors
 async def merge_table_cells(
     filename: str,
@@ -608,20 +777,18 @@ async def merge_table_cells(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}")
+    table = get_table(doc, table_index)
+    grid = CellGrid(table)
 
-    table = doc.tables[table_index]
-
-    if start_row < 0 or end_row >= len(table.rows) or start_row > end_row:
+    if start_row < 0 or end_row >= grid.row_count or start_row > end_row:
         raise ValueError(f"行索引无效: start_row={start_row}, end_row={end_row}")
 
-    if start_col < 0 or end_col >= len(table.columns) or start_col > end_col:
+    if start_col < 0 or end_col >= grid.col_count or start_col > end_col:
         raise ValueError(f"列索引无效: start_col={start_col}, end_col={end_col}")
 
     # 获取起始单元格
-    start_cell = table.cell(start_row, start_col)
-    end_cell = table.cell(end_row, end_col)
+    start_cell = grid.cell(start_row, start_col)
+    end_cell = grid.cell(end_row, end_col)
 
     # 合并单元格
     start_cell.merge(end_cell)
@@ -634,6 +801,21 @@ async def merge_table_cells(
     }
 
 
+@registry.tool(
+    description="设置单元格对齐方式",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "row_index": {"type": "integer", "description": "行索引"},
+            "col_index": {"type": "integer", "description": "列索引"},
+            "horizontal": {"type": "string", "description": "水平对齐（left/center/right/justify）"},
+            "vertical": {"type": "string", "description": "垂直对齐（top/center/bottom）"}
+        },
+        "required": ["filename", "table_index", "row_index", "col_index"]
+    }
+)
 @handle_docx_errors
 async def set_cell_alignment(
     filename: str,
@@ -657,22 +839,13 @@ async def set_cell_alignment(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}")
-
-    table = doc.tables[table_index]
-    cell = table.cell(row_index, col_index)
+    table = get_table(doc, table_index)
+    cell = CellGrid(table).cell(row_index, col_index)
 
     # 设置水平对齐
-    align_map = {
-        "left": WD_ALIGN_PARAGRAPH.LEFT,
-        "center": WD_ALIGN_PARAGRAPH.CENTER,
-        "right": WD_ALIGN_PARAGRAPH.RIGHT,
-        "justify": WD_ALIGN_PARAGRAPH.JUSTIFY
-    }
-    if horizontal in align_map:
+    if horizontal in ALIGNMENTS:
         for paragraph in cell.paragraphs:
-            paragraph.alignment = align_map[horizontal]
+            paragraph.alignment = ALIGNMENTS[horizontal]
 
     # 设置垂直对齐
     valign_map = {
@@ -691,6 +864,20 @@ async def set_cell_alignment(
     }
 
 
+@registry.tool(
+    description="设置单元格背景色",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "row_index": {"type": "integer", "description": "行索引"},
+            "col_index": {"type": "integer", "description": "列索引"},
+            "color": {"type": "string", "description": "颜色（十六进制）"}
+        },
+        "required": ["filename", "table_index", "row_index", "col_index", "color"]
+    }
+)
 @handle_docx_errors
 async def set_cell_background(
     filename: str,
@@ -712,11 +899,8 @@ async def set_cell_background(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}")
-
-    table = doc.tables[table_index]
-    cell = table.cell(row_index, col_index)
+    table = get_table(doc, table_index)
+    cell = CellGrid(table).cell(row_index, col_index)
 
     # 设置背景色
     shading_elm = OxmlElement('w:shd')
@@ -731,6 +915,23 @@ async def set_cell_background(
     }
 
 
+@registry.tool(
+    description="设置单元格内边距",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "row_index": {"type": "integer", "description": "行索引"},
+            "col_index": {"type": "integer", "description": "列索引"},
+            "top": {"type": "number", "description": "上边距（英寸）"},
+            "bottom": {"type": "number", "description": "下边距（英寸）"},
+            "left": {"type": "number", "description": "左边距（英寸）"},
+            "right": {"type": "number", "description": "右边距（英寸）"}
+        },
+        "required": ["filename", "table_index", "row_index", "col_index"]
+    }
+)
 @handle_docx_errors
 async def set_cell_padding(
     filename: str,
@@ -755,11 +956,8 @@ async def set_cell_padding(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}")
-
-    table = doc.tables[table_index]
-    cell = table.cell(row_index, col_index)
+    table = get_table(doc, table_index)
+    cell = CellGrid(table).cell(row_index, col_index)
 
     # 设置内边距（通过XML）
     tc = cell._element
@@ -782,6 +980,19 @@ async def set_cell_padding(
     }
 
 
+@registry.tool(
+    description="设置表格行高",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "row_index": {"type": "integer", "description": "行索引"},
+            "height": {"type": "number", "description": "行高（英寸）"}
+        },
+        "required": ["filename", "table_index", "row_index", "height"]
+    }
+)
 @handle_docx_errors
 async def set_row_height(
     filename: str,
@@ -801,10 +1012,7 @@ async def set_row_height(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}")
-
-    table = doc.tables[table_index]
+    table = get_table(doc, table_index)
     row = table.rows[row_index]
     row.height = Inches(height)
 
@@ -816,6 +1024,24 @@ async def set_row_height(
     }
 
 
+@registry.tool(
+    description="设置单元格文本格式",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "row_index": {"type": "integer", "description": "行索引"},
+            "col_index": {"type": "integer", "description": "列索引"},
+            "font_name": {"type": "string", "description": "字体名称"},
+            "font_size": {"type": "integer", "description": "字号"},
+            "bold": {"type": "boolean", "description": "是否粗体"},
+            "italic": {"type": "boolean", "description": "是否斜体"},
+            "color": {"type": "string", "description": "文字颜色"}
+        },
+        "required": ["filename", "table_index", "row_index", "col_index"]
+    }
+)
 @handle_docx_errors
 async def format_cell_text(
     filename: str,
@@ -847,32 +1073,16 @@ async def format_cell_text(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}")
-
-    table = doc.tables[table_index]
-    cell = table.cell(row_index, col_index)
+    table = get_table(doc, table_index)
+    cell = CellGrid(table).cell(row_index, col_index)
 
+    spec = FormatSpec.of(
+        font_name=font_name, font_size=font_size, bold=bold, italic=italic,
+        color=color, highlight=highlight
+    )
     for paragraph in cell.paragraphs:
         for run in paragraph.runs:
-            if font_name:
-                run.font.name = font_name
-            if font_size:
-                run.font.size = Pt(font_size)
-            if bold is not None:
-                run.font.bold = bold
-            if italic is not None:
-                run.font.italic = italic
-            if color:
-                run.font.color.rgb = RGBColor(
-                    int(color[0:2], 16),
-                    int(color[2:4], 16),
-                    int(color[4:6], 16)
-                )
-            if highlight:
-                shd = OxmlElement('w:shd')
-                shd.set(qn('w:fill'), highlight)
-                run._element.get_or_add_rPr().append(shd)
+            spec.apply_to_run(run)
 
     doc_manager.save(abs_path, doc)
 
@@ -882,6 +1092,18 @@ async def format_cell_text(
     }
 
 
+@registry.tool(
+    description="设置表格缩进",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "indent": {"type": "number", "description": "缩进距离（英寸）"}
+        },
+        "required": ["filename", "table_index", "indent"]
+    }
+)
 @handle_docx_errors
 async def set_table_indent(
     filename: str,
@@ -899,10 +1121,7 @@ async def set_table_indent(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}")
-
-    table = doc.tables[table_index]
+    table = get_table(doc, table_index)
 
     # 通过XML设置表格缩进
     tbl = table._element
@@ -924,6 +1143,18 @@ async def set_table_indent(
     }
 
 
+@registry.tool(
+    description="在表格中插入新列",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "col_index": {"type": "integer", "description": "插入位置的列索引"}
+        },
+        "required": ["filename", "table_index", "col_index"]
+    }
+)
 @handle_docx_errors
 async def insert_table_column(
     filename: str,
@@ -941,10 +1172,7 @@ async def insert_table_column(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}")
-
-    table = doc.tables[table_index]
+    table = get_table(doc, table_index)
 
     # 在每一行的指定位置插入新单元格（通过XML操作）
     for row in table.rows:
@@ -972,10 +1200,41 @@ async def insert_table_column(
     }
 
 
+@registry.tool(
+    description="读取整个表格的数据（可导出为CSV/TSV/JSON Lines/按列数组，支持按行分页和写入文件）",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引（从0开始）"},
+            "output_format": {
+                "type": "string",
+                "enum": list(EXPORT_FORMATS),
+                "description": "输出格式：rows（二维数组，默认）、csv、tsv、jsonl（每行一个JSON）、columns（字段名到该列数组的映射）"
+            },
+            "start_row": {"type": "integer", "description": "起始行索引（从0开始，默认0）"},
+            "max_rows": {"type": "integer", "description": "最多读取的行数（可选，默认读取到表格末尾）"},
+            "header_row": {
+                "type": "boolean",
+                "description": "是否把第一行作为字段名（默认false）。为true时jsonl每行为对象，columns以表头为键，csv/tsv首行输出表头"
+            },
+            "output_path": {"type": "string", "description": "导出文件路径（可选）。指定时结果写入文件，响应中不包含数据"}
+        },
+        "required": ["filename", "table_index"]
+    },
+    # 指定 output_path 时要写文件，不能与其他只读工具并行，也不交给进程池
+    read_only=lambda arguments: not arguments.get("output_path"),
+    cpu_bound=True
+)
 @handle_docx_errors
 async def get_table_data(
     filename: str,
-    table_index: int
+    table_index: int,
+    output_format: str = "rows",
+    start_row: int = 0,
+    max_rows: Optional[int] = None,
+    header_row: bool = False,
+    output_path: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     读取整个表格的数据
@@ -983,33 +1242,85 @@ async def get_table_data(
     参数:
         filename: 文档路径
         table_index: 表格索引（从0开始）
+        output_format: 输出格式（默认'rows'）
+                 'rows' 二维数组；'csv' / 'tsv' 分隔文本；'jsonl' 每行一个JSON；
+                 'columns' 按列组织，字段名 -> 该列各行的值
+        start_row: 起始行索引（从0开始，默认0）
+        max_rows: 最多读取的行数（可选）
+        header_row: 是否把第一行作为字段名（默认False）；表头行不计入数据行
+        output_path: 导出文件路径（可选），指定时逐行写入文件，响应中只返回统计信息
     """
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}，文档共有{len(doc.tables)}个表格")
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"不支持的输出格式: {output_format}，可选值: {', '.join(EXPORT_FORMATS)}")
+    if start_row < 0:
+        raise ValueError(f"起始行索引不能为负数: {start_row}")
+    if max_rows is not None and max_rows <= 0:
+        raise ValueError(f"max_rows 必须大于0，当前值: {max_rows}")
 
-    table = doc.tables[table_index]
+    table = get_table(doc, table_index)
+    reader = TableReader(table)
+    total_rows = reader.row_count
 
-    # 提取表格数据
-    table_data = []
-    for row in table.rows:
-        row_data = []
-        for cell in row.cells:
-            row_data.append(cell.text)
-        table_data.append(row_data)
+    fields = header_fields(reader.row(0)) if header_row and total_rows else None
+    first_row = max(start_row, 1) if fields is not None else start_row
+    end_row = total_rows if max_rows is None else min(total_rows, first_row + max_rows)
+    rows = reader.iter_rows(first_row, end_row)
 
-    return {
+    result = {
         "success": True,
         "filename": filename,
         "table_index": table_index,
-        "rows": len(table.rows),
-        "cols": len(table.columns),
-        "data": table_data
+        "rows": total_rows,
+        "cols": reader.col_count,
+        "format": output_format
     }
-
-
+    if fields is not None:
+        result["fields"] = fields
+
+    if output_path:
+        output_abs_path = validate_file_path(output_path)
+        if output_abs_path == abs_path:
+            raise ValueError("导出文件路径不能与文档路径相同")
+        row_count = export_to_file(rows, output_format, output_abs_path, reader.col_count, fields)
+        result.update({
+            "output_path": output_abs_path,
+            "row_count": row_count,
+            "file_size": os.path.getsize(output_abs_path)
+        })
+    elif output_format == "rows":
+        result["data"] = list(rows)
+    elif output_format == "columns":
+        result["columns"] = to_columns(rows, reader.col_count, fields)
+    else:
+        result["content"] = export_to_text(rows, output_format, fields)
+
+    # 按行分页时返回下一页的起始行
+    if start_row or max_rows is not None:
+        result["start_row"] = first_row
+        result["has_more"] = end_row < total_rows
+        if end_row < total_rows:
+            result["next_start_row"] = end_row
+
+    return result
+
+
+@registry.tool(
+    description="读取指定单元格的内容",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"},
+            "row_index": {"type": "integer", "description": "行索引"},
+            "col_index": {"type": "integer", "description": "列索引"}
+        },
+        "required": ["filename", "table_index", "row_index", "col_index"]
+    },
+    read_only=True
+)
 @handle_docx_errors
 async def get_table_cell_content(
     filename: str,
@@ -1029,18 +1340,8 @@ async def get_table_cell_content(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}，文档共有{len(doc.tables)}个表格")
-
-    table = doc.tables[table_index]
-
-    if row_index < 0 or row_index >= len(table.rows):
-        raise ValueError(f"行索引超出范围: {row_index}，表格共有{len(table.rows)}行")
-
-    if col_index < 0 or col_index >= len(table.columns):
-        raise ValueError(f"列索引超出范围: {col_index}，表格共有{len(table.columns)}列")
-
-    cell = table.rows[row_index].cells[col_index]
+    table = get_table(doc, table_index)
+    cell = CellGrid(table).cell(row_index, col_index)
 
     return {
         "success": True,
@@ -1053,6 +1354,18 @@ async def get_table_cell_content(
     }
 
 
+@registry.tool(
+    description="获取表格的基本信息（行数、列数、样式）",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "table_index": {"type": "integer", "description": "表格索引"}
+        },
+        "required": ["filename", "table_index"]
+    },
+    read_only=True
+)
 @handle_docx_errors
 async def get_table_info(
     filename: str,
@@ -1068,10 +1381,7 @@ async def get_table_info(
     abs_path = validate_file_path(filename)
     doc = doc_manager.get_or_open(abs_path)
 
-    if table_index < 0 or table_index >= len(doc.tables):
-        raise ValueError(f"表格索引超出范围: {table_index}，文档共有{len(doc.tables)}个表格")
-
-    table = doc.tables[table_index]
+    table = get_table(doc, table_index)
 
     return {
         "success": True,
@@ -1081,3 +1391,80 @@ async def get_table_info(
         "cols": len(table.columns),
         "style": table.style.name if table.style else ""
     }
+
+
+@registry.tool(
+    description="一次读取文档中的全部表格（含单元格中嵌套的表格）：位置、行列数、样式、合并区域和数据",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filename": {"type": "string", "description": "文档路径"},
+            "include_nested": {"type": "boolean", "description": "是否包含单元格中嵌套的表格（默认true）"},
+            "include_data": {"type": "boolean", "description": "是否返回单元格文本（默认true）"},
+            "include_merges": {"type": "boolean", "description": "是否返回合并区域（默认true）"},
+            "parallel": {
+                "type": "string",
+                "enum": list(PARALLEL_MODES),
+                "description": "表格提取的并行方式：none（默认）、thread（线程池）、process（进程池，适合数百个表格的大文档）"
+            },
+            "workers": {"type": "integer", "description": "并行的工作线程/进程数（可选）"}
+        },
+        "required": ["filename"]
+    },
+    read_only=True,
+    cpu_bound=True
+)
+@handle_docx_errors
+async def get_all_tables(
+    filename: str,
+    include_nested: bool = True,
+    include_data: bool = True,
+    include_merges: bool = True,
+    parallel: str = "none",
+    workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    一次读取文档中的全部表格
+
+    表格按文档顺序（先序）排列：id 为全部表格中的序号；正文表格的 table_index
+    与其他表格工具的表格索引一致，block_index 为其在正文段落和表格中的序号；
+    嵌套表格的 parent 记录所在的父表格 id 和单元格行列。
+
+    参数:
+        filename: 文档路径
+        include_nested: 是否包含嵌套表格（默认True）
+        include_data: 是否返回单元格文本（默认True）
+        include_merges: 是否返回合并区域（默认True），起止行列与 merge_table_cells 一致
+        parallel: 并行方式（默认'none'）：'thread' 线程池；'process' 进程池
+        workers: 并行的工作线程/进程数（可选，默认 DOC_MCP_WORKERS / DOC_MCP_PROCESS_WORKERS）
+    """
+    abs_path = validate_file_path(filename)
+
+    if parallel not in PARALLEL_MODES:
+        raise ValueError(f"不支持的并行方式: {parallel}，可选值: {', '.join(PARALLEL_MODES)}")
+    if workers is not None and workers <= 0:
+        raise ValueError(f"workers 必须大于0，当前值: {workers}")
+    if workers is None:
+        workers = config.PROCESS_WORKERS if parallel == "process" else config.WORKER_THREADS
+
+    doc = doc_manager.get_or_open(abs_path)
+
+    elements = []
+    tables = []
+    style_names = StyleNames(doc)
+    for tbl, position in iter_all_tables(doc.element.body, include_nested):
+        position["style"] = style_names.table_style(tbl.tblStyle_val)
+        elements.append(tbl)
+        tables.append(position)
+
+    for position, content in zip(tables, describe_tables(elements, include_data, include_merges,
+                                                          parallel, workers)):
+        position.update(content)
+
+    return {
+        "success": True,
+        "filename": filename,
+        "table_count": sum(1 for table in tables if table["depth"] == 0),
+        "nested_count": sum(1 for table in tables if table["depth"] > 0),
+        "tables": tables
+    }
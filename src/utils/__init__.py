@@ -1,10 +1,13 @@
 """工具辅助函数模块"""
-from .docx_helper import DocumentManager, validate_file_path
+from .docx_helper import DocumentManager, DocumentCache, validate_file_path
 from .error_handler import handle_docx_errors, DocxError
+from . import config
 
 __all__ = [
     "DocumentManager",
+    "DocumentCache",
     "validate_file_path",
     "handle_docx_errors",
     "DocxError",
+    "config",
 ]
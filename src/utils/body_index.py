@@ -0,0 +1,158 @@
+"""正文元素顺序索引 - 按文档顺序定位段落和表格
+
+``doc.paragraphs`` 和 ``doc.tables`` 每次访问都会为正文中的全部元素重新创建代理对象，
+在循环中按下标访问会退化为 O(n²)。这里直接遍历 ``w:body`` 的子元素（只比较标签，
+不创建代理对象），只为真正需要的元素创建 Paragraph / Table。
+"""
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple, Union
+from docx.document import Document as DocumentObject
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+W_P = qn('w:p')
+W_TBL = qn('w:tbl')
+
+BlockItem = Union[Paragraph, Table]
+
+
+def _wrap(doc: DocumentObject, element) -> BlockItem:
+    if element.tag == W_TBL:
+        return Table(element, doc._body)
+    return Paragraph(element, doc._body)
+
+
+def _kind(element) -> str:
+    return "table" if element.tag == W_TBL else "paragraph"
+
+
+def get_paragraph(doc: DocumentObject, index: int) -> Paragraph:
+    """按下标获取正文段落（与 doc.paragraphs[index] 一致），只遍历到目标位置
+
+    参数:
+        doc: 文档对象
+        index: 段落索引（从0开始）
+    """
+    if index >= 0:
+        element = next(islice(doc.element.body.iterchildren(W_P), index, None), None)
+        if element is not None:
+            return Paragraph(element, doc._body)
+    total = len(doc.element.body.findall(W_P))
+    raise ValueError(f"段落索引超出范围: {index}，文档共有{total}个段落")
+
+
+def get_table(doc: DocumentObject, index: int) -> Table:
+    """按下标获取正文表格（与 doc.tables[index] 一致），只遍历到目标位置
+
+    参数:
+        doc: 文档对象
+        index: 表格索引（从0开始）
+    """
+    if index >= 0:
+        element = next(islice(doc.element.body.iterchildren(W_TBL), index, None), None)
+        if element is not None:
+            return Table(element, doc._body)
+    total = len(doc.element.body.findall(W_TBL))
+    raise ValueError(f"表格索引超出范围: {index}，文档共有{total}个表格")
+
+
+def iter_block_range(doc: DocumentObject, start_index: int,
+                     end_index: int) -> Iterator[Tuple[int, str, BlockItem]]:
+    """按文档顺序遍历 [start_index, end_index] 范围内的段落和表格
+
+    只为范围内的元素创建代理对象，遍历到 end_index 即停止。
+
+    返回:
+        (元素索引, "paragraph" 或 "table", Paragraph/Table 对象)
+    """
+    elements = doc.element.body.iterchildren(W_P, W_TBL)
+    for index, element in enumerate(islice(elements, start_index, end_index + 1), start_index):
+        yield index, _kind(element), _wrap(doc, element)
+
+
+def count_blocks(doc: DocumentObject) -> int:
+    """正文中段落和表格的总数"""
+    return sum(1 for _ in doc.element.body.iterchildren(W_P, W_TBL))
+
+
+class BodyIndex:
+    """正文元素顺序索引（一次遍历构建）
+
+    按文档顺序记录正文元素及其段落序号/表格序号，同一次工具调用中需要多次定位
+    段落/表格时共享同一个索引。索引是构建时刻的快照，修改正文结构后需要重新构建。
+    """
+
+    def __init__(self, doc: DocumentObject):
+        self._doc = doc
+        self._elements: List = []
+        self._paragraphs: List = []
+        self._tables: List = []
+        # 元素 -> 段落或表格序号
+        self._ordinals = {}
+        for element in doc.element.body.iterchildren(W_P, W_TBL):
+            same_kind = self._tables if element.tag == W_TBL else self._paragraphs
+            self._ordinals[element] = len(same_kind)
+            same_kind.append(element)
+            self._elements.append(element)
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    @property
+    def paragraph_count(self) -> int:
+        return len(self._paragraphs)
+
+    @property
+    def table_count(self) -> int:
+        return len(self._tables)
+
+    def paragraph(self, index: int) -> Paragraph:
+        """按段落序号获取段落"""
+        return Paragraph(self._paragraphs[index], self._doc._body)
+
+    def table(self, index: int) -> Table:
+        """按表格序号获取表格"""
+        return Table(self._tables[index], self._doc._body)
+
+    def ordinal_of(self, element) -> Optional[int]:
+        """元素在同类元素中的序号（段落序号或表格序号），不在正文中时返回None"""
+        return self._ordinals.get(element)
+
+
+class StyleNames:
+    """段落样式名称解析（按样式ID缓存）
+
+    ``paragraph.style`` 在段落未指定样式时每次都要扫描全部样式查找默认样式，
+    批量读取段落时按样式ID缓存解析结果；按名称设置样式时同样缓存名称到样式ID的解析。
+    """
+
+    def __init__(self, doc: DocumentObject):
+        self._part = doc.part
+        self._names = {}
+        self._ids = {}
+
+    def paragraph_style(self, para: Paragraph) -> str:
+        """段落的样式名称（与 para.style.name 一致）"""
+        style_id = para._p.style
+        name = self._names.get(style_id)
+        if name is None:
+            style = self._part.get_style(style_id, WD_STYLE_TYPE.PARAGRAPH)
+            name = self._names[style_id] = style.name if style is not None else ""
+        return name
+
+    def table_style(self, style_id: Optional[str]) -> str:
+        """表格样式ID对应的样式名称（与 table.style.name 一致，未指定时为默认表格样式）"""
+        key = ("table", style_id)
+        name = self._names.get(key)
+        if name is None:
+            style = self._part.get_style(style_id, WD_STYLE_TYPE.TABLE)
+            name = self._names[key] = style.name if style is not None else ""
+        return name
+
+    def paragraph_style_id(self, name: str) -> Optional[str]:
+        """样式名称对应的样式ID（与 doc.add_paragraph(style=name) 的解析一致，默认样式为None）"""
+        if name not in self._ids:
+            self._ids[name] = self._part.get_style_id(name, WD_STYLE_TYPE.PARAGRAPH)
+        return self._ids[name]
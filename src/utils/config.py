@@ -0,0 +1,99 @@
+"""运行配置 - 通过环境变量调整服务器行为
+
+所有配置项均以 ``DOC_MCP_`` 为前缀，可在 MCP 客户端配置的 ``env`` 字段中设置。
+"""
+import os
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    """读取布尔型环境变量（1/true/yes/on 视为真）"""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_str(name: str, default: str) -> str:
+    """读取字符串型环境变量（去除首尾空白并转为小写）"""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower()
+
+
+def env_int(name: str, default: int) -> int:
+    """读取整数型环境变量，无法解析时返回默认值"""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+# 文档缓存
+CACHE_ENABLED = env_bool("DOC_MCP_CACHE", False)
+CACHE_MAX_ENTRIES = env_int("DOC_MCP_CACHE_MAX_ENTRIES", 8)
+CACHE_MAX_BYTES = env_int("DOC_MCP_CACHE_MAX_MB", 512) * 1024 * 1024
+
+# 延迟写入（write-behind）：修改只保留在内存中，由 flush/close 工具、空闲超时或退出时统一落盘
+DEFERRED_SAVE = env_bool("DOC_MCP_DEFERRED_SAVE", False)
+FLUSH_IDLE_SECONDS = env_int("DOC_MCP_FLUSH_IDLE_SECONDS", 30)
+
+# 保存持久化级别：none（不fsync）/ file（fsync临时文件）/ file+dir（再fsync所在目录）
+SAVE_DURABILITY = env_str("DOC_MCP_SAVE_DURABILITY", "file")
+if SAVE_DURABILITY not in ("none", "file", "file+dir", "dir"):
+    SAVE_DURABILITY = "file"
+
+# 保存时的 zip 压缩级别（stored / fast / default / max），按部件类型分别设置：
+# XML 部件、本身已压缩的媒体（PNG/JPEG 等）、其他二进制部件
+_COMPRESSION_LEVELS = ("stored", "fast", "default", "max")
+
+
+def _compression_level(name: str, default: str) -> str:
+    value = env_str(name, default)
+    return value if value in _COMPRESSION_LEVELS else default
+
+
+COMPRESSION_XML = _compression_level("DOC_MCP_COMPRESSION_XML", "default")
+COMPRESSION_MEDIA = _compression_level("DOC_MCP_COMPRESSION_MEDIA", "stored")
+COMPRESSION_OTHER = _compression_level("DOC_MCP_COMPRESSION_OTHER", "default")
+# 关闭文档（及服务器退出）时按该级别重新压缩整个文件，none 表示不重新压缩
+COMPRESSION_FINAL = env_str("DOC_MCP_COMPRESSION_FINAL", "none")
+if COMPRESSION_FINAL not in _COMPRESSION_LEVELS:
+    COMPRESSION_FINAL = "none"
+
+# 保存时并行压缩 zip 成员的线程数（1 表示不并行）
+SAVE_WORKERS = max(1, env_int("DOC_MCP_SAVE_WORKERS", min(4, os.cpu_count() or 1)))
+
+# 执行工具的工作线程数
+WORKER_THREADS = env_int("DOC_MCP_WORKERS", min(4, os.cpu_count() or 1))
+
+# 只读工具的执行后端：thread（默认，共享线程池）/ process（独立进程池，绕开GIL）
+READ_BACKEND = env_str("DOC_MCP_READ_BACKEND", "thread")
+PROCESS_WORKERS = env_int("DOC_MCP_PROCESS_WORKERS", os.cpu_count() or 1)
+
+# 响应编码：缩进空格数（0 为紧凑输出）、JSON后端（auto / orjson / json）
+JSON_INDENT = max(0, env_int("DOC_MCP_JSON_INDENT", 0))
+JSON_BACKEND = env_str("DOC_MCP_JSON_BACKEND", "auto")
+
+# 超过该大小（KB，按字符计）的响应拆分为多个文本块返回，0 表示不拆分
+RESPONSE_CHUNK_KB = max(0, env_int("DOC_MCP_RESPONSE_CHUNK_KB", 0))
+
+# 标题列表缓存的最大文档数（按文档内容哈希缓存解析好的标题和编号，0 表示不缓存）
+HEADING_CACHE_ENTRIES = max(0, env_int("DOC_MCP_HEADING_CACHE_ENTRIES", 32))
+
+# 全文检索索引的持久化目录（设为 none 时只保存在内存中）
+INDEX_DIR = os.environ.get("DOC_MCP_INDEX_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "doc-mcp-server", "search-index"
+)
+if INDEX_DIR.strip().lower() == "none":
+    INDEX_DIR = None
+
+# 插入图片时预处理结果的缓存目录（设为 none 时不缓存）
+IMAGE_CACHE_DIR = os.environ.get("DOC_MCP_IMAGE_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "doc-mcp-server", "images"
+)
+if IMAGE_CACHE_DIR.strip().lower() == "none":
+    IMAGE_CACHE_DIR = None
@@ -1,31 +1,402 @@
 """Word文档操作辅助函数"""
+import copy
+import io
 import os
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager, AsyncExitStack
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple, Dict, Any, List, Iterable, Iterator, AsyncIterator, Callable, IO
 from docx import Document
 from docx.shared import Pt, RGBColor, Inches
 from .error_handler import DocxError
+from .file_mode import default_file_mode
+from .locks import DocumentLockRegistry
+from .package_io import (
+    DEFAULT_POLICY, CompressionPolicy, load_parts, mark_saved, open_document, recompress_package,
+    save_package
+)
+from .text_stream import iter_paragraph_texts
+from . import config
 
 
-class DocumentManager:
-    """文档管理器 - 无缓存版本，每次都重新加载文件"""
+def _file_signature(abs_path: str) -> Tuple[int, int, int]:
+    """获取文件签名 (st_mtime_ns, st_size, st_ino)，用于判断缓存是否失效"""
+    st = os.stat(abs_path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _estimate_document_bytes(abs_path: str) -> int:
+    """估算文档解析后的内存占用（按zip中各部件的解压大小求和）"""
+    try:
+        with zipfile.ZipFile(abs_path) as zf:
+            return sum(info.file_size for info in zf.infolist())
+    except (zipfile.BadZipFile, OSError):
+        return os.path.getsize(abs_path)
+
+
+# 保存持久化级别
+DURABILITY_NONE = "none"
+DURABILITY_FILE = "file"
+DURABILITY_FILE_AND_DIR = "file+dir"
+_DURABILITY_ALIASES = {
+    "none": DURABILITY_NONE,
+    "file": DURABILITY_FILE,
+    "file+dir": DURABILITY_FILE_AND_DIR,
+    "dir": DURABILITY_FILE_AND_DIR,
+}
+
+
+def _normalize_durability(durability: str) -> str:
+    """校验并规范化持久化级别"""
+    value = _DURABILITY_ALIASES.get((durability or "").strip().lower())
+    if value is None:
+        raise ValueError(f"无效的持久化级别: {durability}，可选值: none/file/file+dir")
+    return value
+
+
+def _fsync_directory(directory: str) -> None:
+    """fsync目录，使rename操作本身持久化（Windows不支持，直接跳过）"""
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _atomic_write(abs_path: str, durability: str, write: Callable[[IO[bytes]], Any]) -> Any:
+    """先写入同目录下的临时文件，按持久化级别fsync后再替换目标文件，返回 write 的结果"""
+    durability = _normalize_durability(durability)
+    directory = os.path.dirname(abs_path)
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".~{os.path.basename(abs_path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            result = write(f)
+            f.flush()
+            if durability != DURABILITY_NONE:
+                os.fsync(f.fileno())
+
+        # mkstemp创建的文件权限为0600，沿用原文件权限或按umask设置默认权限
+        os.chmod(tmp_path, default_file_mode(abs_path))
+
+        os.replace(tmp_path, abs_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if durability == DURABILITY_FILE_AND_DIR:
+        _fsync_directory(directory)
+    return result
+
+
+def atomic_save(doc: Document, abs_path: str, durability: str = DURABILITY_FILE,
+                policy: CompressionPolicy = DEFAULT_POLICY, workers: int = 1) -> None:
+    """原子地保存文档
+
+    先写入同目录下的临时文件，按持久化级别fsync后再通过 os.replace 替换目标文件，
+    进程被杀死或并发读取时不会看到被截断的zip。未修改的部件从源文件直接复制压缩数据（见 package_io）。
+
+    参数:
+        doc: Document对象
+        abs_path: 目标文件绝对路径
+        durability: 持久化级别（none/file/file+dir）
+        policy: 重新编码的部件使用的压缩策略
+        workers: 并行压缩的线程数
+    """
+    members = _atomic_write(abs_path, durability, lambda f: save_package(doc, f, policy, workers))
+    # 下次保存时以新文件为源，复制仍未修改的部件
+    mark_saved(doc, abs_path, members)
+
+
+def recompress_file(abs_path: str, policy: CompressionPolicy,
+                    durability: str = DURABILITY_FILE, workers: int = 1) -> None:
+    """按压缩策略的最终级别原子地重新压缩整个文档文件"""
+    _atomic_write(abs_path, durability, lambda f: recompress_package(abs_path, f, policy, workers))
+
+
+class _CacheEntry:
+    """缓存条目"""
+    __slots__ = ("doc", "signature", "size")
+
+    def __init__(self, doc: Document, signature: Tuple[int, int, int], size: int):
+        self.doc = doc
+        self.signature = signature
+        self.size = size
+
+
+class DocumentCache:
+    """已解析文档的LRU缓存
+
+    按绝对路径缓存 Document 对象，每次命中前比对文件签名
+    (st_mtime_ns, st_size, st_ino)，外部程序修改文件后条目自动失效。
+    容量同时受条目数和估算字节数限制。
+    """
+
+    def __init__(self, max_entries: int = 8, max_bytes: int = 512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, abs_path: str, signature: Tuple[int, int, int]) -> Optional[Document]:
+        """查找缓存，签名不一致时丢弃旧条目并返回None"""
+        with self._lock:
+            entry = self._entries.get(abs_path)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.signature != signature:
+                self._remove(abs_path)
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(abs_path)
+            self.hits += 1
+            return entry.doc
+
+    def put(self, abs_path: str, doc: Document, signature: Tuple[int, int, int], size: int) -> None:
+        """放入缓存，超出容量时按LRU顺序淘汰"""
+        with self._lock:
+            self._remove(abs_path)
+            if size > self.max_bytes or self.max_entries <= 0:
+                return
+            self._entries[abs_path] = _CacheEntry(doc, signature, size)
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, abs_path: str) -> None:
+        """移除指定文档的缓存条目"""
+        with self._lock:
+            if self._remove(abs_path):
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计信息"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "estimated_bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+    def _remove(self, abs_path: str) -> bool:
+        entry = self._entries.pop(abs_path, None)
+        if entry is None:
+            return False
+        self._total_bytes -= entry.size
+        return True
+
+
+class _PendingWrite:
+    """待落盘的文档"""
+    __slots__ = ("doc", "last_modified")
+
+    def __init__(self, doc: Document):
+        self.doc = doc
+        self.last_modified = time.monotonic()
+
+
+class WriteBehindBuffer:
+    """延迟写入缓冲区
+
+    保存请求只把文档标记为脏，真正的序列化和写盘推迟到显式 flush、
+    空闲超时或进程退出时进行。脏文档不受 LRU 淘汰影响。
+    """
 
     def __init__(self):
-        pass  # 不再维护缓存
+        self._pending: Dict[str, _PendingWrite] = {}
+        self._lock = threading.RLock()
+
+    def get(self, abs_path: str) -> Optional[Document]:
+        """返回尚未落盘的文档"""
+        with self._lock:
+            pending = self._pending.get(abs_path)
+            return pending.doc if pending is not None else None
+
+    def mark_dirty(self, abs_path: str, doc: Document) -> None:
+        """标记文档已修改"""
+        with self._lock:
+            self._pending[abs_path] = _PendingWrite(doc)
+
+    def replace(self, abs_path: str, old: Document, new: Document) -> bool:
+        """待落盘的文档仍是 old 时替换为 new（不改变最后修改时间）"""
+        with self._lock:
+            pending = self._pending.get(abs_path)
+            if pending is None or pending.doc is not old:
+                return False
+            pending.doc = new
+            return True
+
+    def pop(self, abs_path: str) -> Optional[Document]:
+        """取出待落盘的文档"""
+        with self._lock:
+            pending = self._pending.pop(abs_path, None)
+            return pending.doc if pending is not None else None
+
+    def paths(self) -> List[str]:
+        """所有待落盘文档的路径"""
+        with self._lock:
+            return list(self._pending)
+
+    def idle_paths(self, max_idle: float) -> List[str]:
+        """空闲时间超过 max_idle 秒的待落盘文档路径"""
+        now = time.monotonic()
+        with self._lock:
+            return [path for path, pending in self._pending.items()
+                    if now - pending.last_modified >= max_idle]
+
+    def stats(self) -> Dict[str, Any]:
+        """缓冲区统计信息"""
+        with self._lock:
+            return {"pending": len(self._pending), "paths": list(self._pending)}
+
+
+# 所有工具模块共享的文档缓存（通过 DOC_MCP_CACHE=1 启用）
+_shared_cache: Optional[DocumentCache] = (
+    DocumentCache(config.CACHE_MAX_ENTRIES, config.CACHE_MAX_BYTES) if config.CACHE_ENABLED else None
+)
+
+# 所有工具模块共享的延迟写入缓冲区（通过 DOC_MCP_DEFERRED_SAVE=1 启用）
+_shared_write_buffer: Optional[WriteBehindBuffer] = WriteBehindBuffer() if config.DEFERRED_SAVE else None
+
+# 所有工具模块共享的文档锁注册表
+_shared_locks = DocumentLockRegistry()
+
+# 按 DOC_MCP_COMPRESSION_* 配置的压缩策略
+_shared_compression = CompressionPolicy.from_config()
+
+# 内存中的文档副本不压缩
+_SNAPSHOT_POLICY = CompressionPolicy(xml="stored", media="stored", other="stored")
+
+# 以非最终压缩级别保存过、关闭时需要重新压缩的文档
+_unfinalized_paths = set()
+_unfinalized_lock = threading.Lock()
+
+
+class BatchSession:
+    """批量操作会话：会话期间对同一文档的打开和保存都作用于同一个内存文档
+
+    rollback 为真时，会话中每个修改类工具执行前都记录快照，失败的工具不会留下部分修改。
+    """
+    __slots__ = ("abs_path", "doc", "modified", "rollback")
+
+    def __init__(self, abs_path: str, doc: Document, rollback: bool = False):
+        self.abs_path = abs_path
+        self.doc = doc
+        self.modified = False
+        self.rollback = rollback
+
+
+# 当前执行上下文中的批量操作会话
+_batch_session: ContextVar[Optional[BatchSession]] = ContextVar("doc_mcp_batch_session", default=None)
+
+# 当前执行上下文中已持有锁的文档路径（由 lock_documents 设置，随工具调用传入工作线程）
+_held_locks: ContextVar[frozenset] = ContextVar("doc_mcp_held_locks", default=frozenset())
+
+
+def _for_each_path(paths: List[str], action: Callable[[str], bool], verb: str) -> List[str]:
+    """对每个路径执行 action，返回 action 返回真的路径；全部执行完后汇总抛出失败的路径"""
+    done = []
+    failures = []
+    for path in paths:
+        try:
+            if action(path):
+                done.append(path)
+        except Exception as e:
+            failures.append((path, e))
+    if failures:
+        details = "；".join(f"{path}: {e}" for path, e in failures)
+        raise DocxError(f"{len(failures)}个文档{verb}失败: {details}") from failures[0][1]
+    return done
+
+
+class DocumentManager:
+    """文档管理器
+
+    默认每次都从磁盘重新加载文件；启用缓存（DOC_MCP_CACHE=1）后，
+    已解析的文档按文件签名校验后复用，保存时同步更新缓存。
+    启用延迟写入（DOC_MCP_DEFERRED_SAVE=1）后，save 只标记文档为脏，
+    由 flush/close 统一落盘。
+    """
+
+    def __init__(self, cache: Optional[DocumentCache] = None,
+                 write_buffer: Optional[WriteBehindBuffer] = None,
+                 durability: Optional[str] = None,
+                 locks: Optional[DocumentLockRegistry] = None,
+                 compression: Optional[CompressionPolicy] = None,
+                 save_workers: Optional[int] = None):
+        self._cache = cache if cache is not None else _shared_cache
+        self._write_buffer = write_buffer if write_buffer is not None else _shared_write_buffer
+        self._locks = locks if locks is not None else _shared_locks
+        self.durability = _normalize_durability(
+            durability if durability is not None else config.SAVE_DURABILITY
+        )
+        self.compression = compression if compression is not None else _shared_compression
+        self.save_workers = max(1, save_workers if save_workers is not None else config.SAVE_WORKERS)
 
     def get_or_open(self, filename: str, reload: bool = False) -> Document:
-        """打开文档（每次都重新加载）
+        """打开文档（启用缓存时优先返回签名一致的缓存对象）
 
         参数:
             filename: 文件路径
-            reload: 兼容参数，已废弃
+            reload: 兼容参数，已废弃（缓存条目由文件签名校验，无需强制重新加载）
         """
         abs_path = os.path.abspath(filename)
 
+        session = self._session_for(abs_path)
+        if session is not None:
+            return session.doc
+
+        if self._write_buffer is not None:
+            # 尚未落盘的修改优先于磁盘内容
+            pending = self._write_buffer.get(abs_path)
+            if pending is not None:
+                return pending
+
         if not os.path.exists(abs_path):
             raise FileNotFoundError(f"文件不存在: {abs_path}")
 
-        return Document(abs_path)
+        if self._cache is None:
+            return open_document(abs_path)
+
+        signature = _file_signature(abs_path)
+        doc = self._cache.get(abs_path, signature)
+        if doc is None:
+            doc = open_document(abs_path)
+            self._cache.put(abs_path, doc, signature, _estimate_document_bytes(abs_path))
+        return doc
 
     def create_new(self, filename: str) -> Document:
         """创建新文档"""
@@ -39,15 +410,300 @@ class DocumentManager:
             doc: Document对象
         """
         abs_path = os.path.abspath(filename)
-        doc.save(abs_path)
+
+        session = self._session_for(abs_path)
+        if session is not None:
+            # 批量操作期间只记录修改，由会话结束时统一保存
+            session.modified = True
+            return
+
+        if self._write_buffer is not None:
+            # 待落盘期间源文件可能被外部替换，先读入尚未加载的部件，保证修改始终可以写出
+            load_parts(doc)
+            self._write_buffer.mark_dirty(abs_path, doc)
+            return
+
+        self._write(abs_path, doc)
+
+    def _write(self, abs_path: str, doc: Document) -> None:
+        """将文档原子地写入磁盘并刷新缓存"""
+        atomic_save(doc, abs_path, self.durability, self.compression, self.save_workers)
+        if self.compression.final is not None:
+            with _unfinalized_lock:
+                _unfinalized_paths.add(abs_path)
+
+        if self._cache is not None:
+            # 保存后的对象与磁盘内容一致，直接以新签名写回缓存
+            self._cache.put(abs_path, doc, _file_signature(abs_path), _estimate_document_bytes(abs_path))
+
+    def is_dirty(self, filename: str) -> bool:
+        """文档是否有尚未落盘的修改"""
+        if self._write_buffer is None:
+            return False
+        return self._write_buffer.get(os.path.abspath(filename)) is not None
+
+    def has_pending_changes(self, filename: str) -> bool:
+        """文档的内存内容是否可能与磁盘不一致（处于批量操作会话中或有未落盘的修改）"""
+        abs_path = os.path.abspath(filename)
+        return self._session_for(abs_path) is not None or self.is_dirty(abs_path)
+
+    def iter_paragraph_texts(self, filename: str) -> Iterator[str]:
+        """按顺序产出正文段落文本
+
+        有未落盘修改时读取内存中的文档，否则直接流式解析磁盘文件，不构建对象模型。
+        """
+        abs_path = os.path.abspath(filename)
+        if self.has_pending_changes(abs_path):
+            return (para.text for para in self.get_or_open(abs_path).paragraphs)
+        if not os.path.exists(abs_path):
+            raise FileNotFoundError(f"文件不存在: {abs_path}")
+        return iter_paragraph_texts(abs_path)
+
+    @staticmethod
+    def _session_for(abs_path: str) -> Optional[BatchSession]:
+        session = _batch_session.get()
+        if session is not None and session.abs_path == abs_path:
+            return session
+        return None
+
+    @contextmanager
+    def batch(self, filename: str, isolated: bool = False,
+              rollback: bool = False) -> Iterator[BatchSession]:
+        """批量操作会话：会话内的工具共享同一个内存文档，save 只做标记
+
+        参数:
+            filename: 文档路径
+            isolated: 是否在文档副本上操作（用于全部成功才保存的场景，失败时不影响缓存和待写入的文档）
+            rollback: 是否为每个修改类工具记录回滚点（失败的工具恢复到执行前的状态）
+        """
+        abs_path = os.path.abspath(filename)
+        doc = self._open_copy(abs_path) if isolated else self.get_or_open(abs_path)
+        # 会话结束前修改只在内存中，同样不能依赖源文件中尚未加载的部件
+        load_parts(doc)
+        session = BatchSession(abs_path, doc, rollback)
+        token = _batch_session.set(session)
+        try:
+            yield session
+        finally:
+            _batch_session.reset(token)
+
+    def _open_copy(self, abs_path: str) -> Document:
+        """打开一份独立的文档对象（不与缓存或待写入的文档共享）"""
+        pending = self._write_buffer.get(abs_path) if self._write_buffer is not None else None
+        if pending is not None:
+            buffer = io.BytesIO()
+            save_package(pending, buffer, _SNAPSHOT_POLICY, record_stats=False)
+            buffer.seek(0)
+            return Document(buffer)
+        if not os.path.exists(abs_path):
+            raise FileNotFoundError(f"文件不存在: {abs_path}")
+        return open_document(abs_path)
+
+    def flush(self, filename: str) -> bool:
+        """将文档尚未落盘的修改写入磁盘
+
+        返回:
+            是否实际写入了文件
+        """
+        if self._write_buffer is None:
+            return False
+
+        abs_path = os.path.abspath(filename)
+        doc = self._write_buffer.pop(abs_path)
+        if doc is None:
+            return False
+
+        try:
+            self._write(abs_path, doc)
+        except Exception:
+            # 写入失败时保留脏状态，避免丢失修改
+            self._write_buffer.mark_dirty(abs_path, doc)
+            raise
+        return True
+
+    def flush_all(self) -> List[str]:
+        """写入所有尚未落盘的文档，返回已写入的路径
+
+        个别文档写入失败时继续写入其余文档，最后抛出 DocxError 汇总失败的路径（失败的文档保留脏状态）。
+        """
+        if self._write_buffer is None:
+            return []
+        return _for_each_path(self._write_buffer.paths(), self.flush, "写入")
+
+    def idle_dirty_paths(self, max_idle: float) -> List[str]:
+        """空闲超过 max_idle 秒、尚未落盘的文档路径"""
+        if self._write_buffer is None:
+            return []
+        return self._write_buffer.idle_paths(max_idle)
+
+    def dirty_paths(self) -> List[str]:
+        """所有尚未落盘的文档路径"""
+        if self._write_buffer is None:
+            return []
+        return self._write_buffer.paths()
+
+    @staticmethod
+    def holds_lock(filename: str) -> bool:
+        """当前调用是否已持有该文档的锁（读锁或写锁）"""
+        return os.path.abspath(filename) in _held_locks.get()
+
+    @asynccontextmanager
+    async def lock_documents(self, filenames: Iterable[str], exclusive: bool) -> AsyncIterator[None]:
+        """获取一组文档的读锁或写锁
+
+        同一文件上的写操作互斥，读操作可以并行；不同文件互不影响。
+        多个文件按路径排序后依次加锁，避免死锁。
+
+        参数:
+            filenames: 文件路径列表
+            exclusive: True 为写锁，False 为读锁
+        """
+        abs_paths = sorted({os.path.abspath(f) for f in filenames if f})
+        async with AsyncExitStack() as stack:
+            for abs_path in abs_paths:
+                await stack.enter_async_context(self._locks.acquire(abs_path, exclusive))
+            token = _held_locks.set(_held_locks.get() | frozenset(abs_paths))
+            try:
+                yield
+            finally:
+                _held_locks.reset(token)
 
     def save_and_close(self, filename: str, doc: Document) -> None:
-        """保存并关闭文档（与save相同，因为没有缓存）"""
+        """保存并关闭文档"""
         self.save(filename, doc)
+        self.close(filename)
+
+    def close(self, filename: str) -> bool:
+        """关闭文档：写入尚未落盘的修改并移出缓存
+
+        返回:
+            是否实际写入了文件
+        """
+        flushed = self.flush(filename)
+        self.finalize(filename)
+        if self._cache is not None:
+            self._cache.invalidate(os.path.abspath(filename))
+        return flushed
+
+    def finalize(self, filename: str) -> bool:
+        """按最终压缩级别重新压缩本次会话中保存过的文档（未配置最终级别时不做任何事）
+
+        返回:
+            是否重新压缩了文件
+        """
+        abs_path = os.path.abspath(filename)
+        with _unfinalized_lock:
+            if abs_path not in _unfinalized_paths:
+                return False
+            _unfinalized_paths.discard(abs_path)
+        if self.is_dirty(abs_path) or not os.path.exists(abs_path):
+            return False
+        try:
+            recompress_file(abs_path, self.compression, self.durability, self.save_workers)
+        except Exception:
+            with _unfinalized_lock:
+                _unfinalized_paths.add(abs_path)
+            raise
+        return True
+
+    def finalize_all(self) -> List[str]:
+        """重新压缩所有需要按最终级别压缩的文档，返回已处理的路径（失败时同 flush_all）"""
+        with _unfinalized_lock:
+            paths = sorted(_unfinalized_paths)
+        return _for_each_path(paths, self.finalize, "重新压缩")
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """返回缓存统计信息"""
+        if self._cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._cache.stats()}
 
-    def close(self, filename: str) -> None:
-        """关闭文档（无操作，因为没有缓存）"""
-        pass
+    def lock_stats(self) -> Dict[str, Any]:
+        """返回文档锁统计信息"""
+        return self._locks.stats()
+
+    def write_buffer_stats(self) -> Dict[str, Any]:
+        """返回延迟写入缓冲区统计信息"""
+        if self._write_buffer is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._write_buffer.stats()}
+
+
+class DocumentCheckpoint:
+    """修改类工具执行前的文档快照，工具失败时用于恢复只存在于内存中的修改
+
+    只复制主文档部件（正文、表格、节属性）的 XML 并记录其关系，不序列化整个文档包；
+    样式、编号等其他部件的修改不在快照范围内。
+
+    参数:
+        abs_path: 文档绝对路径
+        doc: 执行前的文档对象
+        element: 主文档部件 XML 的副本
+        rel_ids: 主文档部件执行前已有的关系 ID
+        session: 所在的批量操作会话
+    """
+    __slots__ = ("abs_path", "doc", "element", "rel_ids", "session")
+
+    def __init__(self, abs_path: str, doc: Document, element, rel_ids: frozenset,
+                 session: Optional[BatchSession] = None):
+        self.abs_path = abs_path
+        self.doc = doc
+        self.element = element
+        self.rel_ids = rel_ids
+        self.session = session
+
+
+def create_checkpoint(filename: Optional[str]) -> Optional[DocumentCheckpoint]:
+    """记录只存在于内存中的文档状态（批量操作会话中的文档或尚未落盘的文档）
+
+    没有这样的文档时返回None：工具失败后从磁盘重新加载即可。
+    """
+    if not filename:
+        return None
+    abs_path = os.path.abspath(filename)
+    session = DocumentManager._session_for(abs_path)
+    if session is not None:
+        if not session.rollback:
+            return None
+        doc = session.doc
+    elif _shared_write_buffer is not None:
+        doc = _shared_write_buffer.get(abs_path)
+    else:
+        doc = None
+    if doc is None:
+        return None
+    part = doc.part
+    return DocumentCheckpoint(abs_path, doc, copy.deepcopy(part._element), frozenset(part.rels), session)
+
+
+def restore_checkpoint(checkpoint: DocumentCheckpoint) -> None:
+    """把执行失败的工具可能已部分修改的主文档部件恢复为快照，并移除执行期间新增的关系"""
+    part = checkpoint.doc.part
+    part._element = checkpoint.element
+    for rel_id in [rel_id for rel_id in part.rels if rel_id not in checkpoint.rel_ids]:
+        # 恢复后的 XML 不再引用新增的关系（如插入的图片），保存时不会写出对应的部件
+        part.drop_rel(rel_id)
+    # 原文档对象缓存了旧的正文元素，按恢复后的部件重新创建
+    restored = part.document
+    if checkpoint.session is not None:
+        checkpoint.session.doc = restored
+    if _shared_write_buffer is not None:
+        _shared_write_buffer.replace(checkpoint.abs_path, checkpoint.doc, restored)
+    if _shared_cache is not None:
+        _shared_cache.invalidate(checkpoint.abs_path)
+
+
+def discard_cached_document(filename: Optional[str]) -> None:
+    """丢弃共享缓存中的文档（工具执行失败时调用，避免半修改的对象被复用）
+
+    尚未落盘的脏文档不会被丢弃（由执行前的快照恢复，见 restore_checkpoint）。
+    """
+    if _shared_cache is None or not filename:
+        return
+    abs_path = os.path.abspath(filename)
+    if _shared_write_buffer is not None and _shared_write_buffer.get(abs_path) is not None:
+        return
+    _shared_cache.invalidate(abs_path)
 
 
 def validate_file_path(filename: str) -> str:
@@ -8,12 +8,43 @@ class DocxError(Exception):
     pass
 
 
+def _discard_cached_document(filename) -> None:
+    """工具执行失败时丢弃缓存中可能已被部分修改的文档"""
+    from .docx_helper import discard_cached_document
+    discard_cached_document(filename)
+
+
+def _create_checkpoint(filename):
+    from .docx_helper import create_checkpoint
+    return create_checkpoint(filename)
+
+
+def _restore_checkpoint(checkpoint) -> None:
+    from .docx_helper import restore_checkpoint
+    restore_checkpoint(checkpoint)
+
+
 def handle_docx_errors(func: Callable) -> Callable:
-    """统一处理docx操作异常的装饰器"""
+    """统一处理docx操作异常的装饰器
+
+    修改类工具（注册时未标记为只读）执行前为尚未落盘的文档记录快照，
+    执行失败时恢复，部分完成的修改不会在之后被写入磁盘。
+    """
     @wraps(func)
     async def wrapper(*args, **kwargs) -> Dict[str, Any]:
         try:
-            result = await func(*args, **kwargs)
+            filename = kwargs.get('filename')
+            read_only = getattr(wrapper, "read_only", False)
+            if callable(read_only):
+                read_only = read_only(kwargs)
+            checkpoint = None if read_only else _create_checkpoint(filename)
+            try:
+                result = await func(*args, **kwargs)
+            except Exception:
+                if checkpoint is not None:
+                    _restore_checkpoint(checkpoint)
+                _discard_cached_document(filename)
+                raise
             if isinstance(result, dict) and "success" not in result:
                 result["success"] = True
             return result
@@ -0,0 +1,269 @@
+"""工具执行器 - 在有界线程池（或只读工具的进程池）中运行阻塞的 python-docx 操作"""
+import asyncio
+import contextvars
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+from . import config
+
+
+def run_coroutine_sync(coro) -> Any:
+    """在当前线程中同步驱动协程直到完成
+
+    工具函数虽然声明为 async，但内部只做同步的 zip/lxml 操作，从不真正挂起，
+    因此可以在工作线程中直接驱动，而无需为每次调用创建事件循环。
+    """
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("工具函数在工作线程中发生了异步挂起，无法同步执行")
+
+
+class _Job:
+    """一次提交的状态（用于在取消时修正排队计数）"""
+    __slots__ = ("submitted_at", "started", "cancelled")
+
+    def __init__(self):
+        self.submitted_at = time.perf_counter()
+        self.started = False
+        self.cancelled = False
+
+
+class ToolExecutor:
+    """有界线程池执行器
+
+    把工具的加载/修改/保存过程放到工作线程中执行，事件循环只负责收发消息，
+    不同文档上的调用可以真正重叠。同时统计排队深度和每次调用的等待时间。
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="doc-mcp-worker"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._last_wait = 0.0
+        self._total_run = 0.0
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """在线程池中执行函数（协程函数会在工作线程中被同步驱动）
+
+        与 asyncio.to_thread 一样在调用方上下文变量的副本中执行（如中间件记录的已持有的锁）。
+        """
+        loop = asyncio.get_running_loop()
+        job = _Job()
+        context = contextvars.copy_context()
+        with self._lock:
+            self._queued += 1
+            self._submitted += 1
+
+        try:
+            return await loop.run_in_executor(
+                self._executor, context.run, self._execute, job, func, args, kwargs
+            )
+        except asyncio.CancelledError:
+            with self._lock:
+                if not job.started:
+                    # 任务尚未开始即被取消，工作线程不会再执行它
+                    job.cancelled = True
+                    self._queued -= 1
+            raise
+
+    def _execute(self, job: _Job, func: Callable, args: tuple, kwargs: dict) -> Any:
+        started_at = time.perf_counter()
+        wait = started_at - job.submitted_at
+        with self._lock:
+            if job.cancelled:
+                return None
+            job.started = True
+            self._queued -= 1
+            self._active += 1
+            self._total_wait += wait
+            self._last_wait = wait
+            self._max_wait = max(self._max_wait, wait)
+
+        try:
+            result = func(*args, **kwargs)
+            if asyncio.iscoroutine(result):
+                result = run_coroutine_sync(result)
+            return result
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+                self._total_run += time.perf_counter() - started_at
+
+    def stats(self) -> Dict[str, Any]:
+        """执行器统计信息（时间单位为毫秒）"""
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self._queued,
+                "active": self._active,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "avg_wait_ms": round(self._total_wait / started * 1000, 3) if started else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+                "last_wait_ms": round(self._last_wait * 1000, 3),
+                "avg_run_ms": round(self._total_run / self._completed * 1000, 3) if self._completed else 0.0
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭线程池"""
+        self._executor.shutdown(wait=wait)
+
+
+def _warm_worker() -> None:
+    """进程池工作进程的初始化函数：预先导入 python-docx 和工具模块"""
+    import docx  # noqa: F401
+    from ..tools import document_basic, content_edit, table_ops, advanced  # noqa: F401
+
+
+def _ping() -> int:
+    """预热用的空任务，短暂停留以便任务分散到不同的工作进程"""
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def _run_in_worker(module_name: str, func_name: str, kwargs: dict) -> Tuple[Any, float]:
+    """在工作进程中按模块名和函数名执行工具，返回 (结果, 开始执行的时间戳)"""
+    started_at = time.time()
+    func = getattr(importlib.import_module(module_name), func_name)
+    result = func(**kwargs)
+    if asyncio.iscoroutine(result):
+        result = run_coroutine_sync(result)
+    return result, started_at
+
+
+class ProcessToolBackend:
+    """只读工具的进程池执行后端
+
+    文本提取、大纲构建、编号解析都是受GIL限制的纯CPU lxml操作。该后端只把
+    文件路径和参数发送给工作进程，工作进程自行打开文档并返回可直接序列化为JSON的字典，
+    批量处理大量文档时可以随CPU核数扩展。
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max(1, max_workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._restarts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # 服务器进程中已有工作线程，使用 spawn 避免 fork 带来的锁状态问题
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker
+                )
+            return self._pool
+
+    def prewarm(self) -> None:
+        """启动全部工作进程并完成导入，避免首批请求承担进程启动开销"""
+        pool = self._get_pool()
+        for _ in range(self.max_workers):
+            pool.submit(_ping)
+
+    async def run(self, func: Callable, **kwargs) -> Any:
+        """在工作进程中执行工具函数（参数必须可pickle）"""
+        loop = asyncio.get_running_loop()
+        submitted_at = time.time()
+        with self._lock:
+            self._in_flight += 1
+            self._submitted += 1
+
+        try:
+            result, started_at = await loop.run_in_executor(
+                self._get_pool(), _run_in_worker, func.__module__, func.__name__, kwargs
+            )
+        except BrokenProcessPool:
+            # 工作进程异常退出时重建进程池，并在当前进程中完成本次调用
+            self._reset_pool()
+            return await get_tool_executor().run(func, **kwargs)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        wait = max(0.0, started_at - submitted_at)
+        with self._lock:
+            self._completed += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        return result
+
+    def _reset_pool(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+            self._restarts += 1
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """进程池统计信息（时间单位为毫秒）"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.max_workers),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "restarts": self._restarts,
+                "avg_wait_ms": round(self._total_wait / self._completed * 1000, 3) if self._completed else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3)
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭进程池"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+_shared_executor: Optional[ToolExecutor] = None
+_shared_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ToolExecutor:
+    """获取所有工具共享的执行器（首次调用时按 DOC_MCP_WORKERS 创建）"""
+    global _shared_executor
+    with _shared_executor_lock:
+        if _shared_executor is None:
+            _shared_executor = ToolExecutor(config.WORKER_THREADS)
+        return _shared_executor
+
+
+_shared_process_backend: Optional[ProcessToolBackend] = None
+
+
+def get_process_backend() -> Optional[ProcessToolBackend]:
+    """获取只读工具的进程池后端（DOC_MCP_READ_BACKEND=process 时启用，否则返回None）"""
+    global _shared_process_backend
+    if config.READ_BACKEND != "process":
+        return None
+    with _shared_executor_lock:
+        if _shared_process_backend is None:
+            _shared_process_backend = ProcessToolBackend(config.PROCESS_WORKERS)
+        return _shared_process_backend
@@ -0,0 +1,49 @@
+"""新建文件的权限 - 先写临时文件再替换目标文件的保存方式共用
+
+``tempfile.mkstemp`` 创建的文件权限为 0600，替换到目标路径之前需要改为普通新建文件的权限：
+目标文件已存在时沿用其权限，否则按进程的 umask 计算（0666 & ~umask）。
+"""
+import os
+import threading
+from typing import Optional
+
+_umask_lock = threading.Lock()
+_cached_umask: Optional[int] = None
+
+
+def _read_umask() -> int:
+    # Linux 4.7+ 可以直接读取，不需要修改进程的 umask
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    # os.umask 只能“设置并返回”：临时设为最严格的 0077，期间其他线程新建的文件只会权限更小
+    mask = os.umask(0o077)
+    os.umask(mask)
+    return mask
+
+
+def current_umask() -> int:
+    """进程的 umask（首次调用时读取一次）"""
+    global _cached_umask
+    with _umask_lock:
+        if _cached_umask is None:
+            _cached_umask = _read_umask()
+        return _cached_umask
+
+
+def default_file_mode(path: Optional[str] = None) -> int:
+    """新写入的文件应有的权限
+
+    参数:
+        path: 要替换的目标文件（已存在时沿用其权限；None 或不存在时按 umask 计算）
+    """
+    if path is not None:
+        try:
+            return os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            pass
+    return 0o666 & ~current_umask()
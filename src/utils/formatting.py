@@ -0,0 +1,290 @@
+"""文本格式规格 - 段落、标题、列表、单元格工具共用的字体/段落格式
+
+同一组格式参数只解析一次：``FormatSpec`` 按参数缓存，构造时把字体格式和段落格式
+分别编译成 ``w:rPr`` / ``w:pPr`` 模板（通过 python-docx 自身的属性设置生成，
+输出与逐项设置 ``run.font`` / ``paragraph_format`` 一致），应用时直接复制模板。
+批量插入大量段落时不再为每个 run 重复解析颜色、构造对齐方式映射。
+"""
+import re
+from copy import deepcopy
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from docx.document import Document as DocumentObject
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Inches, Pt, RGBColor
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+from .body_index import StyleNames
+
+W_R = qn('w:r')
+W_RPR = qn('w:rPr')
+W_PPR = qn('w:pPr')
+W_IND = qn('w:ind')
+W_RFONTS = qn('w:rFonts')
+W_SECTPR = qn('w:sectPr')
+
+ALIGNMENTS = {
+    'left': WD_ALIGN_PARAGRAPH.LEFT,
+    'center': WD_ALIGN_PARAGRAPH.CENTER,
+    'right': WD_ALIGN_PARAGRAPH.RIGHT,
+    'justify': WD_ALIGN_PARAGRAPH.JUSTIFY
+}
+
+_HEX_COLOR = re.compile(r"#?([0-9A-Fa-f]{6})")
+
+# w:rPr 中位于 w:shd 之后的元素（CT_RPr 没有为 shd 生成插入方法）
+_SHD_SUCCESSORS = (
+    'w:fitText', 'w:vertAlign', 'w:rtl', 'w:cs', 'w:em', 'w:lang',
+    'w:eastAsianLayout', 'w:specVanish', 'w:oMath'
+)
+
+# 合并到已有格式时按属性合并的元素（其余元素整体替换）
+_MERGE_ATTRIBUTES = frozenset({W_RFONTS, W_IND})
+# w:ind 中互斥的首行缩进/悬挂缩进
+_IND_EXCLUSIVE = (qn('w:firstLine'), qn('w:hanging'))
+
+
+def _parse_color(value: Optional[str], name: str) -> Optional[str]:
+    if not value:
+        return None
+    match = _HEX_COLOR.fullmatch(value.strip())
+    if match is None:
+        raise ValueError(f"{name}格式无效: {value}，应为十六进制RGB，如'FF0000'")
+    return match.group(1).upper()
+
+
+def _merge_properties(props, template) -> None:
+    """把格式模板的子元素合并到已有的 w:rPr / w:pPr 中（按 schema 顺序插入）"""
+    for child in template:
+        existing = props.find(child.tag)
+        if existing is not None and child.tag in _MERGE_ATTRIBUTES:
+            if child.tag == W_IND and any(child.get(a) is not None for a in _IND_EXCLUSIVE):
+                for attribute in _IND_EXCLUSIVE:
+                    existing.attrib.pop(attribute, None)
+            existing.attrib.update(child.attrib)
+            continue
+        new_child = deepcopy(child)
+        if existing is not None:
+            existing.addnext(new_child)
+            props.remove(existing)
+            continue
+        local_name = child.tag.rsplit('}', 1)[-1]
+        insert = getattr(props, f"_insert_{local_name}", None)
+        if insert is not None:
+            insert(new_child)
+        else:
+            props.insert_element_before(new_child, *_SHD_SUCCESSORS)
+
+
+def _apply_template(element, template, tag: str) -> None:
+    if template is None:
+        return
+    props = element.find(tag)
+    if props is None:
+        # 没有已有格式时直接复制整个模板
+        element.insert(0, deepcopy(template))
+    else:
+        _merge_properties(props, template)
+
+
+class FormatSpec:
+    """一组字体/段落格式（不可变、可哈希）
+
+    通过 ``FormatSpec.of(...)`` 或 ``FormatSpec.from_dict(...)`` 获取，相同参数共享同一个
+    已编译的对象。未指定（None）的格式项保持继承，不写入文档。
+
+    参数:
+        font_name: 字体名称
+        font_size: 字号，单位磅
+        bold: 是否粗体（None 表示不设置）
+        italic: 是否斜体（None 表示不设置）
+        color: 文字颜色，十六进制RGB
+        highlight: 背景色（高亮），十六进制RGB
+        first_line_indent: 首行缩进，单位厘米
+        left_indent: 左缩进，单位厘米
+        right_indent: 右缩进，单位厘米
+        alignment: 对齐方式：left/center/right/justify（其他值忽略）
+    """
+    __slots__ = ("_key", "_rpr", "_ppr")
+
+    FIELDS = (
+        "font_name", "font_size", "bold", "italic", "color", "highlight",
+        "first_line_indent", "left_indent", "right_indent", "alignment"
+    )
+
+    def __init__(self, font_name: Optional[str] = None, font_size: Optional[float] = None,
+                 bold: Optional[bool] = None, italic: Optional[bool] = None,
+                 color: Optional[str] = None, highlight: Optional[str] = None,
+                 first_line_indent: Optional[float] = None, left_indent: Optional[float] = None,
+                 right_indent: Optional[float] = None, alignment: Optional[str] = None):
+        alignment = alignment.lower() if alignment else None
+        self._key = (
+            font_name or None,
+            font_size or None,
+            None if bold is None else bool(bold),
+            None if italic is None else bool(italic),
+            _parse_color(color, "文字颜色"),
+            _parse_color(highlight, "背景色"),
+            first_line_indent,
+            left_indent,
+            right_indent,
+            alignment if alignment in ALIGNMENTS else None
+        )
+        self._rpr = self._compile_run()
+        self._ppr = self._compile_paragraph()
+
+    @classmethod
+    def of(cls, **options) -> "FormatSpec":
+        """按格式参数获取（缓存的）格式规格"""
+        return _cached_spec(cls._normalize(options))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FormatSpec":
+        """从批量操作的条目（如 batch_add_paragraphs 的段落）中读取格式参数"""
+        return _cached_spec(cls._normalize({name: data.get(name) for name in cls.FIELDS}))
+
+    @classmethod
+    def _normalize(cls, options: Dict[str, Any]) -> Tuple:
+        unknown = set(options) - set(cls.FIELDS)
+        if unknown:
+            raise TypeError(f"未知的格式参数: {', '.join(sorted(unknown))}")
+        return tuple(options.get(name) for name in cls.FIELDS)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, FormatSpec) and self._key == other._key
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __repr__(self) -> str:
+        options = ", ".join(f"{name}={value!r}" for name, value in zip(self.FIELDS, self._key)
+                            if value is not None)
+        return f"FormatSpec({options})"
+
+    def _compile_run(self):
+        font_name, font_size, bold, italic, color, highlight = self._key[:6]
+        if all(value is None for value in self._key[:6]):
+            return None
+        run = Run(OxmlElement('w:r'), None)
+        font = run.font
+        if font_name:
+            font.name = font_name
+        if font_size:
+            font.size = Pt(font_size)
+        if bold is not None:
+            font.bold = bold
+        if italic is not None:
+            font.italic = italic
+        if color:
+            font.color.rgb = RGBColor.from_string(color)
+        rpr = run._r.get_or_add_rPr()
+        if highlight:
+            shd = OxmlElement('w:shd')
+            shd.set(qn('w:val'), 'clear')
+            shd.set(qn('w:color'), 'auto')
+            shd.set(qn('w:fill'), highlight)
+            rpr.insert_element_before(shd, *_SHD_SUCCESSORS)
+        return rpr
+
+    def _compile_paragraph(self):
+        first_line_indent, left_indent, right_indent, alignment = self._key[6:]
+        if all(value is None for value in self._key[6:]):
+            return None
+        paragraph = Paragraph(OxmlElement('w:p'), None)
+        paragraph_format = paragraph.paragraph_format
+        if first_line_indent is not None:
+            paragraph_format.first_line_indent = Inches(first_line_indent / 2.54)
+        if left_indent is not None:
+            paragraph_format.left_indent = Inches(left_indent / 2.54)
+        if right_indent is not None:
+            paragraph_format.right_indent = Inches(right_indent / 2.54)
+        if alignment:
+            paragraph_format.alignment = ALIGNMENTS[alignment]
+        return paragraph._p.pPr
+
+    @property
+    def has_run_format(self) -> bool:
+        return self._rpr is not None
+
+    @property
+    def has_paragraph_format(self) -> bool:
+        return self._ppr is not None
+
+    def apply_to_run(self, run) -> None:
+        """把字体格式应用到 run（Run 对象或 w:r 元素）"""
+        _apply_template(getattr(run, "_r", run), self._rpr, W_RPR)
+
+    def apply_to_paragraph(self, paragraph) -> None:
+        """把段落格式应用到段落，并把字体格式应用到段落中的每个 run
+
+        参数:
+            paragraph: Paragraph 对象或 w:p 元素
+        """
+        p = getattr(paragraph, "_p", paragraph)
+        _apply_template(p, self._ppr, W_PPR)
+        if self._rpr is not None:
+            for r in p.iterchildren(W_R):
+                _apply_template(r, self._rpr, W_RPR)
+
+
+def font_toggles(font_name, font_size, bold, italic, color, highlight) -> Tuple[Any, Any]:
+    """按原有工具的规则确定要写入的 bold/italic
+
+    只有设置了任一字体格式（False 不算）时才按原值写入，此时 False 会写入 w:val="0"，
+    覆盖样式中的粗体/斜体；没有设置任何字体格式时返回 (None, None)，沿用样式。
+    """
+    if any([font_name, font_size, bold, italic, color, highlight]):
+        return bold, italic
+    return None, None
+
+
+@lru_cache(maxsize=256)
+def _cached_spec(key: Tuple) -> FormatSpec:
+    return FormatSpec(*key)
+
+
+PLAIN = FormatSpec()
+
+
+class ParagraphWriter:
+    """按样式和格式规格向正文追加或插入段落
+
+    ``doc.add_paragraph(text, style=...)`` 每次都要按名称扫描全部样式，并从头查找
+    ``w:sectPr`` 确定插入位置；批量写入时这里缓存样式ID和插入位置。
+    """
+
+    def __init__(self, doc: DocumentObject):
+        self._doc = doc
+        self._styles = StyleNames(doc)
+        body = doc.element.body
+        last = body[-1] if len(body) else None
+        self._sect_pr = last if last is not None and last.tag == W_SECTPR else None
+
+    def add(self, text: str = "", style: Optional[str] = None, spec: FormatSpec = PLAIN,
+            before=None) -> Paragraph:
+        """写入一个段落
+
+        参数:
+            text: 段落文本（其中的 \\t、\\n 转换为制表符和换行）
+            style: 段落样式名称（可选）
+            spec: 格式规格
+            before: 插入到该段落（Paragraph 或 w:p 元素）之前；None 表示追加到正文末尾
+        """
+        p = OxmlElement('w:p')
+        paragraph = Paragraph(p, self._doc._body)
+        style_id = self._styles.paragraph_style_id(style) if style else None
+        if style_id is not None:
+            p.style = style_id
+        if text:
+            paragraph.add_run(text)
+        spec.apply_to_paragraph(p)
+
+        if before is not None:
+            getattr(before, "_p", before).addprevious(p)
+        elif self._sect_pr is not None:
+            self._sect_pr.addprevious(p)
+        else:
+            self._doc.element.body.append(p)
+        return paragraph
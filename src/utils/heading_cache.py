@@ -0,0 +1,182 @@
+"""标题列表缓存 - 按文档内容哈希缓存解析好的标题（含自动编号）
+
+标题列表需要遍历全部段落、逐个解析样式和编号，而导航时会反复查询同一个文档。
+这里按 ``word/document.xml``、``numbering.xml``、``styles.xml`` 三个部件的内容哈希
+缓存计算结果：只要这三个部件不变（如只修改了页眉、图片或文件时间），就复用已有结果。
+文件签名（修改时间、大小、inode）未变化时连哈希也不需要重新计算。
+
+范围和级别查询在按段落索引排序的标题列表上二分查找，不再重新计算。
+"""
+import hashlib
+import os
+import posixpath
+import threading
+import zipfile
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from lxml import etree
+from . import config
+from .text_stream import main_document_part
+
+# 标题编号依赖的部件（与主文档部件一起计算内容哈希）
+_RELATED_PART_TYPES = frozenset({
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering",
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles",
+})
+_PACKAGE_RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def _signature(abs_path: str) -> Tuple[int, int, int]:
+    st = os.stat(abs_path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _related_parts(archive: zipfile.ZipFile, main_part: str) -> List[str]:
+    """主文档部件关系中的编号和样式部件名"""
+    directory, name = posixpath.split(main_part)
+    try:
+        rels = etree.fromstring(archive.read(posixpath.join(directory, "_rels", f"{name}.rels")))
+    except KeyError:
+        return []
+    parts = []
+    for rel in rels.iter(f"{_PACKAGE_RELS_NS}Relationship"):
+        if rel.get("Type") in _RELATED_PART_TYPES and rel.get("TargetMode") != "External":
+            target = rel.get("Target")
+            if target.startswith("/"):
+                parts.append(posixpath.normpath(target.lstrip("/")))
+            else:
+                parts.append(posixpath.normpath(posixpath.join(directory, target)))
+    return sorted(parts)
+
+
+def content_digest(abs_path: str) -> str:
+    """主文档、编号和样式部件的内容哈希"""
+    digest = hashlib.blake2b(digest_size=16)
+    with zipfile.ZipFile(abs_path) as archive:
+        main_part = main_document_part(archive)
+        for name in [main_part] + _related_parts(archive, main_part):
+            try:
+                data = archive.read(name)
+            except KeyError:
+                continue
+            digest.update(name.encode("utf-8"))
+            digest.update(len(data).to_bytes(8, "little"))
+            digest.update(data)
+    return digest.hexdigest()
+
+
+class HeadingIndex:
+    """按段落索引排序的标题列表，支持按范围和级别查询
+
+    参数:
+        headings: 标题列表（每项包含 level、text、paragraph_index、style），按段落索引升序
+    """
+
+    def __init__(self, headings: List[Dict[str, Any]]):
+        self.headings = headings
+        self._positions = [heading["paragraph_index"] for heading in headings]
+        # 最大级别 -> (段落索引列表, 标题列表)
+        self._levels: Dict[int, Tuple[List[int], List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.headings)
+
+    def _for_level(self, max_level: Optional[int]) -> Tuple[List[int], List[Dict[str, Any]]]:
+        if max_level is None:
+            return self._positions, self.headings
+        with self._lock:
+            entry = self._levels.get(max_level)
+            if entry is None:
+                headings = [heading for heading in self.headings if heading["level"] <= max_level]
+                entry = self._levels[max_level] = ([h["paragraph_index"] for h in headings], headings)
+        return entry
+
+    def query(self, start_index: Optional[int] = None, end_index: Optional[int] = None,
+              max_level: Optional[int] = None) -> List[Dict[str, Any]]:
+        """段落索引在 [start_index, end_index] 范围内、级别不超过 max_level 的标题
+
+        参数:
+            start_index: 起始段落索引（包含），None 表示从文档开头
+            end_index: 结束段落索引（包含），None 表示到文档末尾
+            max_level: 最大标题级别，None 表示所有级别
+        """
+        positions, headings = self._for_level(max_level)
+        low = 0 if start_index is None else bisect_left(positions, start_index)
+        high = len(positions) if end_index is None else bisect_right(positions, end_index)
+        return headings[low:high]
+
+
+class HeadingCache:
+    """按内容哈希缓存的标题索引（LRU）
+
+    参数:
+        max_entries: 最多缓存的文档数（0 表示不缓存）
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max(0, max_entries)
+        self._lock = threading.Lock()
+        # 绝对路径 -> (文件签名, 内容哈希)
+        self._digests: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        self._entries: "OrderedDict[str, HeadingIndex]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, abs_path: str, build: Callable[[], List[Dict[str, Any]]]) -> HeadingIndex:
+        """获取文档的标题索引，内容变化时才调用 build 重新计算
+
+        参数:
+            abs_path: 文档绝对路径
+            build: 计算标题列表的函数
+        """
+        if self.max_entries == 0:
+            return HeadingIndex(build())
+
+        signature = _signature(abs_path)
+        with self._lock:
+            known = self._digests.get(abs_path)
+        digest = known[1] if known is not None and known[0] == signature else content_digest(abs_path)
+
+        with self._lock:
+            self._digests[abs_path] = (signature, digest)
+            index = self._entries.get(digest)
+            if index is not None:
+                self._entries.move_to_end(digest)
+                self._hits += 1
+                return index
+
+        index = HeadingIndex(build())
+        with self._lock:
+            self._misses += 1
+            self._entries[digest] = index
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                for path in [p for p, (_, d) in self._digests.items() if d == evicted]:
+                    del self._digests[path]
+        return index
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计信息"""
+        with self._lock:
+            return {
+                "max_entries": self.max_entries,
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses
+            }
+
+
+_shared_heading_cache: Optional[HeadingCache] = None
+_shared_heading_cache_lock = threading.Lock()
+
+
+def get_heading_cache() -> HeadingCache:
+    """获取共享的标题缓存（容量由 DOC_MCP_HEADING_CACHE_ENTRIES 配置）"""
+    global _shared_heading_cache
+    with _shared_heading_cache_lock:
+        if _shared_heading_cache is None:
+            _shared_heading_cache = HeadingCache(config.HEADING_CACHE_ENTRIES)
+        return _shared_heading_cache
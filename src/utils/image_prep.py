@@ -0,0 +1,329 @@
+"""插入图片前的预处理 - 按目标尺寸降采样、重新压缩，并按内容缓存处理结果
+
+截图等高分辨率图片原样嵌入时，文档体积和之后每次保存的耗时都会随之增大。这里按图片在文档中的
+显示宽度和最大 DPI 计算需要的像素数，超出时用 Pillow 缩小；再按指定格式重新编码
+（JPEG 质量、PNG optimize，python-docx 不支持的 WebP 等格式转为 PNG）。
+
+处理结果以 (源文件内容哈希, 处理参数) 为键保存在磁盘缓存中，同一张截图或 logo 插入到
+多个文档时只解码和压缩一次。源文件签名（修改时间、大小、inode）未变化时连哈希也不需要重新计算。
+"""
+import hashlib
+import io
+import math
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+from PIL import Image, UnidentifiedImageError
+from . import config
+
+PREP_VERSION = 2
+
+# 输出格式：auto 表示 JPEG 保持 JPEG，其他格式输出 PNG
+IMAGE_FORMATS = ("auto", "jpeg", "png")
+
+# python-docx 能够直接嵌入的图片格式（Pillow 的格式名）
+_EMBEDDABLE_FORMATS = frozenset({"BMP", "GIF", "JPEG", "PNG", "TIFF"})
+
+_EXTENSIONS = {"jpeg": "jpg", "png": "png"}
+
+# 没有 DPI 信息时 python-docx 按 72 DPI 计算原始尺寸
+_DEFAULT_DPI = 72
+
+
+class ImageOptions:
+    """图片预处理参数
+
+    参数:
+        max_dpi: 按显示宽度计算的最大分辨率（None 表示不缩小）
+        image_format: 输出格式：auto、jpeg、png
+        jpeg_quality: JPEG 压缩质量（1-95）
+        optimize: 是否启用 PNG/JPEG 的 optimize 编码（体积更小，编码更慢）
+    """
+    __slots__ = ("max_dpi", "image_format", "jpeg_quality", "optimize")
+
+    def __init__(self, max_dpi: Optional[float] = None, image_format: str = "auto",
+                 jpeg_quality: int = 85, optimize: bool = False):
+        if max_dpi is not None and max_dpi <= 0:
+            raise ValueError(f"max_dpi 必须大于0，当前值: {max_dpi}")
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"不支持的图片格式: {image_format}，可选值: {', '.join(IMAGE_FORMATS)}")
+        if not 1 <= jpeg_quality <= 95:
+            raise ValueError(f"jpeg_quality 必须在 1-95 之间，当前值: {jpeg_quality}")
+        self.max_dpi = max_dpi
+        self.image_format = image_format
+        self.jpeg_quality = jpeg_quality
+        self.optimize = optimize
+
+
+class PreparedImage:
+    """预处理后的图片
+
+    参数:
+        blob: 要嵌入的图片数据
+        width: 显示宽度（英寸）
+        height: 显示高度（英寸）
+        info: 处理信息（格式、像素尺寸、大小、是否命中缓存）
+    """
+    __slots__ = ("blob", "width", "height", "info")
+
+    def __init__(self, blob: bytes, width: float, height: float, info: Dict[str, Any]):
+        self.blob = blob
+        self.width = width
+        self.height = height
+        self.info = info
+
+
+def _signature(abs_path: str) -> Tuple[int, int, int]:
+    st = os.stat(abs_path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _image_dpi(image: Image.Image) -> Tuple[int, int]:
+    # 与 python-docx 一样按整数 DPI 计算（Pillow 从 PNG 的每米像素数换算时带小数）
+    dpi = image.info.get("dpi") or (_DEFAULT_DPI, _DEFAULT_DPI)
+    return tuple(int(round(value)) if value and value >= 1 else _DEFAULT_DPI for value in dpi[:2])
+
+
+def display_size(image: Image.Image, width: Optional[float] = None,
+                 height: Optional[float] = None) -> Tuple[float, float]:
+    """图片在文档中的显示尺寸（英寸），规则与 python-docx 的 add_picture 一致
+
+    参数:
+        image: 图片（只需读取文件头）
+        width: 指定宽度（英寸），只指定一边时另一边按比例缩放
+        height: 指定高度（英寸）
+    """
+    dpi_x, dpi_y = _image_dpi(image)
+    native_width = image.width / dpi_x
+    native_height = image.height / dpi_y
+    if width and height:
+        return width, height
+    if width:
+        return width, native_height * width / native_width
+    if height:
+        return native_width * height / native_height, height
+    return native_width, native_height
+
+
+def _output_format(source_format: Optional[str], options: ImageOptions) -> str:
+    if options.image_format != "auto":
+        return options.image_format
+    return "jpeg" if source_format == "JPEG" else "png"
+
+
+def _target_pixels(image: Image.Image, display_width: float,
+                   max_dpi: Optional[float]) -> Optional[Tuple[int, int]]:
+    """超出最大 DPI 时缩小后的像素尺寸（无需缩小时返回 None）"""
+    if max_dpi is None:
+        return None
+    target_width = max(1, math.ceil(display_width * max_dpi))
+    if image.width <= target_width:
+        return None
+    return target_width, max(1, round(image.height * target_width / image.width))
+
+
+def _output_dpi(image: Image.Image, size: Optional[Tuple[int, int]],
+                options: ImageOptions) -> Tuple[float, float]:
+    """写入输出图片的分辨率：缩小后的图片按 max_dpi 记录，否则沿用原图的分辨率"""
+    if size is not None:
+        return (float(options.max_dpi), float(options.max_dpi))
+    return _image_dpi(image)
+
+
+def _has_alpha(image: Image.Image) -> bool:
+    return image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+
+
+def _encode(image: Image.Image, output_format: str, size: Optional[Tuple[int, int]],
+            dpi: Tuple[float, float], options: ImageOptions) -> bytes:
+    """解码、缩小并按输出格式重新编码，输出中记录分辨率 dpi"""
+    if size is not None and image.format == "JPEG":
+        # JPEG 可以在解码时直接按 1/2、1/4、1/8 缩小
+        image.draft("RGB", size)
+    image.load()
+    if size is not None:
+        if image.mode == "P":
+            image = image.convert("RGBA" if _has_alpha(image) else "RGB")
+        image = image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+    if output_format == "jpeg":
+        if _has_alpha(image):
+            # JPEG 不支持透明度，透明部分按白色背景合成
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        elif image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+    elif image.mode not in ("1", "L", "LA", "P", "RGB", "RGBA", "I", "I;16"):
+        image = image.convert("RGBA" if _has_alpha(image) else "RGB")
+
+    buffer = io.BytesIO()
+    if output_format == "jpeg":
+        image.save(buffer, "JPEG", quality=options.jpeg_quality, optimize=options.optimize, dpi=dpi)
+    else:
+        image.save(buffer, "PNG", optimize=options.optimize, dpi=dpi)
+    return buffer.getvalue()
+
+
+class ImageCache:
+    """按 (源文件内容哈希, 处理参数) 缓存预处理结果
+
+    参数:
+        cache_dir: 缓存目录（None 表示不缓存，每次都重新处理）
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self._dir = cache_dir
+        self._lock = threading.Lock()
+        # 绝对路径 -> (文件签名, 内容哈希)
+        self._digests: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def source_digest(self, abs_path: str) -> str:
+        """源文件的内容哈希（签名未变化时直接返回上次的结果）"""
+        signature = _signature(abs_path)
+        with self._lock:
+            known = self._digests.get(abs_path)
+        if known is not None and known[0] == signature:
+            return known[1]
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(abs_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        with self._lock:
+            self._digests[abs_path] = (signature, digest)
+        return digest
+
+    def _path(self, key: str, extension: str) -> str:
+        return os.path.join(self._dir, key[:2], f"{key}.{extension}")
+
+    def get(self, key: str, extension: str) -> Optional[bytes]:
+        if self._dir is None:
+            return None
+        try:
+            with open(self._path(key, extension), "rb") as f:
+                blob = f.read()
+        except OSError:
+            blob = None
+        with self._lock:
+            if blob is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return blob
+
+    def put(self, key: str, extension: str, blob: bytes) -> None:
+        if self._dir is None:
+            return
+        path = self._path(key, extension)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".~", suffix=".tmp", dir=os.path.dirname(path))
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(blob)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            # 缓存目录不可写时不缓存
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计信息"""
+        with self._lock:
+            return {
+                "cache_dir": self._dir,
+                "hits": self._hits,
+                "misses": self._misses
+            }
+
+
+def needs_preprocessing(options: Optional[ImageOptions], image_path: str) -> bool:
+    """是否需要预处理：指定了预处理参数，或图片格式无法直接嵌入"""
+    if options is not None:
+        return True
+    try:
+        with Image.open(image_path) as image:
+            return image.format not in _EMBEDDABLE_FORMATS
+    except (UnidentifiedImageError, OSError):
+        # 交给 python-docx 给出错误信息
+        return False
+
+
+def prepare_image(image_path: str, width: Optional[float] = None, height: Optional[float] = None,
+                  options: Optional[ImageOptions] = None,
+                  cache: Optional[ImageCache] = None) -> PreparedImage:
+    """预处理要插入的图片
+
+    参数:
+        image_path: 图片文件路径
+        width: 显示宽度（英寸，可选）
+        height: 显示高度（英寸，可选）
+        options: 预处理参数（None 表示使用默认参数，只做格式转换）
+        cache: 处理结果缓存（None 表示使用共享缓存）
+    """
+    options = options if options is not None else ImageOptions()
+    cache = cache if cache is not None else get_image_cache()
+    abs_path = os.path.abspath(image_path)
+
+    try:
+        # 只读取文件头；命中缓存时不需要解码整个图片
+        image = Image.open(abs_path)
+    except UnidentifiedImageError:
+        raise ValueError(f"无法识别的图片格式: {image_path}")
+
+    with image:
+        display_width, display_height = display_size(image, width, height)
+        size = _target_pixels(image, display_width, options.max_dpi)
+        output_format = _output_format(image.format, options)
+        dpi = _output_dpi(image, size, options)
+        info = {
+            "source_format": image.format,
+            "format": output_format,
+            "original_pixels": [image.width, image.height],
+            "pixels": list(size or image.size),
+            "original_bytes": os.path.getsize(abs_path)
+        }
+
+        # 键包含所有影响输出内容的参数（同一像素尺寸可能来自不同的 max_dpi，写入的分辨率不同）
+        digest = cache.source_digest(abs_path)
+        key = hashlib.blake2b(
+            f"{PREP_VERSION}:{digest}:{size}:{dpi}:{output_format}:{options.jpeg_quality}:{options.optimize}"
+            .encode("ascii"),
+            digest_size=16
+        ).hexdigest()
+        extension = _EXTENSIONS[output_format]
+        blob = cache.get(key, extension)
+        info["cached"] = blob is not None
+        if blob is None:
+            blob = _encode(image, output_format, size, dpi, options)
+            if (size is None and image.format == output_format.upper()
+                    and len(blob) >= info["original_bytes"]):
+                # 未缩小、格式不变且重新编码后没有变小时，保留原图
+                with open(abs_path, "rb") as f:
+                    blob = f.read()
+            cache.put(key, extension, blob)
+
+    info["bytes"] = len(blob)
+    return PreparedImage(blob, display_width, display_height, info)
+
+
+_shared_image_cache: Optional[ImageCache] = None
+_shared_image_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> ImageCache:
+    """获取共享的图片预处理缓存（目录由 DOC_MCP_IMAGE_CACHE_DIR 配置）"""
+    global _shared_image_cache
+    with _shared_image_cache_lock:
+        if _shared_image_cache is None:
+            _shared_image_cache = ImageCache(config.IMAGE_CACHE_DIR)
+        return _shared_image_cache
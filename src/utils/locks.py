@@ -0,0 +1,110 @@
+"""文档级并发控制 - 按文件路径的 asyncio 读写锁"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator
+
+
+class AsyncRWLock:
+    """asyncio 读写锁
+
+    多个读者可以同时持有锁；写者独占。写者优先：有写者排队时新的读者需要等待，
+    避免连续的只读调用让写请求饿死。
+    """
+
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    async def acquire_read(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: not self._writer and self._waiting_writers == 0)
+            self._readers += 1
+
+    async def release_read(self) -> None:
+        async with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    async def acquire_write(self) -> None:
+        async with self._cond:
+            self._waiting_writers += 1
+            try:
+                await self._cond.wait_for(lambda: not self._writer and self._readers == 0)
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+
+    async def release_write(self) -> None:
+        async with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator[None]:
+        """以共享模式持有锁"""
+        await self.acquire_read()
+        try:
+            yield
+        finally:
+            await self.release_read()
+
+    @asynccontextmanager
+    async def write(self) -> AsyncIterator[None]:
+        """以独占模式持有锁"""
+        await self.acquire_write()
+        try:
+            yield
+        finally:
+            await self.release_write()
+
+
+class DocumentLockRegistry:
+    """按绝对路径管理读写锁
+
+    不同文件的锁互不影响；锁在没有持有者和等待者时自动从注册表中移除，
+    注册表大小只与正在被访问的文件数有关。
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, AsyncRWLock] = {}
+        self._refcounts: Dict[str, int] = {}
+
+    def _checkout(self, abs_path: str) -> AsyncRWLock:
+        lock = self._locks.get(abs_path)
+        if lock is None:
+            lock = self._locks[abs_path] = AsyncRWLock()
+        self._refcounts[abs_path] = self._refcounts.get(abs_path, 0) + 1
+        return lock
+
+    def _checkin(self, abs_path: str) -> None:
+        remaining = self._refcounts[abs_path] - 1
+        if remaining:
+            self._refcounts[abs_path] = remaining
+        else:
+            del self._refcounts[abs_path]
+            del self._locks[abs_path]
+
+    @asynccontextmanager
+    async def acquire(self, abs_path: str, exclusive: bool) -> AsyncIterator[None]:
+        """获取指定文件的锁
+
+        参数:
+            abs_path: 文件绝对路径
+            exclusive: True 为写锁（独占），False 为读锁（共享）
+        """
+        lock = self._checkout(abs_path)
+        try:
+            async with (lock.write() if exclusive else lock.read()):
+                yield
+        finally:
+            self._checkin(abs_path)
+
+    def stats(self) -> Dict[str, Any]:
+        """锁注册表统计信息"""
+        return {
+            "active_documents": len(self._locks),
+            "in_flight": sum(self._refcounts.values())
+        }
@@ -0,0 +1,765 @@
+"""文档包读写 - 按部件保存，未修改的部件直接复制原有的压缩数据
+
+``doc.save`` 每次都会重新序列化并重新压缩全部部件，包括体积很大的图片等媒体文件。
+这里在打开文档时记录源文件中各个 zip 成员的信息，保存时逐个部件判断：
+
+- 二进制部件（图片、字体、嵌入对象等）仍是打开时读入的同一个对象，或者
+- 部件内容（XML 部件为序列化结果）与源文件中成员的大小和 CRC32 一致，
+
+则把源文件中的压缩数据（连同 CRC）原样复制到新文件，不再解压和重新压缩；
+只有真正变化的部件重新编码。输出的部件、关系和内容类型与 ``doc.save`` 一致。
+
+打开文档时只读取 XML 部件；图片、字体、嵌入对象等二进制部件只记录位置，
+第一次访问其内容时才从文件中解压（``open_document``）。从未被访问的部件在保存时
+直接复制压缩数据，整个过程中不会进入内存。
+
+重新编码的部件按 ``CompressionPolicy`` 选择压缩级别：XML、已压缩的媒体（PNG/JPEG 等，
+默认不再压缩）和其他二进制部件分别设置。频繁保存时可以用 fast 级别，
+关闭文档时再用 ``recompress_package`` 按最终级别重新压缩整个文件。
+
+较大的部件（如几十 MB 的 ``document.xml``）按固定大小分块，在线程池中并行 deflate
+（zlib 压缩时释放 GIL），每块以上一块末尾 32 KB 作为预置字典，块之间用 sync flush 衔接，
+拼接结果是一个完整的 deflate 流。多个部件的压缩也会同时进行，写出顺序不变。
+"""
+import inspect
+import os
+import shutil
+import struct
+import threading
+import time
+import weakref
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, Deque, Dict, IO, Iterable, List, Optional, Tuple
+from lxml import etree
+from docx import Document
+from docx.document import Document as DocumentObject
+from docx.opc.constants import CONTENT_TYPE as CT
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from docx.opc.part import Part, PartFactory, XmlPart
+from docx.opc.pkgwriter import _ContentTypesItem
+from docx.package import Package
+from . import config
+from .error_handler import DocxError
+
+try:
+    # 延迟加载依赖 python-docx 的内部接口，不可用时 open_document 退回 Document(abs_path)
+    from docx.opc.package import Unmarshaller
+    from docx.opc.phys_pkg import _ZipPkgReader
+    from docx.opc.pkgreader import PackageReader, _ContentTypeMap
+except ImportError:
+    Unmarshaller = _ZipPkgReader = PackageReader = _ContentTypeMap = None
+
+# 复制压缩数据时每次读取的字节数
+_COPY_CHUNK = 1024 * 1024
+
+# 并行压缩：每块的大小、作为下一块预置字典的窗口大小，
+# 小于该大小的成员直接压缩，已提交但尚未写出的成员总大小上限
+_DEFLATE_CHUNK = 1024 * 1024
+_DEFLATE_WINDOW = 32 * 1024
+_PARALLEL_MIN_BYTES = 256 * 1024
+_MAX_PENDING_BYTES = 64 * 1024 * 1024
+
+# zip 本地文件头：签名、版本、标志、压缩方式、时间、日期、CRC、压缩后大小、原始大小、文件名长度、扩展字段长度
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+# 直接写入已压缩数据时用到的 ZipFile 内部属性（标准库没有公开的接口）
+_ZIPFILE_INTERNALS = ("_lock", "_seekable", "_writing", "_didModify", "start_dir", "fp")
+
+# 压缩级别名称 -> (压缩方式, zlib 压缩级别)
+COMPRESSION_LEVELS = {
+    "stored": (zipfile.ZIP_STORED, None),
+    "fast": (zipfile.ZIP_DEFLATED, 1),
+    "default": (zipfile.ZIP_DEFLATED, 6),
+    "max": (zipfile.ZIP_DEFLATED, 9),
+}
+
+# 本身已经压缩过的媒体类型（再做 deflate 几乎不能减小体积）
+_COMPRESSED_MEDIA_TYPES = frozenset({
+    "image/png", "image/jpeg", "image/gif", "image/webp", "image/jp2", "image/heic",
+    "application/zip", "application/x-zip-compressed",
+})
+_COMPRESSED_MEDIA_PREFIXES = ("audio/", "video/")
+
+_CT_NS = "{http://schemas.openxmlformats.org/package/2006/content-types}"
+_XML_CONTENT_TYPE = "application/xml"
+
+
+def content_category(content_type: str) -> str:
+    """部件内容类型的分类：xml、media（已压缩的媒体）或 other"""
+    content_type = (content_type or "").lower()
+    if content_type.endswith("+xml") or content_type.endswith("/xml"):
+        return "xml"
+    if content_type in _COMPRESSED_MEDIA_TYPES or content_type.startswith(_COMPRESSED_MEDIA_PREFIXES):
+        return "media"
+    return "other"
+
+
+def _check_level(level: str) -> str:
+    if level not in COMPRESSION_LEVELS:
+        raise ValueError(f"无效的压缩级别: {level}，可选值: {', '.join(COMPRESSION_LEVELS)}")
+    return level
+
+
+class CompressionPolicy:
+    """按部件类型选择 zip 压缩级别
+
+    参数:
+        xml: XML 部件（含关系和内容类型）的压缩级别
+        media: 已压缩媒体（PNG/JPEG/GIF/WebP、音视频）的压缩级别
+        other: 其他二进制部件（EMF/WMF、字体、嵌入对象等）的压缩级别
+        final: 关闭文档时重新压缩整个文件的级别（None 表示不重新压缩）
+    """
+    __slots__ = ("xml", "media", "other", "final")
+
+    def __init__(self, xml: str = "default", media: str = "stored", other: str = "default",
+                 final: Optional[str] = None):
+        self.xml = _check_level(xml)
+        self.media = _check_level(media)
+        self.other = _check_level(other)
+        self.final = _check_level(final) if final else None
+
+    @classmethod
+    def from_config(cls) -> "CompressionPolicy":
+        """按 DOC_MCP_COMPRESSION_* 环境变量创建"""
+        final = config.COMPRESSION_FINAL if config.COMPRESSION_FINAL != "none" else None
+        return cls(config.COMPRESSION_XML, config.COMPRESSION_MEDIA, config.COMPRESSION_OTHER, final)
+
+    def level_for(self, content_type: str, final: bool = False) -> Tuple[int, Optional[int]]:
+        """部件的 (压缩方式, 压缩级别)；final=True 时可压缩的部件使用最终级别"""
+        level = getattr(self, content_category(content_type))
+        if final and self.final is not None and level != "stored":
+            level = self.final
+        return COMPRESSION_LEVELS[level]
+
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        return {"xml": self.xml, "media": self.media, "other": self.other, "final": self.final}
+
+
+DEFAULT_POLICY = CompressionPolicy()
+
+
+def _signature(abs_path: str) -> Tuple[int, int, int]:
+    st = os.stat(abs_path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class PackageSource:
+    """文档打开（或上次保存）时对应的磁盘文件及其 zip 成员
+
+    参数:
+        path: 文件绝对路径
+        members: 成员名 -> ZipInfo
+        blobs: 部件名 -> 打开时读入的二进制部件内容（按对象判断是否被替换）
+    """
+    __slots__ = ("path", "signature", "members", "blobs")
+
+    def __init__(self, path: str, members: Dict[str, zipfile.ZipInfo], blobs: Dict[str, bytes]):
+        self.path = path
+        self.signature = _signature(path)
+        self.members = members
+        self.blobs = blobs
+
+    def is_current(self) -> bool:
+        """源文件是否仍是记录时的内容"""
+        try:
+            return _signature(self.path) == self.signature
+        except OSError:
+            return False
+
+
+# 文档包 -> 源文件记录（文档对象释放后自动移除）
+_sources: "weakref.WeakKeyDictionary[Any, PackageSource]" = weakref.WeakKeyDictionary()
+_sources_lock = threading.Lock()
+
+
+class _LazyBlob:
+    """二进制部件的延迟加载：第一次访问 ``_blob`` 时才从文档文件中读取"""
+
+    @property
+    def _blob(self) -> bytes:
+        blob = self.__dict__.get("_lazy_blob")
+        if blob is None:
+            # 部分部件类（如 ImagePart）不保存所属的包，这里使用加载时记录的包
+            package = self.__dict__["_lazy_package"]()
+            blob = self.__dict__["_lazy_blob"] = _read_members(package, [self.partname.membername])[0]
+        return blob
+
+    @_blob.setter
+    def _blob(self, value: bytes) -> None:
+        self.__dict__["_lazy_blob"] = value
+
+
+# 部件类 -> 对应的延迟加载子类
+_lazy_classes: Dict[type, type] = {}
+
+
+def _make_lazy(part, package) -> None:
+    cls = type(part)
+    lazy_cls = _lazy_classes.get(cls)
+    if lazy_cls is None:
+        lazy_cls = _lazy_classes.setdefault(cls, type(f"Lazy{cls.__name__}", (_LazyBlob, cls), {}))
+    part.__class__ = lazy_cls
+    part.__dict__.pop("_blob", None)
+    part.__dict__.pop("_lazy_blob", None)
+    part.__dict__["_lazy_package"] = weakref.ref(package)
+
+
+def is_unloaded(part) -> bool:
+    """部件内容是否仍未从文件中读取"""
+    return isinstance(part, _LazyBlob) and "_lazy_blob" not in part.__dict__
+
+
+def _read_members(package, names: List[str]) -> List[bytes]:
+    """从源文件中读取成员，并记为打开时的内容（保存时按对象判断是否被替换）"""
+    with _sources_lock:
+        source = _sources.get(package) if package is not None else None
+    infos = [source.members.get(name) if source is not None else None for name in names]
+    for name, info in zip(names, infos):
+        if info is None or not source.is_current():
+            raise DocxError(f"文档文件已被外部修改，无法读取尚未加载的部件: {name}，请重新打开文档")
+    with zipfile.ZipFile(source.path) as archive:
+        blobs = [archive.read(info) for info in infos]
+    with _sources_lock:
+        for name, blob in zip(names, blobs):
+            source.blobs.setdefault(f"/{name}", blob)
+    return blobs
+
+
+def load_parts(doc: DocumentObject) -> int:
+    """读取全部尚未加载的二进制部件，之后保存文档不再依赖源文件中的数据
+
+    文档有尚未写入磁盘的修改时调用：源文件之后即使被外部替换或改写，这些修改仍然可以保存。
+
+    返回:
+        本次读取的部件数
+    """
+    package = doc.part.package
+    parts = [part for part in package.iter_parts() if is_unloaded(part)]
+    if parts:
+        blobs = _read_members(package, [part.partname.membername for part in parts])
+        for part, blob in zip(parts, blobs):
+            part._blob = blob
+    return len(parts)
+
+
+def _binary_blobs(package) -> Dict[str, bytes]:
+    return {
+        str(part.partname): part._blob
+        for part in package.iter_parts()
+        if not isinstance(part, XmlPart) and not is_unloaded(part)
+    }
+
+
+def _remember_source(doc: DocumentObject, abs_path: str, members: Dict[str, zipfile.ZipInfo]) -> None:
+    package = doc.part.package
+    source = PackageSource(abs_path, members, _binary_blobs(package))
+    with _sources_lock:
+        _sources[package] = source
+
+
+# 延迟加载用到的 python-docx 内部接口及其参数（与已测试的 1.1/1.2 版本一致）
+_LAZY_LOADING_INTERFACES = (
+    ("PackageReader", "_srels_for", ("phys_reader", "source_uri")),
+    ("PackageReader", "_load_serialized_parts", ("phys_reader", "pkg_srels", "content_types")),
+    ("PackageReader", "__init__", ("self", "content_types", "pkg_srels", "sparts")),
+    ("_ZipPkgReader", "__init__", ("self", "pkg_file")),
+    ("_ZipPkgReader", "blob_for", ("self", "pack_uri")),
+    ("_ZipPkgReader", "rels_xml_for", ("self", "source_uri")),
+    ("_ContentTypeMap", "from_xml", ("content_types_xml",)),
+    ("Unmarshaller", "unmarshal", ("pkg_reader", "package", "part_factory")),
+    ("Part", "__init__", ("self", "partname", "content_type", "blob", "package")),
+)
+
+
+@lru_cache(maxsize=None)
+def lazy_loading_supported() -> bool:
+    """当前安装的 python-docx 是否提供延迟加载二进制部件所需的内部接口
+
+    按名称和参数逐一检查；任一项缺失或签名不同（如 python-docx 升级后内部实现变化）时
+    ``open_document`` 改用 ``Document(abs_path)`` 完整加载，保存时仍会复制未修改部件的压缩数据。
+    """
+    owners = {
+        "PackageReader": PackageReader, "_ZipPkgReader": _ZipPkgReader,
+        "_ContentTypeMap": _ContentTypeMap, "Unmarshaller": Unmarshaller, "Part": Part
+    }
+    for owner_name, name, parameters in _LAZY_LOADING_INTERFACES:
+        func = getattr(owners[owner_name], name, None)
+        if func is None:
+            return False
+        try:
+            if tuple(inspect.signature(func).parameters) != parameters:
+                return False
+        except (TypeError, ValueError):
+            return False
+    return (callable(getattr(_ZipPkgReader, "close", None))
+            and hasattr(PartFactory, "part_type_for") and hasattr(PartFactory, "default_part_type"))
+
+
+class _LazyZipReader(_ZipPkgReader or object):
+    """只读取 XML 部件的 zip 读取器：二进制部件返回空内容，并记录下来留待按需加载"""
+
+    def __new__(cls, pkg_file: str):
+        # PhysPkgReader.__new__ 按文件类型选择读取器类，这里直接创建本类实例
+        return object.__new__(cls)
+
+    def __init__(self, pkg_file: str):
+        super().__init__(pkg_file)
+        self.members = {info.filename: info for info in self._zipf.infolist()}
+        self._content_type_of = _member_content_types(self._zipf)
+        self.deferred = set()
+
+    def _is_binary(self, name: str) -> bool:
+        content_type = self._content_type_of(name)
+        part_class = PartFactory.part_type_for.get(content_type, PartFactory.default_part_type)
+        return content_category(content_type) != "xml" and not issubclass(part_class, XmlPart)
+
+    def blob_for(self, pack_uri):
+        name = pack_uri.membername
+        if name in self.members and self._is_binary(name):
+            self.deferred.add(name)
+            return b""
+        return super().blob_for(pack_uri)
+
+    @property
+    def content_types_xml(self):
+        return self._zipf.read(CONTENT_TYPES_URI.membername)
+
+    def rels_xml_for(self, source_uri):
+        try:
+            return self._zipf.read(source_uri.rels_uri.membername)
+        except KeyError:
+            return None
+
+
+def open_document(abs_path: str) -> DocumentObject:
+    """打开文档（二进制部件延迟加载），并记录源文件的 zip 成员以便保存时复制未修改的部件
+
+    与 ``docx.Document(abs_path)`` 得到相同的对象模型。python-docx 不提供延迟加载所需的
+    内部接口时（见 ``lazy_loading_supported``）完整加载文档。
+    """
+    if not zipfile.is_zipfile(abs_path):
+        # 交给 python-docx 给出一致的错误信息
+        return Document(abs_path)
+    if not lazy_loading_supported():
+        return _open_fully(abs_path)
+
+    reader = _LazyZipReader(abs_path)
+    try:
+        content_types = _ContentTypeMap.from_xml(reader.content_types_xml)
+        pkg_srels = PackageReader._srels_for(reader, PACKAGE_URI)
+        sparts = PackageReader._load_serialized_parts(reader, pkg_srels, content_types)
+    finally:
+        reader.close()
+
+    package = Package()
+    Unmarshaller.unmarshal(PackageReader(content_types, pkg_srels, sparts), package, PartFactory)
+    document_part = package.main_document_part
+    if document_part.content_type != CT.WML_DOCUMENT_MAIN:
+        raise ValueError(f"file '{abs_path}' is not a Word file, "
+                         f"content type is '{document_part.content_type}'")
+
+    deferred = [part for part in package.iter_parts() if part.partname.membername in reader.deferred]
+    if any("_blob" not in part.__dict__ for part in deferred):
+        # 部件类不在实例的 _blob 中保存内容时无法按需加载，改为完整加载
+        return _open_fully(abs_path)
+    for part in deferred:
+        _make_lazy(part, package)
+    doc = document_part.document
+    _remember_source(doc, abs_path, reader.members)
+    return doc
+
+
+def _open_fully(abs_path: str) -> DocumentObject:
+    """用 ``Document(abs_path)`` 完整加载文档，同样记录源文件的 zip 成员（保存时按 CRC 复制未修改的部件）"""
+    with zipfile.ZipFile(abs_path) as archive:
+        members = {info.filename: info for info in archive.infolist()}
+    doc = Document(abs_path)
+    _remember_source(doc, abs_path, members)
+    return doc
+
+
+def _source_for(doc: DocumentObject) -> Optional[PackageSource]:
+    with _sources_lock:
+        source = _sources.get(doc.part.package)
+    if source is not None and source.is_current():
+        return source
+    return None
+
+
+class SaveStats:
+    """保存统计（原样复制和重新压缩的成员数、字节数）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._saves = 0
+        self._copied = 0
+        self._copied_bytes = 0
+        self._written = 0
+        self._written_bytes = 0
+
+    def record(self, copied: int, copied_bytes: int, written: int, written_bytes: int) -> None:
+        with self._lock:
+            self._saves += 1
+            self._copied += copied
+            self._copied_bytes += copied_bytes
+            self._written += written
+            self._written_bytes += written_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "saves": self._saves,
+                "copied_members": self._copied,
+                "copied_bytes": self._copied_bytes,
+                "written_members": self._written,
+                "written_bytes": self._written_bytes
+            }
+
+
+save_stats = SaveStats()
+
+
+_compression_pools: Dict[int, ThreadPoolExecutor] = {}
+_compression_pools_lock = threading.Lock()
+
+
+def compression_pool(workers: int) -> Optional[ThreadPoolExecutor]:
+    """共享的压缩线程池（workers 不大于1时返回None，表示在当前线程中压缩）"""
+    if workers <= 1:
+        return None
+    with _compression_pools_lock:
+        pool = _compression_pools.get(workers)
+        if pool is None:
+            pool = _compression_pools[workers] = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="doc-mcp-deflate")
+        return pool
+
+
+def _raw_append_supported(archive: zipfile.ZipFile) -> bool:
+    """当前的 zipfile 实现是否提供直接写入已压缩数据所需的内部属性
+
+    不满足时（如标准库的实现发生变化）退回公开接口：复制的成员解压后重新压缩写入，
+    较大的成员也不再分块并行压缩，而是用 ZipFile.writestr 在当前线程中压缩。
+    """
+    return (all(hasattr(archive, name) for name in _ZIPFILE_INTERNALS)
+            and callable(getattr(zipfile.ZipInfo, "FileHeader", None)))
+
+
+def _deflate_chunk(data: memoryview, start: int, end: int, level: int) -> bytes:
+    """压缩 data[start:end]，以前 32 KB 作为预置字典；最后一块结束 deflate 流，其余块以 sync flush 结尾"""
+    window = data[max(0, start - _DEFLATE_WINDOW):start]
+    if len(window):
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=window)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    last = end >= len(data)
+    return compressor.compress(data[start:end]) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def deflate_parallel(blob: bytes, level: int, pool: ThreadPoolExecutor,
+                     chunk_size: int = _DEFLATE_CHUNK) -> Tuple["Future[int]", List["Future[bytes]"]]:
+    """把 blob 分块提交到线程池压缩为原始 deflate 数据
+
+    返回:
+        (CRC32 的 Future, 按顺序排列的各块压缩数据的 Future)，各块数据依次拼接即为完整的 deflate 流
+    """
+    data = memoryview(blob)
+    crc = pool.submit(zlib.crc32, data)
+    chunks = [
+        pool.submit(_deflate_chunk, data, start, min(start + chunk_size, len(data)), level)
+        for start in range(0, max(len(data), 1), chunk_size)
+    ]
+    return crc, chunks
+
+
+class _PackageZipWriter:
+    """写出 zip 成员：未变化的成员从源文件复制压缩数据，其余成员重新压缩
+
+    指定 pool 时较大的成员在线程池中并行压缩；成员仍按调用 write/copy 的顺序写出。
+    """
+
+    def __init__(self, stream: IO[bytes], source: Optional[PackageSource],
+                 policy: CompressionPolicy = DEFAULT_POLICY, final: bool = False,
+                 pool: Optional[ThreadPoolExecutor] = None, record_stats: bool = True):
+        self._zip = zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED)
+        self._source = source
+        self._policy = policy
+        self._final = final
+        self._pool = pool
+        self._record_stats = record_stats
+        self._source_file = open(source.path, "rb") if source is not None else None
+        self._source_zip: Optional[zipfile.ZipFile] = None
+        self._raw_append = _raw_append_supported(self._zip)
+        # 等待写出的成员：(写出操作, 占用的字节数)
+        self._pending: Deque[Tuple[Callable[[], None], int]] = deque()
+        self._pending_bytes = 0
+        self.copied = 0
+        self.copied_bytes = 0
+        self.written = 0
+        self.written_bytes = 0
+
+    def _unchanged(self, name: str, blob: bytes) -> Optional[zipfile.ZipInfo]:
+        """blob 与源文件中同名成员内容一致时返回该成员"""
+        if self._source is None:
+            return None
+        info = self._source.members.get(name)
+        if info is None or info.file_size != len(blob) or info.CRC != zlib.crc32(blob):
+            return None
+        return info
+
+    def write(self, name: str, blob: bytes, content_type: str = _XML_CONTENT_TYPE,
+              original: Optional[bytes] = None) -> None:
+        """写出成员
+
+        参数:
+            name: 成员名
+            blob: 成员内容
+            content_type: 内容类型（决定重新压缩时的压缩级别）
+            original: 打开时读入的内容（blob 是同一个对象时无需比较 CRC）
+        """
+        info = None
+        if self._source is not None and original is not None and blob is original:
+            info = self._source.members.get(name)
+        if info is None:
+            info = self._unchanged(name, blob)
+        if info is not None and info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            self._enqueue(partial(self._copy_raw, info))
+            return
+        compress_type, level = self._policy.level_for(content_type, self._final)
+        if (self._pool is not None and self._raw_append and compress_type == zipfile.ZIP_DEFLATED
+                and len(blob) >= _PARALLEL_MIN_BYTES):
+            # 分块压缩的结果只能直接写入；不支持时按普通方式在当前线程中压缩
+            crc, chunks = deflate_parallel(blob, level, self._pool)
+            self._enqueue(partial(self._write_deflated, name, len(blob), crc, chunks), len(blob))
+        else:
+            self._enqueue(partial(self._writestr, name, blob, compress_type, level))
+
+    def copy(self, name: str) -> bool:
+        """从源文件原样复制成员，源文件中没有该成员时返回False"""
+        info = self._source.members.get(name) if self._source is not None else None
+        if info is None or info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            return False
+        self._enqueue(partial(self._copy_raw, info))
+        return True
+
+    def _enqueue(self, action: Callable[[], None], size: int = 0) -> None:
+        """按顺序写出成员：前面还有成员在压缩时排队，排队的数据过多时等待前面的成员写出"""
+        if not self._pending and size == 0:
+            action()
+            return
+        self._pending.append((action, size))
+        self._pending_bytes += size
+        while self._pending and self._pending_bytes > _MAX_PENDING_BYTES:
+            self._write_next()
+
+    def _write_next(self) -> None:
+        action, size = self._pending.popleft()
+        try:
+            action()
+        finally:
+            self._pending_bytes -= size
+
+    def _writestr(self, name: str, blob: bytes, compress_type: int, level: Optional[int]) -> None:
+        self._zip.writestr(name, blob, compress_type=compress_type, compresslevel=level)
+        self.written += 1
+        self.written_bytes += len(blob)
+
+    def _write_deflated(self, name: str, size: int, crc: "Future[int]",
+                        chunks: List["Future[bytes]"]) -> None:
+        """写出在线程池中压缩好的成员"""
+        data = [chunk.result() for chunk in chunks]
+        zinfo = zipfile.ZipInfo(name, time.localtime(time.time())[:6])
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        zinfo.external_attr = 0o600 << 16
+        zinfo.CRC = crc.result()
+        zinfo.file_size = size
+        zinfo.compress_size = sum(len(chunk) for chunk in data)
+        self._append_member(zinfo, data)
+        self.written += 1
+        self.written_bytes += size
+
+    def _copy_raw(self, info: zipfile.ZipInfo) -> None:
+        """把源文件中成员的压缩数据原样写入（不解压）"""
+        if not self._raw_append:
+            self._copy_recompressed(info)
+            return
+        src = self._source_file
+        src.seek(info.header_offset)
+        header = src.read(_LOCAL_HEADER.size)
+        if len(header) != _LOCAL_HEADER.size:
+            raise zipfile.BadZipFile(f"zip成员的本地文件头不完整: {info.filename}")
+        fields = _LOCAL_HEADER.unpack(header)
+        if fields[0] != _LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f"zip成员的本地文件头无效: {info.filename}")
+        # 跳过文件名和扩展字段
+        src.seek(fields[10] + fields[11], 1)
+
+        zinfo = zipfile.ZipInfo(info.filename, info.date_time)
+        zinfo.compress_type = info.compress_type
+        zinfo.external_attr = info.external_attr
+        zinfo.CRC = info.CRC
+        zinfo.file_size = info.file_size
+        zinfo.compress_size = info.compress_size
+        self._append_member(zinfo, self._read_source(info))
+        self.copied += 1
+        self.copied_bytes += info.file_size
+
+    def _copy_recompressed(self, info: zipfile.ZipInfo) -> None:
+        """无法直接写入压缩数据时，经公开接口解压源成员并按原压缩方式重新写入（逐块进行）"""
+        if self._source_zip is None:
+            self._source_zip = zipfile.ZipFile(self._source_file)
+        zinfo = zipfile.ZipInfo(info.filename, info.date_time)
+        zinfo.compress_type = info.compress_type
+        zinfo.external_attr = info.external_attr
+        # 预先给出原始大小，超过 4 GB 时 ZipFile.open 才会写出 ZIP64 头
+        zinfo.file_size = info.file_size
+        with self._source_zip.open(info) as src, self._zip.open(zinfo, "w") as dst:
+            shutil.copyfileobj(src, dst, _COPY_CHUNK)
+        self.written += 1
+        self.written_bytes += info.file_size
+
+    def _read_source(self, info: zipfile.ZipInfo) -> Iterable[bytes]:
+        """逐块读取源文件中成员的压缩数据（文件位置已在数据开头）"""
+        remaining = info.compress_size
+        while remaining > 0:
+            chunk = self._source_file.read(min(_COPY_CHUNK, remaining))
+            if not chunk:
+                raise zipfile.BadZipFile(f"zip成员的数据不完整: {info.filename}")
+            yield chunk
+            remaining -= len(chunk)
+
+    def _append_member(self, zinfo: zipfile.ZipInfo, data: Iterable[bytes]) -> None:
+        """写入本地文件头和已压缩的数据（zinfo 中的 CRC 和大小须已填好）
+
+        与 ZipFile.writestr 写完一个成员后的状态保持一致，仅在 ``_raw_append_supported`` 时使用。
+        """
+        zip64 = (zinfo.file_size > zipfile.ZIP64_LIMIT
+                 or zinfo.compress_size > zipfile.ZIP64_LIMIT)
+        zf = self._zip
+        with zf._lock:
+            if zf._writing:
+                raise ValueError("zip 中还有尚未关闭的写入句柄")
+            if zf._seekable:
+                zf.fp.seek(zf.start_dir)
+            zinfo.header_offset = zf.fp.tell()
+            zf.fp.write(zinfo.FileHeader(zip64))
+            for chunk in data:
+                zf.fp.write(chunk)
+            zf.filelist.append(zinfo)
+            zf.NameToInfo[zinfo.filename] = zinfo
+            zf.start_dir = zf.fp.tell()
+            zf._didModify = True
+
+    def close(self) -> List[zipfile.ZipInfo]:
+        """完成写入，返回写出的全部成员"""
+        try:
+            while self._pending:
+                self._write_next()
+        finally:
+            try:
+                self._zip.close()
+            finally:
+                if self._source_zip is not None:
+                    self._source_zip.close()
+                if self._source_file is not None:
+                    self._source_file.close()
+        if self._record_stats:
+            save_stats.record(self.copied, self.copied_bytes, self.written, self.written_bytes)
+        return self._zip.infolist()
+
+
+def save_package(doc: DocumentObject, stream: IO[bytes],
+                 policy: CompressionPolicy = DEFAULT_POLICY, workers: int = 1,
+                 record_stats: bool = True) -> List[zipfile.ZipInfo]:
+    """把文档保存到二进制流（与 doc.save 输出相同的部件，未修改的部件直接复制压缩数据）
+
+    参数:
+        doc: 文档对象
+        stream: 可写的二进制流
+        policy: 重新编码的部件使用的压缩策略
+        workers: 并行压缩的线程数（1 表示在当前线程中压缩）
+        record_stats: 是否计入保存统计（内存中的快照和副本不计入）
+
+    返回:
+        写出的 zip 成员列表
+    """
+    package = doc.part.package
+    source = _source_for(doc)
+    parts = package.parts
+    for part in parts:
+        part.before_marshal()
+
+    writer = _PackageZipWriter(stream, source, policy, pool=compression_pool(workers),
+                               record_stats=record_stats)
+    try:
+        writer.write(CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob)
+        writer.write(PACKAGE_URI.rels_uri.membername, package.rels.xml)
+        originals = source.blobs if source is not None else {}
+        for part in parts:
+            partname = str(part.partname)
+            if isinstance(part, XmlPart):
+                writer.write(part.partname.membername, part.blob, part.content_type)
+            elif is_unloaded(part) and writer.copy(part.partname.membername):
+                # 从未读取过的部件直接复制压缩数据
+                pass
+            else:
+                writer.write(part.partname.membername, part.blob, part.content_type,
+                             originals.get(partname))
+            if len(part.rels):
+                writer.write(part.partname.rels_uri.membername, part.rels.xml)
+    finally:
+        members = writer.close()
+    return members
+
+
+def mark_saved(doc: DocumentObject, abs_path: str, members: List[zipfile.ZipInfo]) -> None:
+    """文档已保存到 abs_path：之后的保存以该文件为源复制未修改的部件"""
+    _remember_source(doc, abs_path, {info.filename: info for info in members})
+
+
+def _member_content_types(archive: zipfile.ZipFile) -> Callable[[str], str]:
+    """按 [Content_Types].xml 查找成员的内容类型"""
+    defaults, overrides = {}, {}
+    try:
+        root = etree.fromstring(archive.read(CONTENT_TYPES_URI.membername))
+    except (KeyError, etree.XMLSyntaxError):
+        root = None
+    if root is not None:
+        for item in root.iter(f"{_CT_NS}Default"):
+            defaults[item.get("Extension", "").lower()] = item.get("ContentType", "")
+        for item in root.iter(f"{_CT_NS}Override"):
+            overrides[item.get("PartName", "").lstrip("/").lower()] = item.get("ContentType", "")
+
+    def lookup(name: str) -> str:
+        if name.lower() in overrides:
+            return overrides[name.lower()]
+        if name == CONTENT_TYPES_URI.membername:
+            return _XML_CONTENT_TYPE
+        return defaults.get(name.rsplit(".", 1)[-1].lower(), "")
+    return lookup
+
+
+def recompress_package(src_path: str, stream: IO[bytes], policy: CompressionPolicy,
+                       workers: int = 1) -> List[zipfile.ZipInfo]:
+    """按最终压缩级别重新压缩整个文档包（成员顺序和内容不变）
+
+    参数:
+        src_path: 源文件路径
+        stream: 可写的二进制流
+        policy: 压缩策略（使用其中的最终级别）
+        workers: 并行压缩的线程数
+    """
+    with zipfile.ZipFile(src_path) as archive:
+        content_type_of = _member_content_types(archive)
+        writer = _PackageZipWriter(stream, None, policy, final=True, pool=compression_pool(workers))
+        try:
+            for info in archive.infolist():
+                writer.write(info.filename, archive.read(info), content_type_of(info.filename))
+        finally:
+            members = writer.close()
+    return members
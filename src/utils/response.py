@@ -0,0 +1,75 @@
+"""响应编码 - 把工具返回的字典序列化为 MCP 文本内容"""
+import json
+from typing import Any, Callable, List, Optional
+from . import config
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+
+def _encode_json(result: Any, indent: int) -> str:
+    if indent:
+        return json.dumps(result, ensure_ascii=False, indent=indent)
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+
+
+def _encode_orjson(result: Any, indent: int) -> str:
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(result, option=option).decode("utf-8")
+    except TypeError:
+        # orjson 不支持的类型（如超过64位的整数）交给标准库处理
+        return _encode_json(result, indent)
+
+
+def _select_encoder(backend: str, indent: int) -> Callable[[Any, int], str]:
+    if orjson is None or backend == "json":
+        return _encode_json
+    # orjson 只支持2空格缩进，其它缩进宽度使用标准库
+    if indent not in (0, 2):
+        return _encode_json
+    return _encode_orjson
+
+
+class ResponseEncoder:
+    """工具结果编码器
+
+    默认输出紧凑JSON（无缩进、无多余空格），安装了 orjson 时自动使用；
+    超过分块阈值的结果按顺序拆分为多个文本块，客户端按顺序拼接即可还原完整JSON。
+    """
+
+    def __init__(self, indent: int = 0, backend: str = "auto", chunk_size: int = 0):
+        self.indent = indent
+        self.backend = "orjson" if _select_encoder(backend, indent) is _encode_orjson else "json"
+        self.chunk_size = chunk_size
+        self._encode = _select_encoder(backend, indent)
+
+    def encode(self, result: Any) -> str:
+        """把结果序列化为JSON字符串"""
+        return self._encode(result, self.indent)
+
+    def encode_chunks(self, result: Any) -> List[str]:
+        """把结果序列化为一个或多个文本块"""
+        text = self.encode(result)
+        if not self.chunk_size or len(text) <= self.chunk_size:
+            return [text]
+        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+
+
+_shared_encoder: Optional[ResponseEncoder] = None
+
+
+def get_response_encoder() -> ResponseEncoder:
+    """获取按环境变量配置的共享编码器"""
+    global _shared_encoder
+    if _shared_encoder is None:
+        _shared_encoder = ResponseEncoder(
+            indent=config.JSON_INDENT,
+            backend=config.JSON_BACKEND,
+            chunk_size=config.RESPONSE_CHUNK_KB * 1024
+        )
+    return _shared_encoder
@@ -0,0 +1,331 @@
+"""全文检索索引 - 跨文档的字符二元组倒排索引
+
+中文文本没有空格分词，这里对每个由文字/数字组成的连续片段按字符二元组（bigram）建立倒排表，
+中英文统一处理。查询时先用倒排表求候选段落，再对候选段落做精确的子串/全字匹配，
+结果与逐段扫描一致。
+
+每个文档的索引以文件内容哈希为键持久化到磁盘；路径清单记录 (修改时间, 大小, inode, 哈希)，
+签名未变化的文件不需要重新读取，内容未变化的文件（如仅修改时间变化、复制的文件）不需要重新建立索引。
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from . import config
+from .text_stream import iter_body_blocks, iter_element_blocks
+
+INDEX_VERSION = 1
+
+_WORD_RUN = re.compile(r"\w+")
+
+
+def _bigrams(text: str) -> Iterator[str]:
+    """文本（已转小写）中每个连续文字片段的字符二元组"""
+    for match in _WORD_RUN.finditer(text):
+        run = match.group()
+        for i in range(len(run) - 1):
+            yield run[i:i + 2]
+
+
+def _file_digest(abs_path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(abs_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _signature(abs_path: str) -> List[int]:
+    st = os.stat(abs_path)
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def _write_json(path: str, data: Any) -> None:
+    """写入索引文件（临时文件 + 替换，避免并发读取到半个文件）"""
+    fd, tmp_path = tempfile.mkstemp(prefix=".~", suffix=".tmp", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class DocumentIndex:
+    """单个文档的倒排索引
+
+    条目为正文段落和表格单元格，位置分别为 {"paragraph_index"} 和
+    {"table_index", "row", "col"}，与 find_text / get_table_data 的索引一致。
+    """
+
+    def __init__(self, locations: List[Dict[str, int]], texts: List[str],
+                 postings: Dict[str, List[int]]):
+        self.locations = locations
+        self.texts = texts
+        self.postings = postings
+
+    @classmethod
+    def build(cls, blocks: Iterable[Tuple[str, Any]]) -> "DocumentIndex":
+        """从 iter_body_blocks / iter_element_blocks 的输出建立索引"""
+        locations: List[Dict[str, int]] = []
+        texts: List[str] = []
+        postings: Dict[str, List[int]] = {}
+
+        def add(location: Dict[str, int], text: str) -> None:
+            if not text.strip():
+                return
+            entry_id = len(texts)
+            locations.append(location)
+            texts.append(text)
+            for gram in set(_bigrams(text.lower())):
+                postings.setdefault(gram, []).append(entry_id)
+
+        paragraph_index = 0
+        table_index = 0
+        for kind, content in blocks:
+            if kind == "paragraph":
+                add({"paragraph_index": paragraph_index}, content)
+                paragraph_index += 1
+            else:
+                for row, cells in enumerate(content):
+                    for col, text in enumerate(cells):
+                        add({"table_index": table_index, "row": row, "col": col}, text)
+                table_index += 1
+        return cls(locations, texts, postings)
+
+    def candidates(self, grams: List[str]) -> Iterable[int]:
+        """包含全部查询二元组的条目（没有二元组时返回全部条目）"""
+        if not grams:
+            return range(len(self.texts))
+        lists = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+        if not lists[0]:
+            return ()
+        result = set(lists[0])
+        for ids in lists[1:]:
+            result.intersection_update(ids)
+            if not result:
+                return ()
+        return sorted(result)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "locations": self.locations,
+            "texts": self.texts,
+            "postings": self.postings
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> Optional["DocumentIndex"]:
+        if data.get("version") != INDEX_VERSION:
+            return None
+        return cls(data["locations"], data["texts"], data["postings"])
+
+
+class SearchIndex:
+    """多文档全文检索索引
+
+    参数:
+        index_dir: 索引持久化目录（None 表示只保存在内存中）
+    """
+
+    def __init__(self, index_dir: Optional[str] = None):
+        self._dir = index_dir
+        self._lock = threading.Lock()
+        # 绝对路径 -> [mtime_ns, size, inode, 内容哈希]
+        self._manifest: Dict[str, List] = {}
+        # 内容哈希 -> 文档索引
+        self._documents: Dict[str, DocumentIndex] = {}
+        self._manifest_loaded = False
+        self._manifest_dirty = False
+        self._indexed = 0
+        self._reused = 0
+        self._queries = 0
+
+    def _load_manifest(self) -> None:
+        if self._manifest_loaded:
+            return
+        self._manifest_loaded = True
+        if self._dir is None:
+            return
+        try:
+            with open(os.path.join(self._dir, "manifest.json"), encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self._manifest = data["documents"]
+        except (OSError, ValueError, KeyError):
+            # 清单缺失或损坏时从空清单开始，文档按需重新建立索引
+            self._manifest = {}
+
+    def _save_manifest(self) -> None:
+        if self._dir is None or not self._manifest_dirty:
+            return
+        os.makedirs(self._dir, exist_ok=True)
+        _write_json(os.path.join(self._dir, "manifest.json"),
+                    {"version": INDEX_VERSION, "documents": self._manifest})
+        self._manifest_dirty = False
+
+    def _load_document(self, digest: str) -> Optional[DocumentIndex]:
+        index = self._documents.get(digest)
+        if index is not None or self._dir is None:
+            return index
+        try:
+            with open(os.path.join(self._dir, f"{digest}.json"), encoding="utf-8") as f:
+                index = DocumentIndex.from_json(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+        if index is not None:
+            self._documents[digest] = index
+        return index
+
+    def _store_document(self, digest: str, index: DocumentIndex) -> None:
+        self._documents[digest] = index
+        if self._dir is None:
+            return
+        try:
+            os.makedirs(self._dir, exist_ok=True)
+            _write_json(os.path.join(self._dir, f"{digest}.json"), index.to_json())
+        except OSError:
+            # 索引目录不可写时只保留内存中的索引
+            pass
+
+    def _forget(self, digest: str) -> None:
+        """删除不再被任何路径引用的文档索引"""
+        if any(entry[3] == digest for entry in self._manifest.values()):
+            return
+        self._documents.pop(digest, None)
+        if self._dir is not None:
+            try:
+                os.unlink(os.path.join(self._dir, f"{digest}.json"))
+            except OSError:
+                pass
+
+    def document(self, abs_path: str) -> DocumentIndex:
+        """获取文档的索引，文件变化时才重新建立"""
+        signature = _signature(abs_path)
+        with self._lock:
+            self._load_manifest()
+            entry = self._manifest.get(abs_path)
+            if entry is not None and entry[:3] == signature:
+                index = self._load_document(entry[3])
+                if index is not None:
+                    self._reused += 1
+                    return index
+
+        # 文件签名变化：按内容哈希查找已有索引，内容也变化时才重新解析
+        digest = _file_digest(abs_path)
+        with self._lock:
+            index = self._load_document(digest)
+        if index is None:
+            index = DocumentIndex.build(iter_body_blocks(abs_path))
+
+        with self._lock:
+            if digest in self._documents:
+                self._reused += 1
+            else:
+                self._indexed += 1
+                self._store_document(digest, index)
+            previous = self._manifest.get(abs_path)
+            self._manifest[abs_path] = signature + [digest]
+            self._manifest_dirty = True
+            if previous is not None and previous[3] != digest:
+                self._forget(previous[3])
+        return index
+
+    def search(self, paths: List[str], query: str, match_case: bool = False,
+               whole_word: bool = False, max_results: int = 100,
+               documents: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """在多个文档中查找文本
+
+        参数:
+            paths: 文档绝对路径列表
+            query: 要查找的文本
+            match_case: 是否区分大小写
+            whole_word: 是否全字匹配
+            max_results: 最多返回的匹配条目数
+            documents: 有未落盘修改的文档（路径 -> Document），直接按内存内容临时建立索引
+        """
+        started_at = time.perf_counter()
+        needle = query if match_case else query.lower()
+        pattern = re.compile(r'\b' + re.escape(needle) + r'\b') if whole_word else None
+        grams = sorted(set(_bigrams(query.lower())))
+        documents = documents or {}
+
+        results = []
+        errors = []
+        total_occurrences = 0
+        truncated = False
+        for abs_path in paths:
+            try:
+                if abs_path in documents:
+                    index = DocumentIndex.build(iter_element_blocks(documents[abs_path].element.body))
+                else:
+                    index = self.document(abs_path)
+            except Exception as e:
+                errors.append({"filename": abs_path, "error": type(e).__name__, "message": str(e)})
+                continue
+
+            for entry_id in index.candidates(grams):
+                text = index.texts[entry_id]
+                haystack = text if match_case else text.lower()
+                if pattern is not None:
+                    count = sum(1 for _ in pattern.finditer(haystack))
+                else:
+                    count = haystack.count(needle) if needle in haystack else 0
+                if not count:
+                    continue
+                total_occurrences += count
+                if len(results) < max_results:
+                    results.append({"filename": abs_path, **index.locations[entry_id],
+                                    "text": text, "count": count})
+                else:
+                    truncated = True
+
+        with self._lock:
+            self._queries += 1
+            try:
+                self._save_manifest()
+            except OSError:
+                # 索引目录不可写时只保留内存中的索引
+                pass
+
+        return {
+            "results": results,
+            "total_occurrences": total_occurrences,
+            "truncated": truncated,
+            "errors": errors,
+            "elapsed_ms": round((time.perf_counter() - started_at) * 1000, 3)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """索引统计信息"""
+        with self._lock:
+            return {
+                "index_dir": self._dir,
+                "documents": len(self._manifest),
+                "loaded_indexes": len(self._documents),
+                "indexed": self._indexed,
+                "reused": self._reused,
+                "queries": self._queries
+            }
+
+
+_shared_search_index: Optional[SearchIndex] = None
+_shared_search_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    """获取共享的检索索引（持久化目录由 DOC_MCP_INDEX_DIR 配置）"""
+    global _shared_search_index
+    with _shared_search_index_lock:
+        if _shared_search_index is None:
+            _shared_search_index = SearchIndex(config.INDEX_DIR)
+        return _shared_search_index
@@ -0,0 +1,253 @@
+"""批量建表 - 一次遍历直接生成 ``w:tbl`` 元素
+
+``table.rows[i].cells[j]`` 每次访问都会重新构建行和单元格代理列表（并重新计算合并单元格的
+网格），逐个单元格填充大表格时退化为二次复杂度。这里按行直接用 lxml 生成完整的表格子树，
+输出结构与 ``doc.add_table`` + ``cell.text = ...`` 一致。
+
+数据按行或按列逐项读取，可以是任意可迭代对象（如生成器），不需要先物化为完整的二维列表。
+"""
+import csv
+import json
+import os
+from itertools import islice, zip_longest
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+from lxml import etree
+from docx.document import Document as DocumentObject
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Emu, Inches
+
+W_TBLPR = qn('w:tblPr')
+W_TBLSTYLE = qn('w:tblStyle')
+W_TBLW = qn('w:tblW')
+W_TBLLOOK = qn('w:tblLook')
+W_TBLGRID = qn('w:tblGrid')
+W_GRIDCOL = qn('w:gridCol')
+W_TR = qn('w:tr')
+W_TC = qn('w:tc')
+W_TCPR = qn('w:tcPr')
+W_TCW = qn('w:tcW')
+W_P = qn('w:p')
+W_R = qn('w:r')
+W_RPR = qn('w:rPr')
+W_B = qn('w:b')
+W_T = qn('w:t')
+W_VAL = qn('w:val')
+W_W = qn('w:w')
+W_TYPE = qn('w:type')
+XML_SPACE = qn('xml:space')
+
+# 与 python-docx 新建表格相同的 w:tblLook 设置
+_TBL_LOOK = {
+    qn('w:firstColumn'): "1", qn('w:firstRow'): "1", qn('w:lastColumn'): "0",
+    qn('w:lastRow'): "0", qn('w:noHBand'): "0", qn('w:noVBand'): "1", W_VAL: "04A0"
+}
+
+# 需要转换为 w:tab / w:br 元素的字符
+_SPECIAL_CHARS = frozenset("\t\r\n")
+
+# 导入数据文件的扩展名 -> 格式
+SOURCE_FORMATS = {
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".tab": "tsv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".json": "json",
+}
+
+
+def iter_table_rows(data: Optional[Iterable[Iterable[Any]]], rows: Optional[int], cols: int,
+                    column_major: bool = False) -> Iterator[List[Any]]:
+    """把表格数据整理为每行恰好 cols 个单元格的值（超出部分截断，不足部分为 None）
+
+    参数:
+        data: 表格数据，按行（每项为一行）或按列（每项为一列）组织的可迭代对象
+        rows: 行数（数据行数不足时补空行）；None 表示行数由数据决定
+        cols: 列数
+        column_major: data 是否按列组织
+    """
+    if data is None:
+        source: Iterable = ()
+    elif column_major:
+        # 各列同时逐项读取，按行组合
+        columns = [iter(column) for column in islice(data, cols)]
+        source = zip_longest(*columns) if columns else ()
+    else:
+        source = data
+
+    produced = 0
+    for row in (source if rows is None else islice(source, rows)):
+        values = list(islice(row, cols)) if row is not None else []
+        if len(values) < cols:
+            values.extend([None] * (cols - len(values)))
+        produced += 1
+        yield values
+    if rows is not None:
+        for _ in range(rows - produced):
+            yield [None] * cols
+
+
+def _add_text(r, text: str) -> None:
+    if _SPECIAL_CHARS.isdisjoint(text):
+        t = etree.SubElement(r, W_T)
+        t.text = text
+        if len(text.strip()) < len(text):
+            t.set(XML_SPACE, "preserve")
+    else:
+        # 含制表符/换行时按 python-docx 的规则拆分为 w:t、w:tab、w:br
+        r.text = text
+
+
+def build_table(rows: Optional[int], cols: int, data: Optional[Iterable[Iterable[Any]]] = None,
+                col_widths: Sequence[int] = (), style_id: Optional[str] = None,
+                header_bold: bool = False, column_major: bool = False):
+    """生成表格元素（尚未插入文档）
+
+    参数:
+        rows: 行数（None 表示行数由数据决定）
+        cols: 列数
+        data: 表格数据（可选），见 iter_table_rows
+        col_widths: 各列宽度，单位 twip（数量须与 cols 一致）
+        style_id: 表格样式ID（可选）
+        header_bold: 首行文字是否加粗
+        column_major: data 是否按列组织
+
+    返回:
+        CT_Tbl 元素
+    """
+    tbl = OxmlElement('w:tbl')
+    tbl_pr = etree.SubElement(tbl, W_TBLPR)
+    if style_id:
+        etree.SubElement(tbl_pr, W_TBLSTYLE).set(W_VAL, style_id)
+    etree.SubElement(tbl_pr, W_TBLW, {W_TYPE: "auto", W_W: "0"})
+    etree.SubElement(tbl_pr, W_TBLLOOK, _TBL_LOOK)
+
+    widths = [str(width) for width in col_widths]
+    tbl_grid = etree.SubElement(tbl, W_TBLGRID)
+    for width in widths:
+        etree.SubElement(tbl_grid, W_GRIDCOL).set(W_W, width)
+
+    for row_number, values in enumerate(iter_table_rows(data, rows, cols, column_major)):
+        bold = header_bold and row_number == 0
+        tr = etree.SubElement(tbl, W_TR)
+        for width, value in zip(widths, values):
+            tc = etree.SubElement(tr, W_TC)
+            tc_pr = etree.SubElement(tc, W_TCPR)
+            etree.SubElement(tc_pr, W_TCW, {W_TYPE: "dxa", W_W: width})
+            p = etree.SubElement(tc, W_P)
+            text = "" if value is None else str(value)
+            if not text:
+                continue
+            r = etree.SubElement(p, W_R)
+            if bold:
+                etree.SubElement(etree.SubElement(r, W_RPR), W_B)
+            _add_text(r, text)
+    return tbl
+
+
+def new_table(doc: DocumentObject, rows: Optional[int], cols: int,
+              data: Optional[Iterable[Iterable[Any]]] = None, style: Optional[str] = 'Table Grid',
+              col_widths: Optional[Sequence[float]] = None, header_bold: bool = False,
+              column_major: bool = False):
+    """按文档的版心宽度和样式生成表格元素（尚未插入文档）
+
+    参数:
+        doc: 文档对象
+        rows: 行数（None 表示行数由数据决定）
+        cols: 列数
+        data: 表格数据（可选）
+        style: 表格样式名称（文档中不存在该样式时不设置样式）
+        col_widths: 各列宽度，单位英寸（可选，默认按版心宽度平均分配）
+        header_bold: 首行文字是否加粗
+        column_major: data 是否按列组织
+    """
+    if (rows is not None and rows <= 0) or cols <= 0:
+        raise ValueError(f"行数和列数必须大于0，当前值: rows={rows}, cols={cols}")
+
+    if col_widths:
+        if len(col_widths) != cols:
+            raise ValueError(f"列宽数量({len(col_widths)})与列数({cols})不一致")
+        twips = [Inches(width).twips for width in col_widths]
+    else:
+        twips = [Emu(doc._block_width // cols).twips] * cols
+
+    style_id = None
+    if style:
+        try:
+            style_id = doc.part.get_style_id(style, WD_STYLE_TYPE.TABLE)
+        except KeyError:
+            # 样式不存在，使用默认样式
+            pass
+
+    return build_table(rows, cols, data, twips, style_id, header_bold, column_major)
+
+
+def detect_source_format(path: str, source_format: Optional[str] = None) -> str:
+    """确定数据文件格式（未指定时按扩展名判断）"""
+    if source_format:
+        if source_format not in SOURCE_FORMATS.values():
+            choices = ", ".join(sorted(set(SOURCE_FORMATS.values())))
+            raise ValueError(f"不支持的数据格式: {source_format}，可选值: {choices}")
+        return source_format
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SOURCE_FORMATS:
+        raise ValueError(f"无法根据扩展名判断数据格式: {path}，请指定 source_format")
+    return SOURCE_FORMATS[extension]
+
+
+def _cell_value(value: Any) -> Any:
+    # JSON 中的对象/数组按 JSON 文本写入单元格
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _iter_records(records: Iterable[Any], header: bool) -> Iterator[List[Any]]:
+    """JSON 记录转为行：对象按第一个对象的键取值（header=True 时先产出键名行），数组原样，其他值作为单列"""
+    keys = None
+    for record in records:
+        if isinstance(record, dict):
+            if keys is None:
+                keys = list(record)
+                if header:
+                    yield keys
+            yield [_cell_value(record.get(key)) for key in keys]
+        elif isinstance(record, list):
+            yield [_cell_value(value) for value in record]
+        else:
+            yield [record]
+
+
+def _iter_json_lines(stream) -> Iterator[Any]:
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"第{line_number}行不是有效的JSON: {e}")
+
+
+def read_source_rows(path: str, source_format: str, header: bool = True,
+                     encoding: str = "utf-8-sig") -> Iterator[List[Any]]:
+    """逐行读取数据文件（CSV/TSV/JSON Lines 为流式读取；JSON 文件需整体解析）
+
+    参数:
+        path: 数据文件路径
+        source_format: 数据格式：csv、tsv、jsonl、json
+        header: 数据是否包含表头行（JSON 对象记录据此决定是否产出键名行）
+        encoding: 文件编码（默认 utf-8-sig，兼容带 BOM 的文件）
+    """
+    with open(path, encoding=encoding, newline="") as f:
+        if source_format in ("csv", "tsv"):
+            yield from csv.reader(f, delimiter="," if source_format == "csv" else "\t")
+        elif source_format == "jsonl":
+            yield from _iter_records(_iter_json_lines(f), header)
+        else:
+            data = json.load(f)
+            if not isinstance(data, list):
+                raise ValueError("JSON 数据文件的顶层必须是数组")
+            yield from _iter_records(data, header)
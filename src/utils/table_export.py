@@ -0,0 +1,151 @@
+"""表格数据导出 - CSV/TSV、JSON Lines 和按列组织的数组
+
+按行窗口逐行读取单元格文本（通过单元格网格直接定位 ``w:tc``，不创建单元格代理对象），
+写入文件时边读边写，不在内存中拼接完整的输出。
+"""
+import csv
+import io
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+from docx.table import Table
+from .file_mode import default_file_mode
+from .table_grid import CellGrid
+from .text_stream import cell_text
+
+EXPORT_FORMATS = ("rows", "csv", "tsv", "jsonl", "columns")
+
+
+def header_fields(values: List[str]) -> List[str]:
+    """把表头行的文本整理为字段名：空白列命名为 column_N，重名字段追加序号"""
+    fields = []
+    seen = {}
+    for i, value in enumerate(values):
+        name = value.strip() or f"column_{i + 1}"
+        count = seen.get(name, 0) + 1
+        seen[name] = count
+        fields.append(name if count == 1 else f"{name}_{count}")
+    return fields
+
+
+class TableReader:
+    """按行读取表格单元格文本
+
+    参数:
+        table: Table 对象
+    """
+
+    def __init__(self, table: Table):
+        self._grid = CellGrid(table)
+        # 合并单元格在网格中重复出现，文本只提取一次
+        self._texts: Dict[Any, str] = {}
+
+    @property
+    def grid(self) -> CellGrid:
+        return self._grid
+
+    @property
+    def row_count(self) -> int:
+        return self._grid.row_count
+
+    @property
+    def col_count(self) -> int:
+        return self._grid.col_count
+
+    def row(self, row_index: int) -> List[str]:
+        """一行的单元格文本（合并单元格在其覆盖的每一列重复）"""
+        values = []
+        for tc in self._grid.iter_row_tcs(row_index):
+            text = self._texts.get(tc)
+            if text is None:
+                text = self._texts[tc] = cell_text(tc)
+            values.append(text)
+        return values
+
+    def iter_rows(self, start_row: int = 0, end_row: Optional[int] = None) -> Iterator[List[str]]:
+        """逐行产出 [start_row, end_row) 范围内的单元格文本"""
+        end_row = self.row_count if end_row is None else min(end_row, self.row_count)
+        for row_index in range(max(start_row, 0), end_row):
+            yield self.row(row_index)
+
+
+def write_delimited(rows: Iterator[List[str]], stream: TextIO, delimiter: str = ",",
+                    fields: Optional[List[str]] = None) -> int:
+    """以 CSV（或 TSV）格式写出各行，返回写出的数据行数（不含表头）"""
+    writer = csv.writer(stream, delimiter=delimiter, lineterminator="\n")
+    if fields is not None:
+        writer.writerow(fields)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(rows: Iterator[List[str]], stream: TextIO,
+                fields: Optional[List[str]] = None) -> int:
+    """以 JSON Lines 格式写出各行（有字段名时每行为对象，否则为数组），返回写出的行数"""
+    count = 0
+    for row in rows:
+        record = dict(zip(fields, row)) if fields is not None else row
+        stream.write(json.dumps(record, ensure_ascii=False))
+        stream.write("\n")
+        count += 1
+    return count
+
+
+def to_columns(rows: Iterator[List[str]], col_count: int,
+               fields: Optional[List[str]] = None) -> Dict[str, List[str]]:
+    """按列组织各行数据：字段名 -> 该列各行的值（缺少的单元格为空字符串）"""
+    names = fields if fields is not None else [str(i) for i in range(col_count)]
+    columns: List[List[str]] = [[] for _ in names]
+    for row in rows:
+        for i, column in enumerate(columns):
+            column.append(row[i] if i < len(row) else "")
+    return dict(zip(names, columns))
+
+
+def export_rows(rows: Iterator[List[str]], export_format: str, stream: TextIO,
+                col_count: int, fields: Optional[List[str]] = None) -> int:
+    """把各行按指定格式写入文本流，返回写出的数据行数"""
+    if export_format in ("csv", "tsv"):
+        delimiter = "," if export_format == "csv" else "\t"
+        return write_delimited(rows, stream, delimiter, fields)
+    if export_format == "jsonl":
+        return write_jsonl(rows, stream, fields)
+    if export_format == "columns":
+        columns = to_columns(rows, col_count, fields)
+        json.dump(columns, stream, ensure_ascii=False)
+        return len(next(iter(columns.values()), []))
+    # rows：二维数组
+    data = list(rows)
+    json.dump(data, stream, ensure_ascii=False)
+    return len(data)
+
+
+def export_to_file(rows: Iterator[List[str]], export_format: str, output_path: str,
+                   col_count: int, fields: Optional[List[str]] = None) -> int:
+    """边读边写到文件（先写临时文件再替换，失败时不留下不完整的文件），返回写出的数据行数"""
+    fd, tmp_path = tempfile.mkstemp(prefix=".~", suffix=".tmp", dir=os.path.dirname(output_path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            count = export_rows(rows, export_format, f, col_count, fields)
+        # mkstemp 创建的文件权限为 0600，沿用被覆盖文件的权限或按 umask 设置默认权限
+        os.chmod(tmp_path, default_file_mode(output_path))
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+def export_to_text(rows: Iterator[List[str]], export_format: str,
+                   fields: Optional[List[str]] = None) -> str:
+    """CSV/TSV/JSON Lines 格式的文本"""
+    buffer = io.StringIO()
+    export_rows(rows, export_format, buffer, 0, fields)
+    return buffer.getvalue()
@@ -0,0 +1,87 @@
+"""表格单元格网格索引 - 按 (行, 列) 直接定位 ``w:tc`` 元素
+
+``table.rows[r].cells[c]`` 和 ``table.cell(r, c)`` 每次访问都会重新遍历表格、重新计算合并单元格，
+单次定位就是 O(行数×列数)。这里一次遍历建立整个表格的网格，之后按下标直接取单元格。
+
+网格与 ``table.rows[r].cells`` 的语义一致：
+- 横向合并（gridSpan）的单元格在其覆盖的每一列重复出现；
+- 纵向合并（vMerge="continue"）的单元格指向合并区域顶部的单元格；
+- 每行只包含实际存在的单元格（行首的 gridBefore 空位不占下标）。
+"""
+from typing import Iterator, List, Optional
+from docx.table import Table, _Cell
+
+ST_MERGE_CONTINUE = "continue"
+
+
+class CellGrid:
+    """表格的单元格网格（一次构建）
+
+    索引是构建时刻的快照：增删行列或合并单元格后需要重新构建。
+
+    参数:
+        table: Table 对象
+    """
+
+    def __init__(self, table: Table):
+        self._table = table
+        self._rows: List[List] = []
+        # 上一行中各网格列起点 -> 该位置的（纵向合并的顶部）单元格
+        above = {}
+        for tr in table._tbl.tr_lst:
+            cells = []
+            current = {}
+            offset = tr.grid_before
+            for tc in tr.tc_lst:
+                span = tc.grid_span
+                root = tc
+                if tc.vMerge == ST_MERGE_CONTINUE:
+                    root = above.get(offset, tc)
+                current[offset] = root
+                cells.extend([root] * span)
+                offset += span
+            above = current
+            self._rows.append(cells)
+        self._col_count = table._tbl.col_count
+
+    @property
+    def row_count(self) -> int:
+        """行数（与 len(table.rows) 一致）"""
+        return len(self._rows)
+
+    @property
+    def col_count(self) -> int:
+        """网格列数（与 len(table.columns) 一致）"""
+        return self._col_count
+
+    def row_length(self, row_index: int) -> int:
+        """指定行中实际存在的单元格数"""
+        return len(self._rows[row_index])
+
+    def contains(self, row_index: int, col_index: int) -> bool:
+        """(行, 列) 是否指向一个存在的单元格"""
+        return (0 <= row_index < len(self._rows)
+                and 0 <= col_index < min(self._col_count, len(self._rows[row_index])))
+
+    def tc(self, row_index: int, col_index: int):
+        """(行, 列) 位置的 ``w:tc`` 元素，索引无效时抛出 ValueError"""
+        if row_index < 0 or row_index >= len(self._rows):
+            raise ValueError(f"行索引超出范围: {row_index}，表格共有{len(self._rows)}行")
+        row = self._rows[row_index]
+        if col_index < 0 or col_index >= min(self._col_count, len(row)):
+            raise ValueError(f"列索引超出范围: {col_index}，表格共有{self._col_count}列")
+        return row[col_index]
+
+    def cell(self, row_index: int, col_index: int) -> _Cell:
+        """(行, 列) 位置的单元格（与 table.rows[row_index].cells[col_index] 一致）"""
+        return _Cell(self.tc(row_index, col_index), self._table)
+
+    def get(self, row_index: int, col_index: int) -> Optional[_Cell]:
+        """(行, 列) 位置的单元格，索引无效时返回None"""
+        if not self.contains(row_index, col_index):
+            return None
+        return _Cell(self._rows[row_index][col_index], self._table)
+
+    def iter_row_tcs(self, row_index: int) -> Iterator:
+        """按列顺序产出指定行的 ``w:tc`` 元素（合并单元格重复出现）"""
+        return iter(self._rows[row_index])
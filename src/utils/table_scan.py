@@ -0,0 +1,133 @@
+"""全文表格提取 - 一次遍历文档中的全部表格（含单元格中嵌套的表格）
+
+按文档顺序（先序）找出正文中的全部 ``w:tbl``，为每个表格生成位置、尺寸、合并区域和
+单元格文本。逐个表格调用 ``get_table_info`` / ``get_table_data`` 时每次都要重新打开文档，
+这里只解析一次。
+
+表格之间互不依赖，表格很多时可以把提取工作分给线程池或进程池：
+- thread：在同一棵 XML 树上并行读取，没有序列化开销，但受 GIL 限制；
+- process：把每个表格序列化为 XML 发送给工作进程，在多核上真正并行，
+  有进程启动和序列化开销，适合包含数百个表格的大文档。
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Iterator, List, Tuple
+from lxml import etree
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+from docx.table import Table
+from .table_export import TableReader
+
+W_P = qn('w:p')
+W_TBL = qn('w:tbl')
+W_TR = qn('w:tr')
+W_TC = qn('w:tc')
+
+PARALLEL_MODES = ("none", "thread", "process")
+
+
+def _nested_tables(tbl, parent_id: int, depth: int) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+    """表格单元格中直接嵌套的表格（行列下标与 table.rows[r].cells 一致）"""
+    for row_index, tr in enumerate(tbl.iterchildren(W_TR)):
+        col_index = 0
+        for tc in tr.iterchildren(W_TC):
+            for nested in tc.iterchildren(W_TBL):
+                yield nested, {
+                    "depth": depth,
+                    "parent": {"id": parent_id, "row": row_index, "col": col_index}
+                }
+            col_index += tc.grid_span
+
+
+def iter_all_tables(body, include_nested: bool = True) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+    """按文档顺序（先序）产出正文中的表格元素及其位置信息
+
+    位置信息中 id 为全部表格的先序序号；正文表格的 table_index 与其他表格工具的表格索引一致，
+    block_index 为其在正文段落和表格中的序号；嵌套表格记录所在的父表格和单元格。
+
+    参数:
+        body: ``w:body`` 元素
+        include_nested: 是否包含单元格中嵌套的表格
+    """
+    next_id = 0
+    table_index = 0
+    for block_index, element in enumerate(body.iterchildren(W_P, W_TBL)):
+        if element.tag != W_TBL:
+            continue
+        stack = [(element, {"table_index": table_index, "block_index": block_index, "depth": 0})]
+        table_index += 1
+        while stack:
+            tbl, position = stack.pop()
+            table_id = next_id
+            next_id += 1
+            yield tbl, {"id": table_id, **position}
+            if include_nested:
+                # 逆序压栈，保持先序遍历的文档顺序
+                stack.extend(reversed(list(_nested_tables(tbl, table_id, position["depth"] + 1))))
+
+
+def merged_regions(reader: TableReader) -> List[Dict[str, int]]:
+    """表格中的合并区域（起止行列与 merge_table_cells 的参数一致）"""
+    grid = reader.grid
+    bounds = {}
+    for row_index in range(grid.row_count):
+        for col_index, tc in enumerate(grid.iter_row_tcs(row_index)):
+            box = bounds.get(tc)
+            if box is None:
+                bounds[tc] = [row_index, col_index, row_index, col_index]
+            else:
+                box[2] = max(box[2], row_index)
+                box[3] = max(box[3], col_index)
+    return [
+        {"start_row": r0, "start_col": c0, "end_row": r1, "end_col": c1}
+        for r0, c0, r1, c1 in bounds.values()
+        if r1 > r0 or c1 > c0
+    ]
+
+
+def describe_table(tbl, include_data: bool = True, include_merges: bool = True) -> Dict[str, Any]:
+    """单个表格的尺寸、合并区域和单元格文本"""
+    reader = TableReader(Table(tbl, None))
+    result: Dict[str, Any] = {"rows": reader.row_count, "cols": reader.col_count}
+    if include_merges:
+        result["merges"] = merged_regions(reader)
+    if include_data:
+        result["data"] = list(reader.iter_rows())
+    return result
+
+
+def _describe_xml(xml: bytes, include_data: bool, include_merges: bool) -> Dict[str, Any]:
+    """在工作进程中解析序列化的表格并提取内容"""
+    return describe_table(parse_xml(xml), include_data, include_merges)
+
+
+def describe_tables(tables: List, include_data: bool = True, include_merges: bool = True,
+                    parallel: str = "none", workers: int = 1) -> List[Dict[str, Any]]:
+    """提取一组表格的内容（结果与输入顺序一致）
+
+    参数:
+        tables: ``w:tbl`` 元素列表
+        include_data: 是否包含单元格文本
+        include_merges: 是否包含合并区域
+        parallel: 并行方式：none、thread、process
+        workers: 并行的工作线程/进程数
+    """
+    if parallel not in PARALLEL_MODES:
+        raise ValueError(f"不支持的并行方式: {parallel}，可选值: {', '.join(PARALLEL_MODES)}")
+    workers = min(max(1, workers), len(tables))
+    if parallel == "none" or workers <= 1:
+        return [describe_table(tbl, include_data, include_merges) for tbl in tables]
+
+    if parallel == "thread":
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="doc-mcp-table") as pool:
+            return list(pool.map(partial(describe_table, include_data=include_data,
+                                         include_merges=include_merges), tables))
+
+    # 每个工作进程分到若干批表格，减少进程间往返
+    chunksize = max(1, len(tables) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(partial(_describe_xml, include_data=include_data,
+                                     include_merges=include_merges),
+                             (etree.tostring(tbl) for tbl in tables), chunksize=chunksize))
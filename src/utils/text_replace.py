@@ -0,0 +1,242 @@
+"""跨 run 文本替换引擎
+
+Word 编辑过的文档中，一段连续的文字常被拆分到多个 run（拼写检查、修订、格式变化等），
+逐个 run 替换会漏掉这些匹配。这里先把段落文本的字符偏移映射到各个 run 的文本节点，
+在整段文本上匹配，再把结果写回对应的节点：替换文本继承匹配起点所在 run 的格式，
+匹配范围之外的文字保持原有格式。
+"""
+import re
+from typing import Any, Dict, Iterator, List, Tuple
+from docx.document import Document as DocumentObject
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+W_P = qn('w:p')
+W_R = qn('w:r')
+W_T = qn('w:t')
+W_BR = qn('w:br')
+W_TYPE = qn('w:type')
+XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+# 段落中包含可见 run 的容器元素（修订删除、移动源等不可见内容不在其中）
+_RUN_CONTAINERS = frozenset(qn(tag) for tag in (
+    'w:hyperlink', 'w:ins', 'w:moveTo', 'w:smartTag', 'w:customXml',
+    'w:sdt', 'w:sdtContent', 'w:fldSimple', 'w:bdo', 'w:dir'
+))
+
+# run 中按单个字符参与匹配的内联元素
+_INLINE_TEXT = {
+    qn('w:tab'): "\t",
+    qn('w:ptab'): "\t",
+    qn('w:cr'): "\n",
+    qn('w:noBreakHyphen'): "-",
+}
+
+
+class ReplaceRule:
+    """一组查找/替换规则
+
+    参数:
+        find: 要查找的文本（regex=True 时为正则表达式）
+        replace: 替换后的文本（正则模式下支持 \\1、\\g<name> 等分组引用）
+        regex: 是否按正则表达式匹配
+        match_case: 是否区分大小写
+    """
+
+    def __init__(self, find: str, replace: str, regex: bool = False, match_case: bool = True):
+        if not find:
+            raise ValueError("查找文本不能为空")
+        self.find = find
+        self.replace = replace
+        self.regex = regex
+        flags = 0 if match_case else re.IGNORECASE
+        try:
+            self.pattern = re.compile(find if regex else re.escape(find), flags)
+        except re.error as e:
+            raise ValueError(f"正则表达式无效: {find}（{e}）")
+        # 区分大小写的普通文本可以先用子串判断快速跳过不相关的段落
+        self._literal = find if not regex and match_case else None
+        self.count = 0
+
+    def may_match(self, text: str) -> bool:
+        return self._literal is None or self._literal in text
+
+    def expand(self, match: "re.Match") -> str:
+        return match.expand(self.replace) if self.regex else self.replace
+
+
+class _Atom:
+    """段落文本中的一段：w:t 的文字，或 tab/换行等单字符元素"""
+    __slots__ = ("element", "start", "text", "editable")
+
+    def __init__(self, element, start: int, text: str, editable: bool):
+        self.element = element
+        self.start = start
+        self.text = text
+        self.editable = editable
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.text)
+
+
+def _iter_runs(container) -> Iterator:
+    for child in container:
+        if child.tag == W_R:
+            yield child
+        elif child.tag in _RUN_CONTAINERS:
+            yield from _iter_runs(child)
+
+
+def _paragraph_atoms(paragraph) -> Tuple[List[_Atom], str]:
+    atoms: List[_Atom] = []
+    offset = 0
+    for run in _iter_runs(paragraph):
+        for child in run:
+            if child.tag == W_T:
+                text, editable = child.text or "", True
+            elif child.tag == W_BR:
+                if child.get(W_TYPE, "textWrapping") != "textWrapping":
+                    continue
+                text, editable = "\n", False
+            else:
+                text = _INLINE_TEXT.get(child.tag)
+                if text is None:
+                    continue
+                editable = False
+            if text:
+                atoms.append(_Atom(child, offset, text, editable))
+                offset += len(text)
+    return atoms, "".join(atom.text for atom in atoms)
+
+
+def _set_text(t_element, text: str) -> None:
+    """写入 w:t 的文字；其中的 \\t、\\n 转换为 w:tab、w:br 元素"""
+    pieces = re.split(r"(\t|\n)", text)
+    t_element.text = pieces[0]
+    _preserve_space(t_element)
+    anchor = t_element
+    for piece in pieces[1:]:
+        if piece == "\t":
+            element = OxmlElement('w:tab')
+        elif piece == "\n":
+            element = OxmlElement('w:br')
+        elif piece:
+            element = OxmlElement('w:t')
+            element.text = piece
+            _preserve_space(element)
+        else:
+            continue
+        anchor.addnext(element)
+        anchor = element
+
+
+def _preserve_space(t_element) -> None:
+    text = t_element.text or ""
+    if text != text.strip():
+        t_element.set(XML_SPACE, "preserve")
+
+
+def _apply(atoms: List[_Atom], start: int, end: int, replacement: str) -> Any:
+    """把 [start, end) 范围内的文字替换为 replacement，返回写入替换文本的 w:t 元素"""
+    overlapping = [atom for atom in atoms if atom.start < end and atom.end > start]
+    if not overlapping:
+        return None
+    target = next((atom for atom in overlapping if atom.editable), None)
+    written = None
+    if target is None:
+        # 匹配范围只包含 tab/换行：在第一个被替换的元素前新建文字节点
+        written = OxmlElement('w:t')
+        written.text = replacement
+        overlapping[0].element.addprevious(written)
+
+    for atom in overlapping:
+        if not atom.editable:
+            atom.element.getparent().remove(atom.element)
+            continue
+        local_start = max(start, atom.start) - atom.start
+        local_end = min(end, atom.end) - atom.start
+        inserted = replacement if atom is target else ""
+        atom.text = atom.text[:local_start] + inserted + atom.text[local_end:]
+        if atom.text or atom is target:
+            atom.element.text = atom.text
+            _preserve_space(atom.element)
+            if atom is target:
+                written = atom.element
+        else:
+            atom.element.getparent().remove(atom.element)
+    return written
+
+
+def replace_in_paragraph(paragraph, rules: List[ReplaceRule]) -> int:
+    """在一个段落（w:p 元素）中应用全部规则，返回替换次数
+
+    所有规则在原始段落文本上一次性匹配：按起始位置从左到右选取互不重叠的匹配，
+    位置相同时先列出的规则优先；替换结果不会被后续规则再次匹配。
+    """
+    atoms, text = _paragraph_atoms(paragraph)
+    if not text:
+        return 0
+
+    matches = []
+    for priority, rule in enumerate(rules):
+        if not rule.may_match(text):
+            continue
+        for match in rule.pattern.finditer(text):
+            if match.end() > match.start():
+                matches.append((match.start(), priority, match.end(), rule, match))
+    if not matches:
+        return 0
+
+    # 选出互不重叠的匹配
+    matches.sort(key=lambda item: (item[0], item[1]))
+    selected = []
+    position = 0
+    for start, _, end, rule, match in matches:
+        if start >= position:
+            selected.append((start, end, rule, match))
+            position = end
+
+    # 从后往前写回，前面匹配的偏移不受影响
+    written = []
+    for start, end, rule, match in reversed(selected):
+        t_element = _apply(atoms, start, end, rule.expand(match))
+        if t_element is not None and t_element not in written:
+            written.append(t_element)
+        rule.count += 1
+
+    # 全部写回后再把替换文本中的 \t、\n 转换为对应的元素
+    for t_element in written:
+        if t_element.getparent() is not None:
+            _set_text(t_element, t_element.text or "")
+    return len(selected)
+
+
+def iter_story_roots(doc: DocumentObject,
+                     include_headers_footers: bool = True) -> Iterator[Tuple[str, Any]]:
+    """文档中需要替换的内容根元素：正文，以及（可选）每个页眉/页脚部件"""
+    yield "body", doc.element.body
+    if not include_headers_footers:
+        return
+    for rel in doc.part.rels.values():
+        if rel.is_external:
+            continue
+        if rel.reltype == RT.HEADER:
+            yield "header", rel.target_part.element
+        elif rel.reltype == RT.FOOTER:
+            yield "footer", rel.target_part.element
+
+
+def replace_in_document(doc: DocumentObject, rules: List[ReplaceRule],
+                        include_headers_footers: bool = True) -> Dict[str, int]:
+    """在整个文档中应用替换规则（正文段落、表格单元格、文本框，以及页眉页脚）
+
+    返回:
+        各内容区域的替换次数，如 {"body": 3, "header": 1, "footer": 0}
+    """
+    counts = {"body": 0, "header": 0, "footer": 0}
+    for story, root in iter_story_roots(doc, include_headers_footers):
+        for paragraph in root.iter(W_P):
+            counts[story] += replace_in_paragraph(paragraph, rules)
+    return counts
@@ -0,0 +1,130 @@
+"""流式文本提取 - 直接从 zip 中增量解析 word/document.xml
+
+不构建 python-docx 对象模型，逐个产出正文段落和表格的文本，处理完的元素立即清除，
+内存占用与文档大小无关。段落文本的拼接规则与 ``Paragraph.text`` 保持一致。
+"""
+import posixpath
+import zipfile
+from typing import Iterator, List, Tuple
+from lxml import etree
+from docx.oxml.ns import qn
+
+W_BODY = qn('w:body')
+W_P = qn('w:p')
+W_TBL = qn('w:tbl')
+W_TR = qn('w:tr')
+W_TC = qn('w:tc')
+W_R = qn('w:r')
+W_HYPERLINK = qn('w:hyperlink')
+W_T = qn('w:t')
+W_BR = qn('w:br')
+W_TYPE = qn('w:type')
+
+# 与 python-docx 的 CT_R.text 相同的内联元素文本映射（w:br 单独处理）
+_INLINE_TEXT = {
+    qn('w:tab'): "\t",
+    qn('w:ptab'): "\t",
+    qn('w:cr'): "\n",
+    qn('w:noBreakHyphen'): "-",
+}
+
+_MAIN_DOCUMENT_REL = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+_PACKAGE_RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def main_document_part(archive: zipfile.ZipFile) -> str:
+    """从包关系中找到主文档部件名（通常为 word/document.xml）"""
+    try:
+        rels = etree.fromstring(archive.read("_rels/.rels"))
+    except KeyError:
+        return "word/document.xml"
+    for rel in rels.iter(f"{_PACKAGE_RELS_NS}Relationship"):
+        if rel.get("Type") == _MAIN_DOCUMENT_REL:
+            return posixpath.normpath(rel.get("Target").lstrip("/"))
+    return "word/document.xml"
+
+
+def _run_text(run) -> str:
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or "")
+        elif tag == W_BR:
+            # 只有换行符（textWrapping，默认类型）映射为 "\n"，分页/分栏符为空
+            if child.get(W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            text = _INLINE_TEXT.get(tag)
+            if text:
+                parts.append(text)
+    return "".join(parts)
+
+
+def _paragraph_text(paragraph) -> str:
+    parts = []
+    for child in paragraph:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(run) for run in child.iterchildren(W_R))
+    return "".join(parts)
+
+
+def cell_text(cell) -> str:
+    """``w:tc`` 元素的文本（与 _Cell.text 一致：单元格内直接子段落的文本以换行连接）"""
+    return "\n".join(_paragraph_text(p) for p in cell.iterchildren(W_P))
+
+
+def _table_rows(table) -> List[List[str]]:
+    return [[cell_text(tc) for tc in tr.iterchildren(W_TC)] for tr in table.iterchildren(W_TR)]
+
+
+def iter_element_blocks(body, include_tables: bool = True) -> Iterator[Tuple[str, object]]:
+    """按文档顺序产出已加载的 ``w:body`` 元素中的正文段落和表格（格式同 iter_body_blocks）"""
+    for element in body.iterchildren(W_P, W_TBL):
+        if element.tag == W_P:
+            yield "paragraph", _paragraph_text(element)
+        elif include_tables:
+            yield "table", _table_rows(element)
+
+
+def iter_body_blocks(abs_path: str, include_tables: bool = True) -> Iterator[Tuple[str, object]]:
+    """按文档顺序逐个产出正文元素
+
+    返回:
+        ("paragraph", 段落文本) 或 ("table", 按行组织的单元格文本列表)；
+        include_tables=False 时跳过表格
+    """
+    with zipfile.ZipFile(abs_path) as archive:
+        with archive.open(main_document_part(archive)) as stream:
+            context = etree.iterparse(stream, events=("end",), tag=(W_P, W_TBL),
+                                      huge_tree=True)
+            for _, element in context:
+                parent = element.getparent()
+                if parent is None or parent.tag != W_BODY:
+                    # 表格中的段落随所在表格一起处理和清除
+                    continue
+                if element.tag == W_P:
+                    yield "paragraph", _paragraph_text(element)
+                elif include_tables:
+                    yield "table", _table_rows(element)
+                # 清除已处理的正文元素及其之前的兄弟节点，保持内存占用恒定
+                element.clear()
+                while element.getprevious() is not None:
+                    del parent[0]
+            del context
+
+
+def iter_paragraph_texts(abs_path: str) -> Iterator[str]:
+    """按文档顺序逐个产出正文段落（body 的直接子段落）的文本
+
+    与 ``doc.paragraphs`` 的范围一致：不包含表格、页眉页脚中的段落。
+
+    参数:
+        abs_path: 文档绝对路径
+    """
+    for _, text in iter_body_blocks(abs_path, include_tables=False):
+        yield text
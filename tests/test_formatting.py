@@ -0,0 +1,71 @@
+"""bold/italic 为 False 时写入的格式与各工具原有输出一致"""
+import asyncio
+import zipfile
+from docx import Document
+from docx.oxml.ns import qn
+from lxml import etree
+from src.tools.content_edit import add_heading, add_paragraph, insert_paragraph
+from src.tools.table_ops import set_table_cell_content
+
+
+def _toggles(path) -> dict:
+    """run 的文本 -> {"b": w:b 的 w:val, "i": w:i 的 w:val, "sz": 是否设置了字号}（未写入的项为 None）"""
+    with zipfile.ZipFile(path) as archive:
+        root = etree.fromstring(archive.read("word/document.xml"))
+    result = {}
+    for r in root.iter(qn("w:r")):
+        rpr = r.find(qn("w:rPr"))
+        values = {}
+        for name in ("b", "i"):
+            element = rpr.find(qn(f"w:{name}")) if rpr is not None else None
+            values[name] = None if element is None else element.get(qn("w:val"), "1")
+        values["sz"] = rpr is not None and rpr.find(qn("w:sz")) is not None
+        result["".join(r.itertext())] = values
+    return result
+
+
+def _new_document(tmp_path, with_table: bool = False) -> str:
+    path = str(tmp_path / "doc.docx")
+    doc = Document()
+    if with_table:
+        doc.add_table(rows=1, cols=1)
+    doc.save(path)
+    return path
+
+
+def test_add_paragraph_writes_false_toggles_with_other_font_format(tmp_path):
+    path = _new_document(tmp_path)
+    result = asyncio.run(add_paragraph(filename=path, text="p", bold=False, font_size=12))
+    assert result["success"]
+    assert _toggles(path)["p"] == {"b": "0", "i": "0", "sz": True}
+
+
+def test_add_heading_false_bold_overrides_heading_style(tmp_path):
+    path = _new_document(tmp_path)
+    result = asyncio.run(add_heading(filename=path, text="h", level=1, bold=False, color="FF0000"))
+    assert result["success"]
+    assert _toggles(path)["h"]["b"] == "0"
+
+
+def test_false_toggles_alone_keep_style(tmp_path):
+    path = _new_document(tmp_path)
+    asyncio.run(add_paragraph(filename=path, text="p", bold=False, italic=False))
+    assert _toggles(path)["p"] == {"b": None, "i": None, "sz": False}
+
+
+def test_insert_paragraph_never_writes_false_toggles(tmp_path):
+    path = _new_document(tmp_path)
+    asyncio.run(add_paragraph(filename=path, text="first"))
+    result = asyncio.run(insert_paragraph(filename=path, text="i", position=0, bold=False, font_size=12))
+    assert result["success"]
+    assert _toggles(path)["i"] == {"b": None, "i": None, "sz": True}
+
+
+def test_cell_content_false_bold_only_with_other_font_format(tmp_path):
+    path = _new_document(tmp_path, with_table=True)
+    asyncio.run(set_table_cell_content(filename=path, table_index=0, row_index=0, col_index=0,
+                                       text="a", bold=False))
+    assert _toggles(path)["a"]["b"] is None
+    asyncio.run(set_table_cell_content(filename=path, table_index=0, row_index=0, col_index=0,
+                                       text="b", bold=False, font_size=10))
+    assert _toggles(path)["b"]["b"] == "0"
@@ -0,0 +1,27 @@
+"""图片预处理结果的缓存键"""
+import io
+from PIL import Image
+from src.utils.image_prep import ImageCache, ImageOptions, prepare_image
+
+
+def _dpi(blob: bytes):
+    with Image.open(io.BytesIO(blob)) as image:
+        return tuple(round(value, 1) for value in image.info["dpi"])
+
+
+def test_cache_key_includes_output_dpi(tmp_path):
+    image_path = str(tmp_path / "shot.png")
+    Image.new("RGB", (1000, 500), (10, 120, 200)).save(image_path)
+    cache = ImageCache(str(tmp_path / "cache"))
+
+    # 显示宽度 2 英寸：两个 max_dpi 都缩小到 401 像素宽，但写入的分辨率不同
+    first = prepare_image(image_path, width=2, options=ImageOptions(max_dpi=200.1), cache=cache)
+    second = prepare_image(image_path, width=2, options=ImageOptions(max_dpi=200.4), cache=cache)
+    assert first.info["pixels"] == second.info["pixels"] == [401, 200]
+    assert not second.info["cached"]
+    assert _dpi(first.blob) == (200.1, 200.1)
+    assert _dpi(second.blob) == (200.4, 200.4)
+
+    again = prepare_image(image_path, width=2, options=ImageOptions(max_dpi=200.4), cache=cache)
+    assert again.info["cached"]
+    assert again.blob == second.blob
@@ -0,0 +1,90 @@
+"""按部件保存与二进制部件延迟加载（含 python-docx 内部接口不可用时的完整加载）"""
+import io
+import zipfile
+import pytest
+from docx import Document
+from docx.opc.pkgreader import PackageReader
+from PIL import Image
+from src.utils import package_io
+from src.utils.package_io import is_unloaded, lazy_loading_supported, open_document, save_package
+
+
+@pytest.fixture
+def image_document(tmp_path) -> str:
+    """包含一张图片的文档"""
+    image_path = str(tmp_path / "image.png")
+    Image.new("RGB", (64, 48), (200, 30, 30)).save(image_path)
+    doc = Document()
+    doc.add_paragraph("正文")
+    doc.add_picture(image_path)
+    path = str(tmp_path / "image.docx")
+    doc.save(path)
+    return path
+
+
+@pytest.fixture
+def reset_support_check():
+    """每个用例前后重新检查 python-docx 的内部接口"""
+    lazy_loading_supported.cache_clear()
+    yield
+    lazy_loading_supported.cache_clear()
+
+
+def _members(doc) -> dict:
+    buffer = io.BytesIO()
+    save_package(doc, buffer, record_stats=False)
+    with zipfile.ZipFile(buffer) as archive:
+        assert archive.testzip() is None
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def _unloaded_count(doc) -> int:
+    return sum(is_unloaded(part) for part in doc.part.package.iter_parts())
+
+
+def test_binary_parts_are_loaded_on_demand(image_document, reset_support_check):
+    assert lazy_loading_supported()
+    doc = open_document(image_document)
+    assert _unloaded_count(doc) > 0
+    assert _members(doc) == _members(Document(image_document))
+    assert doc.inline_shapes[0].width > 0
+    assert doc.part.package.image_parts._image_parts[0].image.px_width == 64
+
+
+def test_missing_interface_falls_back_to_full_load(image_document, reset_support_check, monkeypatch):
+    # 相当于 python-docx 中不再有 _ContentTypeMap（导入失败）
+    monkeypatch.setattr(package_io, "_ContentTypeMap", None)
+    assert not lazy_loading_supported()
+    doc = open_document(image_document)
+    assert _unloaded_count(doc) == 0
+    doc.add_paragraph("修改")
+    reference = Document(image_document)
+    reference.add_paragraph("修改")
+    assert _members(doc) == _members(reference)
+
+
+def test_changed_signature_falls_back_to_full_load(image_document, reset_support_check, monkeypatch):
+    srels_for = PackageReader._srels_for
+
+    def changed_srels_for(phys_reader, source_uri, encoding=None):
+        return srels_for(phys_reader, source_uri)
+
+    monkeypatch.setattr(PackageReader, "_srels_for", staticmethod(changed_srels_for))
+    assert not lazy_loading_supported()
+    assert _unloaded_count(open_document(image_document)) == 0
+
+
+def test_full_load_still_copies_unchanged_parts(image_document, reset_support_check, monkeypatch):
+    monkeypatch.setattr(package_io, "lazy_loading_supported", lambda: False)
+    doc = open_document(image_document)
+    buffer = io.BytesIO()
+    writer_copies = []
+    original_copy_raw = package_io._PackageZipWriter._copy_raw
+
+    def copy_raw(self, info):
+        writer_copies.append(info.filename)
+        original_copy_raw(self, info)
+
+    monkeypatch.setattr(package_io._PackageZipWriter, "_copy_raw", copy_raw)
+    save_package(doc, buffer, record_stats=False)
+    assert "word/media/image1.png" in writer_copies